@@ -1,258 +1,3113 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, g, Response
 import random
+import math
 import secrets
 import os
-import numpy as np
-import pandas as pd
-from datetime import datetime
+import importlib
+from datetime import datetime, date, timedelta
 import json
+import threading
+import csv
+import io
+import sqlite3
+import atexit
+import bisect
+import time
+import functools
+import cProfile
+import hashlib
+import codecs
+import mmap
+import struct
+import zlib
+import re
+import click
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    #su Windows non c'è flock: restano solo i lock tra i thread dello stesso processo
+    fcntl = None
+
+
+class _LazyModule:
+    """modulo importato solo al primo accesso a un suo attributo: numpy e pandas pesano
+    centinaia di millisecondi e decine di MB per worker e molte richieste non li usano"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+np = _LazyModule('numpy')
+pd = _LazyModule('pandas')
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# configurazione dei file delle parole
-WORD_FILES = {
-    'it': "parole_it.txt",
-    'en': "words_en.txt"
-}
-MAX_ATTEMPTS = 6
-SCORES_FILE = "classifica.csv"
-WORD_STATS_FILE = "word_statistics.json"
-PLAYERS_FILE = "players.json"
-ANALYTICS_FILE = "analytics.npy"
+# configurazione dei file delle parole
+WORD_FILES = {
+    'it': "parole_it.txt",
+    'en': "words_en.txt"
+}
+#elenchi opzionali di tentativi validi in aggiunta alle parole segrete
+ACCEPTED_WORD_FILES = {
+    'it': "parole_it_accettate.txt",
+    'en': "words_en_accepted.txt"
+}
+#dizionari compilati nel formato binario (flask compile-words), preferiti ai .txt se aggiornati
+COMPILED_WORD_FILES = {
+    'it': "parole_it.wlb",
+    'en': "words_en.wlb"
+}
+VALIDATE_GUESSES = True
+MAX_ATTEMPTS = 6
+SCORES_FILE = "classifica.csv"
+WORD_STATS_FILE = "word_statistics.json"
+PLAYERS_FILE = "players.json"
+PLAYER_CACHE_SIZE = 1024
+RESPONSE_CACHE_SIZE = 256
+ANALYTICS_FILE = "analytics.npy"
+WORD_STATS_FLUSH_INTERVAL = 5
+WORD_STATS_FLUSH_BATCH = 50
+SCORE_COLUMNS = ['player', 'score', 'attempts', 'won', 'lang', 'timestamp']
+
+STORAGE_BACKEND = os.environ.get('WORDLE_STORAGE', 'json')
+DATABASE_FILE = os.environ.get('WORDLE_DB', "wordle.db")
+GAME_STORE_BACKEND = os.environ.get('WORDLE_GAME_STORE', 'memory')
+GAME_TTL = 6 * 60 * 60
+SECRET_KEY_FILE = ".secret_key"
+
+#modalità giornaliera: stessa parola per tutti, scelta da un calendario deterministico
+DAILY_EPOCH = date(2025, 1, 1)
+DAILY_SEED = int(os.environ.get('WORDLE_DAILY_SEED', 20250101))
+DAILY_SCHEDULE_DAYS = 366
+DAILY_SCHEDULE_FILE = "daily_schedule.json"
+DAILY_SCORES_FILE = "daily_scores.jsonl"
+
+#mazzi di parole per giocatore: nessuna ripetizione finché il dizionario non è esaurito
+PLAYER_DECKS_FILE = "player_decks.json"
+DECK_HAND_SIZE = 8
+
+#importazione in blocco di partite concluse (bot, eventi offline, simulazioni)
+INGEST_BATCH_SIZE = 10000
+INGEST_MAX_ERRORS = 100
+#token richiesto da /api/games/import (Authorization: Bearer ...); senza token l'endpoint è disattivato
+ADMIN_TOKEN = os.environ.get('WORDLE_ADMIN_TOKEN')
+
+#esportazione in streaming dello storico dei punteggi
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+EXPORT_CHUNK_ROWS = 1000
+
+#matrici tentativo x parola segreta dei pattern, una per dizionario
+PATTERN_CACHE_DIR = ".pattern_cache"
+PATTERN_BLOCK_ROWS = 256
+
+#strumentazione opzionale: istogrammi dei tempi per endpoint e per funzione
+METRICS_ENABLED = os.environ.get('WORDLE_METRICS') == '1'
+PROFILE_THRESHOLD_MS = float(os.environ.get('WORDLE_PROFILE_THRESHOLD_MS', 0))
+PROFILE_SAMPLE_RATE = float(os.environ.get('WORDLE_PROFILE_SAMPLE_RATE', 0.1))
+PROFILE_DIR = "profiles"
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """istogramma cumulativo a bucket fissi nel formato di Prometheus"""
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """raccoglie gli istogrammi delle richieste e delle singole funzioni"""
+
+    HELP = {
+        'wordle_request_duration_seconds': "Durata delle richieste HTTP per endpoint",
+        'wordle_span_duration_seconds': "Durata delle funzioni strumentate",
+    }
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """esporta tutte le metriche nel formato testuale di Prometheus"""
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# HELP {name} {self.HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in items:
+                    if metric != name:
+                        continue
+                    label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        sep = "," if label_text else ""
+                        lines.append(f'{name}_bucket{{{label_text}{sep}le="{le}"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+def timed_span(name):
+    """decoratore che misura la durata della funzione quando le metriche sono attive"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS_ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.observe('wordle_span_duration_seconds', {'span': name}, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@app.before_request
+def start_request_timer():
+    """avvia il cronometro (ed eventualmente il profiler) della richiesta"""
+    if METRICS_ENABLED or PROFILE_THRESHOLD_MS > 0:
+        g.request_start = time.perf_counter()
+    if PROFILE_THRESHOLD_MS > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request_time(response):
+    """registra la durata della richiesta e salva il profilo delle richieste lente"""
+    start = g.pop('request_start', None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+
+    if METRICS_ENABLED:
+        METRICS.observe('wordle_request_duration_seconds', {
+            'endpoint': request.endpoint or 'unknown',
+            'method': request.method,
+            'status': str(response.status_code),
+        }, elapsed)
+
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        if elapsed * 1000 >= PROFILE_THRESHOLD_MS:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            file_name = f"{request.endpoint or 'unknown'}-{datetime.now():%Y%m%d-%H%M%S-%f}.prof"
+            profiler.dump_stats(os.path.join(PROFILE_DIR, file_name))
+
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Espone gli istogrammi dei tempi nel formato di Prometheus"""
+    if not METRICS_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'Metriche disattivate (WORDLE_METRICS=1 per attivarle)'
+        }), 404
+    
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+
+#lock tra processi per i file JSON/CSV condivisi da più worker
+class FileLock:
+    """lock esclusivo rientrante: RLock tra i thread e fcntl.flock su <file>.lock tra i processi"""
+
+    def __init__(self, path):
+        self.path = path + '.lock'
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._file = open(self.path, 'a')
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+    #contatore delle scritture salvato nel file di lock: a differenza di inode, mtime e
+    #dimensione non si ripete mai (ext4 riusa gli inode, l'mtime può essere grossolano)
+    GENERATION_WIDTH = 20
+
+    def generation(self):
+        """numero di scritture fatte sotto questo lock, da qualunque processo"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read(self.GENERATION_WIDTH)
+        except FileNotFoundError:
+            return 0
+        try:
+            return int(data) if data.strip() else 0
+        except ValueError:
+            #lettura a metà di un aggiornamento: un valore mai usato forza la rilettura
+            return -1
+
+    def bump(self):
+        """incrementa il contatore dopo una scrittura (da chiamare tenendo il lock)"""
+        value = self.generation() + 1
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, b'%0*d' % (self.GENERATION_WIDTH, value))
+        finally:
+            os.close(fd)
+        return value
+
+
+_file_locks = {}
+_file_locks_lock = threading.Lock()
+
+
+def file_lock(path):
+    """restituisce il lock condiviso del file (uno per percorso in ogni processo)"""
+    with _file_locks_lock:
+        lock = _file_locks.get(path)
+        if lock is None:
+            lock = _file_locks[path] = FileLock(path)
+        return lock
+
+
+#archivio sqlite opzionale, selezionabile con WORDLE_STORAGE=sqlite
+class SqliteStore:
+    """archivio transazionale su sqlite3 per giocatori, punteggi e statistiche delle parole"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            username TEXT PRIMARY KEY,
+            total_score INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_players_total_score ON players (total_score DESC);
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player TEXT,
+            score INTEGER NOT NULL,
+            attempts INTEGER,
+            won INTEGER,
+            lang TEXT,
+            timestamp TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (player);
+        CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC);
+        CREATE TABLE IF NOT EXISTS word_stats (
+            lang TEXT NOT NULL,
+            word TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            first_used TEXT,
+            last_used TEXT,
+            PRIMARY KEY (lang, word)
+        );
+        CREATE TABLE IF NOT EXISTS daily_scores (
+            day TEXT NOT NULL,
+            lang TEXT NOT NULL,
+            player TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            attempts INTEGER NOT NULL,
+            won INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (day, lang, player)
+        );
+        CREATE INDEX IF NOT EXISTS idx_daily_scores_rank ON daily_scores (day, lang, score DESC, timestamp);
+        CREATE TABLE IF NOT EXISTS daily_starts (
+            day TEXT NOT NULL,
+            lang TEXT NOT NULL,
+            player TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (day, lang, player)
+        );
+        CREATE TABLE IF NOT EXISTS player_decks (
+            player TEXT NOT NULL,
+            lang TEXT NOT NULL,
+            seed INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            hand TEXT NOT NULL,
+            PRIMARY KEY (player, lang)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self):
+        """restituisce la connessione del thread corrente, aprendola in modalità WAL"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """transazione con lock in scrittura acquisito subito (BEGIN IMMEDIATE)"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    #giocatori
+    def version(self, key):
+        """contatore delle scritture (players_version, word_stats_version), condiviso tra tutti i processi"""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump_version(self, conn, key):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1",
+            (key,)
+        )
+        return conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()[0]
+
+    def players_version(self):
+        return self.version('players_version')
+
+    def _bump_players_version(self, conn):
+        return self._bump_version(conn, 'players_version')
+
+    def load_players(self):
+        rows = self.connection().execute("SELECT username, data FROM players")
+        return {username: json.loads(data) for username, data in rows}
+
+    def save_players(self, players):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM players")
+            conn.executemany(
+                "INSERT INTO players (username, total_score, data) VALUES (?, ?, ?)",
+                [(username, player.get('total_score', 0), json.dumps(player, ensure_ascii=False))
+                 for username, player in players.items()]
+            )
+            self._bump_players_version(conn)
+
+    def load_player(self, username):
+        row = self.connection().execute(
+            "SELECT data FROM players WHERE username = ?", (username,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _upsert_player(self, conn, username, player):
+        conn.execute(
+            "INSERT INTO players (username, total_score, data) VALUES (?, ?, ?) "
+            "ON CONFLICT (username) DO UPDATE SET total_score = excluded.total_score, data = excluded.data",
+            (username, player.get('total_score', 0), json.dumps(player, ensure_ascii=False))
+        )
+
+    def insert_player(self, username, player):
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM players WHERE username = ?", (username,)).fetchone():
+                return False
+            self._upsert_player(conn, username, player)
+            version = self._bump_players_version(conn)
+        _note_player_write(version - 1, version, username, player)
+        return True
+
+    def modify_player(self, username, update):
+        with self.transaction() as conn:
+            row = conn.execute("SELECT data FROM players WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                return None
+            player = json.loads(row[0])
+            update(player)
+            self._upsert_player(conn, username, player)
+            version = self._bump_players_version(conn)
+        _note_player_write(version - 1, version, username, player)
+        return player
+
+    #statistiche delle parole
+    def load_word_statistics(self):
+        stats = {'it': {}, 'en': {}}
+        rows = self.connection().execute("SELECT lang, word, count, first_used, last_used FROM word_stats")
+        for lang, word, count, first_used, last_used in rows:
+            stats.setdefault(lang, {})[word] = {
+                'count': count,
+                'first_used': first_used,
+                'last_used': last_used
+            }
+        return stats
+
+    def save_word_statistics(self, stats):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM word_stats")
+            conn.executemany(
+                "INSERT INTO word_stats (lang, word, count, first_used, last_used) VALUES (?, ?, ?, ?, ?)",
+                [(lang, word, data['count'], data.get('first_used'), data.get('last_used'))
+                 for lang, words in stats.items() for word, data in words.items()]
+            )
+            self._bump_version(conn, 'word_stats_version')
+
+    def increment_words(self, counts):
+        """somma in un'unica transazione i conteggi {lang: {word: {count, first_used, last_used}}}"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO word_stats (lang, word, count, first_used, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (lang, word) DO UPDATE SET count = count + excluded.count, last_used = excluded.last_used",
+                [(lang, word, data['count'], data['first_used'], data['last_used'])
+                 for lang, words in counts.items() for word, data in words.items()]
+            )
+            self._bump_version(conn, 'word_stats_version')
+
+    #mazzi di parole dei giocatori
+    def load_decks(self):
+        rows = self.connection().execute("SELECT player, lang, seed, position, size, hand FROM player_decks")
+        return {(player, lang): [seed, position, size, json.loads(hand)]
+                for player, lang, seed, position, size, hand in rows}
+
+    def save_decks(self, decks):
+        """salva i mazzi {(player, lang): [seed, position, size, hand]}: a parità di seme
+        resta la posizione più avanzata, un seme diverso (mazzo rimescolato) sostituisce il vecchio"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO player_decks (player, lang, seed, position, size, hand) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (player, lang) DO UPDATE SET seed = excluded.seed, position = excluded.position, "
+                "size = excluded.size, hand = excluded.hand "
+                "WHERE excluded.seed != player_decks.seed OR excluded.position > player_decks.position",
+                [(player, lang, seed, position, size, json.dumps(hand))
+                 for (player, lang), (seed, position, size, hand) in decks.items()]
+            )
+
+    #punteggi
+    def append_score(self, row):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO scores (player, score, attempts, won, lang, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                (row['player'], row['score'], row['attempts'], row['won'], row['lang'], row['timestamp'])
+            )
+
+    def ingest_games(self, usernames, apply, rows):
+        """salva un blocco di partite importate in un'unica transazione: legge i profili
+        coinvolti, li passa ad apply (che aggiunge i mancanti) e accoda i punteggi"""
+        with self.transaction() as conn:
+            players = {}
+            for username in usernames:
+                row = conn.execute("SELECT data FROM players WHERE username = ?", (username,)).fetchone()
+                if row is not None:
+                    players[username] = json.loads(row[0])
+            created = apply(players)
+            for username, player in players.items():
+                self._upsert_player(conn, username, player)
+            conn.executemany(
+                "INSERT INTO scores (player, score, attempts, won, lang, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                [(row['player'], row['score'], row['attempts'], row['won'], row['lang'], row['timestamp'])
+                 for row in rows]
+            )
+            self._bump_players_version(conn)
+        return created
+
+    def load_scores(self):
+        df = pd.read_sql_query(
+            "SELECT player, score, attempts, won, lang, timestamp FROM scores ORDER BY score DESC, id",
+            self.connection()
+        )
+        df['won'] = df['won'].astype(bool)
+        return df
+
+    def iter_scores(self, player=None, lang=None, since=None, until=None):
+        """righe dei punteggi lette dal cursore una alla volta, in ordine di inserimento"""
+        conditions, params = [], []
+        for clause, value in (("player = ?", player), ("lang = ?", lang),
+                              ("timestamp >= ?", since), ("timestamp < ?", until)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        #connessione dedicata: il generatore può essere consumato da thread diversi (asgi.py)
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        try:
+            cursor = conn.execute(
+                f"SELECT player, score, attempts, won, lang, timestamp FROM scores {where}ORDER BY id", params
+            )
+            for player, score, attempts, won, lang, timestamp in cursor:
+                yield {'player': player, 'score': score, 'attempts': attempts, 'won': bool(won),
+                       'lang': lang, 'timestamp': timestamp}
+        finally:
+            conn.close()
+
+    #partite giornaliere
+    def record_daily(self, row):
+        """registra il risultato giornaliero, False se il giocatore l'aveva già registrato"""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO daily_scores (day, lang, player, score, attempts, won, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (row['day'], row['lang'], row['player'], row['score'], row['attempts'], row['won'], row['timestamp'])
+            )
+        return cursor.rowcount == 1
+
+    def start_daily(self, row):
+        """segna l'inizio della partita giornaliera, False se il giocatore l'aveva già iniziata"""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO daily_starts (day, lang, player, timestamp) VALUES (?, ?, ?, ?)",
+                (row['day'], row['lang'], row['player'], row['timestamp'])
+            )
+        return cursor.rowcount == 1
+
+    def daily_top(self, day, lang, limit=10, offset=0):
+        rows = self.connection().execute(
+            "SELECT player, score, attempts, won, timestamp FROM daily_scores WHERE day = ? AND lang = ? "
+            "ORDER BY score DESC, timestamp, player LIMIT ? OFFSET ?",
+            (day, lang, limit, offset)
+        )
+        return [
+            {'player': player, 'score': score, 'attempts': attempts, 'won': bool(won), 'timestamp': timestamp}
+            for player, score, attempts, won, timestamp in rows
+        ]
+
+    def daily_count(self, day, lang):
+        return self.connection().execute(
+            "SELECT COUNT(*) FROM daily_scores WHERE day = ? AND lang = ?", (day, lang)
+        ).fetchone()[0]
+
+    def daily_rank(self, day, lang, username):
+        conn = self.connection()
+        row = conn.execute(
+            "SELECT score, timestamp FROM daily_scores WHERE day = ? AND lang = ? AND player = ?",
+            (day, lang, username)
+        ).fetchone()
+        if row is None:
+            return None
+        score, timestamp = row
+        ahead = conn.execute(
+            "SELECT COUNT(*) FROM daily_scores WHERE day = ? AND lang = ? AND "
+            "(score > ? OR (score = ? AND (timestamp < ? OR (timestamp = ? AND player < ?))))",
+            (day, lang, score, score, timestamp, timestamp, username)
+        ).fetchone()[0]
+        return ahead + 1
+
+    def migrate_from_files(self):
+        """importa una tantum i dati esistenti dai file JSON e CSV"""
+        counts = {'players': 0, 'scores': 0, 'words': 0}
+
+        if os.path.exists(PLAYERS_FILE):
+            with open(PLAYERS_FILE, 'r', encoding='utf-8') as f:
+                players = json.load(f)
+            with self.transaction() as conn:
+                for username, player in players.items():
+                    self._upsert_player(conn, username, player)
+                self._bump_players_version(conn)
+            counts['players'] = len(players)
+
+        if os.path.exists(WORD_STATS_FILE):
+            with open(WORD_STATS_FILE, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+            self.save_word_statistics(stats)
+            counts['words'] = sum(len(words) for words in stats.values())
+
+        if os.path.exists(SCORES_FILE):
+            df = pd.read_csv(SCORES_FILE)
+            df = df[df['player'].notna()]
+            rows = [
+                (
+                    row['player'],
+                    int(row['score']),
+                    None if pd.isna(row['attempts']) else int(row['attempts']),
+                    str(row['won']) == 'True',
+                    None if pd.isna(row['lang']) else row['lang'],
+                    None if pd.isna(row['timestamp']) else row['timestamp'],
+                )
+                for row in df.to_dict('records')
+            ]
+            with self.transaction() as conn:
+                conn.execute("DELETE FROM scores")
+                conn.executemany(
+                    "INSERT INTO scores (player, score, attempts, won, lang, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            counts['scores'] = len(rows)
+
+        return counts
+
+
+_sqlite_store = None
+
+
+def get_sqlite_store():
+    """restituisce l'archivio sqlite se è il backend selezionato, altrimenti None"""
+    global _sqlite_store
+    if STORAGE_BACKEND != 'sqlite':
+        return None
+    if _sqlite_store is None or _sqlite_store.path != DATABASE_FILE:
+        _sqlite_store = SqliteStore(DATABASE_FILE)
+    return _sqlite_store
+
+
+@app.cli.command('migrate-sqlite')
+def migrate_sqlite_command():
+    """Importa giocatori, punteggi e statistiche dai file JSON/CSV nel database sqlite"""
+    counts = SqliteStore(DATABASE_FILE).migrate_from_files()
+    print(f"Migrazione in {DATABASE_FILE}: {counts['players']} giocatori, "
+          f"{counts['scores']} punteggi, {counts['words']} parole")
+
+
+# caricamento e gestione salvataggi, giocatori
+class PlayerCache:
+    """profili usati di recente (LRU) con scrittura passante: valida finché i giocatori
+    salvati non cambiano, salvo le scritture di questo processo segnalate con note_write().
+    I profili in cache sono condivisi con chi li legge: vanno trattati in sola lettura"""
+
+    def __init__(self, capacity=PLAYER_CACHE_SIZE):
+        self.capacity = capacity
+        self._records = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        if version != self._version:
+            self._records.clear()
+            self._version = version
+
+    def get(self, username, version):
+        with self._lock:
+            self._check_version(version)
+            record = self._records.get(username)
+            if record is not None:
+                self._records.move_to_end(username)
+            return record
+
+    def put(self, username, record, version):
+        with self._lock:
+            self._check_version(version)
+            self._records[username] = record
+            self._records.move_to_end(username)
+            while len(self._records) > self.capacity:
+                self._records.popitem(last=False)
+
+    def note_write(self, before, after):
+        """scrittura di questo processo: se nessun altro ha scritto nel frattempo la cache resta valida"""
+        with self._lock:
+            if self._version == before:
+                self._version = after
+
+    def invalidate(self):
+        with self._lock:
+            self._records.clear()
+            self._version = None
+
+    def __len__(self):
+        return len(self._records)
+
+
+PLAYER_CACHE = PlayerCache()
+
+
+class PlayerFileIndex:
+    """file JSON dei giocatori scritto con un profilo per riga (resta un JSON valido):
+    le righe restano in memoria indicizzate per username, quindi leggere un giocatore
+    analizza solo il suo profilo. Ogni scrittura riscrive il file con un rename"""
+
+    RECORD_KEY = re.compile(rb'^"((?:[^"\\\n]|\\.)*)": ', re.M)
+
+    def __init__(self, path=PLAYERS_FILE):
+        self.path = path
+        self._version = object()
+        self._lock = threading.RLock()
+        #username -> riga del file senza virgola finale e posizione del valore nella riga
+        self._lines = {}
+
+    @staticmethod
+    def _line(username, player):
+        key = json.dumps(username, ensure_ascii=False).encode('utf-8') + b': '
+        return key + json.dumps(player, ensure_ascii=False).encode('utf-8'), len(key)
+
+    def _parse(self, data):
+        """ricostruisce l'indice dal contenuto del file con un'unica scansione delle righe"""
+        matches = list(self.RECORD_KEY.finditer(data))
+        if not matches:
+            #file vuoto o nel vecchio formato indentato: riscritto per righe alla prima modifica
+            players = json.loads(data) if data.strip() else {}
+            self._lines = {username: self._line(username, player) for username, player in players.items()}
+            return
+        lines = {}
+        for m in matches:
+            key = m.group(1)
+            username = json.loads(b'"' + key + b'"') if b'\\' in key else key.decode('utf-8')
+            end = data.index(b'\n', m.end())
+            #il valore termina prima della virgola di separazione
+            if data[end - 1:end] == b',':
+                end -= 1
+            lines[username] = (data[m.start():end], m.end() - m.start())
+        self._lines = lines
+
+    def _refresh(self):
+        #il file viene riletto solo se lo ha riscritto un altro processo
+        version = players_version()
+        if version == self._version:
+            return
+        data = b''
+        if version is not None:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        self._parse(data)
+        self._version = version
+
+    def _write(self):
+        data = b'{\n' + b',\n'.join(line for line, _ in self._lines.values()) + b'\n}\n'
+        tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.path)
+        file_lock(self.path).bump()
+        self._version = players_version()
+
+    def load(self, username):
+        """profilo del giocatore letto dalla sola riga che lo contiene, None se non esiste"""
+        with self._lock:
+            self._refresh()
+            entry = self._lines.get(username)
+        if entry is None:
+            return None
+        line, start = entry
+        return json.loads(line[start:])
+
+    def write_all(self, players):
+        """riscrive tutti i profili (da chiamare con il lock del file)"""
+        with self._lock:
+            self._lines = {username: self._line(username, player) for username, player in players.items()}
+            self._write()
+
+    def insert(self, username, player):
+        """aggiunge un profilo in fondo al file, False se esiste già (da chiamare con il lock del file)"""
+        with self._lock:
+            self._refresh()
+            if username in self._lines:
+                return False
+            self._lines[username] = self._line(username, player)
+            self._write()
+            return True
+
+    def replace(self, username, player):
+        """sostituisce il profilo del giocatore e riscrive il file (da chiamare con il lock del file)"""
+        with self._lock:
+            self._refresh()
+            self._lines[username] = self._line(username, player)
+            self._write()
+
+    def invalidate(self):
+        with self._lock:
+            self._version = object()
+
+
+PLAYER_INDEX = PlayerFileIndex()
+
+
+def _note_player_write(before, after, username, player):
+    """aggiorna classifica e cache dopo una scrittura del profilo fatta da questo processo"""
+    LEADERBOARD.note_write(before, after)
+    PLAYER_CACHE.note_write(before, after)
+    PLAYER_CACHE.put(username, player, after)
+
+
+@timed_span('load_players')
+def load_players():
+    """legge il file JSON che contiene tutti i giocatori registrati"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.load_players()
+
+    if os.path.exists(PLAYERS_FILE):
+        with open(PLAYERS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def _file_version(path):
+    """versione di un file scritto sotto file_lock: il contatore delle scritture, letto prima
+    di mtime e dimensione (che segnalano anche le modifiche fatte a mano), None se manca"""
+    generation = file_lock(path).generation()
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (generation, st.st_mtime_ns, st.st_size)
+
+
+def players_version():
+    """identifica l'ultima scrittura dei giocatori, anche se fatta da un altro processo"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.players_version()
+
+    return _file_version(PLAYERS_FILE)
+
+
+@timed_span('save_players')
+def save_players(players):
+    """scrive i dati dei giocatori all'interno del file JSON"""
+    #una riscrittura completa rende obsoleti la classifica e i profili in memoria
+    LEADERBOARD.invalidate()
+    PLAYER_CACHE.invalidate()
+    RESPONSE_CACHE.invalidate('players')
+
+    store = get_sqlite_store()
+    if store is not None:
+        store.save_players(players)
+        return
+
+    with file_lock(PLAYERS_FILE):
+        PLAYER_INDEX.write_all(players)
+
+
+@timed_span('load_player')
+def load_player(username):
+    """legge il profilo di un singolo giocatore, None se non esiste"""
+    #i giocatori attivi (ad esempio /check-session a ogni pagina) restano in cache
+    version = players_version()
+    player = PLAYER_CACHE.get(username, version)
+    if player is None:
+        store = get_sqlite_store()
+        player = store.load_player(username) if store is not None else PLAYER_INDEX.load(username)
+        if player is None:
+            return None
+        PLAYER_CACHE.put(username, player, version)
+    return player
+
+
+@timed_span('insert_player')
+def insert_player(username, player):
+    """registra un nuovo giocatore, False se lo username è già in uso"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.insert_player(username, player)
+
+    #lettura e scrittura sotto lo stesso lock per non perdere le modifiche degli altri worker
+    with file_lock(PLAYERS_FILE):
+        before = players_version()
+        if not PLAYER_INDEX.insert(username, player):
+            return False
+        after = players_version()
+    _note_player_write(before, after, username, player)
+    return True
+
+
+@timed_span('modify_player')
+def modify_player(username, update):
+    """applica la funzione update al profilo del giocatore e lo salva, None se non esiste"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.modify_player(username, update)
+
+    #si legge e si riscrive solo la riga del giocatore
+    with file_lock(PLAYERS_FILE):
+        before = players_version()
+        player = PLAYER_INDEX.load(username)
+        if player is None:
+            return None
+        update(player)
+        PLAYER_INDEX.replace(username, player)
+        after = players_version()
+    _note_player_write(before, after, username, player)
+    return player
+
+
+def _empty_score_stats():
+    """aggregati vuoti dei punteggi di un giocatore"""
+    return {'count': 0, 'sum': 0, 'sum_sq': 0, 'min': None, 'max': None, 'wins': 0}
+
+
+def new_player(nome, username):
+    """profilo di un giocatore appena registrato"""
+    return {
+        'nome': nome,
+        'username': username,
+        'created_at': datetime.now().isoformat(),
+        'last_played': None,
+        'games_played': 0,
+        'games_won': 0,
+        'total_attempts': 0,
+        'total_score': 0,
+        'average_score': 0.0,
+        'best_score': 0,
+        'current_streak': 0,
+        'best_streak': 0,
+        'lang_stats': {},
+        'score_stats': _empty_score_stats()
+    }
+
+
+def _add_score_to_stats(stats, score, won):
+    """aggiorna in O(1) gli aggregati con il punteggio di una partita"""
+    stats['count'] += 1
+    stats['sum'] += score
+    stats['sum_sq'] += score * score
+    stats['min'] = score if stats['min'] is None else min(stats['min'], score)
+    stats['max'] = score if stats['max'] is None else max(stats['max'], score)
+    if won:
+        stats['wins'] += 1
+
+
+def analytics_from_score_stats(stats):
+    """costruisce il dizionario delle statistiche avanzate a partire dagli aggregati"""
+    if not stats or stats['count'] == 0:
+        return None
+
+    count = stats['count']
+    mean = stats['sum'] / count
+    variance = max(stats['sum_sq'] / count - mean * mean, 0.0)
+
+    return {
+        'mean_score': float(mean),
+        'min_score': int(stats['min']),
+        'max_score': int(stats['max']),
+        'total_games': count,
+        'win_rate': float(stats['wins'] / count * 100),
+        'std_score': math.sqrt(variance),
+    }
+
+
+@timed_span('calculate_player_analytics')
+def calculate_player_analytics(username):
+    """restituisce le statistiche avanzate del giocatore dagli aggregati salvati nel profilo"""
+    player = load_player(username)
+
+    if player is None:
+        return None
+
+    return analytics_from_score_stats(player_score_stats(username, player))
+
+
+def _score_stats_by_player(df, usernames):
+    """aggregati dei punteggi calcolati dallo storico per i giocatori indicati"""
+    stats = {}
+    if len(df) == 0:
+        return stats
+
+    df = df[df['player'].isin(list(usernames))].copy()
+    df['score'] = df['score'].astype(int)
+    df['score_sq'] = df['score'] * df['score']
+    df['won'] = df['won'].astype(str) == 'True'
+
+    #tramite pandas raggruppare lo storico per giocatore
+    grouped = df.groupby('player').agg(
+        count=('score', 'size'),
+        sum=('score', 'sum'),
+        sum_sq=('score_sq', 'sum'),
+        min=('score', 'min'),
+        max=('score', 'max'),
+        wins=('won', 'sum'),
+    )
+    for username, row in grouped.iterrows():
+        stats[username] = {key: int(value) for key, value in row.items()}
+    return stats
+
+
+def _backfill_score_stats(username, player):
+    """aggiunge al profilo creato prima degli aggregati quelli ricavati dal suo storico"""
+    stats = _score_stats_by_player(load_scores(), [username]).get(username, _empty_score_stats())
+    player['score_stats'] = stats
+    if stats['count'] > 0:
+        player['average_score'] = stats['sum'] / stats['count']
+    return stats
+
+
+def player_score_stats(username, player):
+    """aggregati del giocatore; per i vecchi profili vengono ricalcolati e salvati una sola volta"""
+    if 'score_stats' in player:
+        return player['score_stats']
+
+    def backfill(stored):
+        if 'score_stats' not in stored:
+            _backfill_score_stats(username, stored)
+
+    stored = modify_player(username, backfill)
+    if stored is None:
+        return None
+    player['score_stats'] = stored['score_stats']
+    player['average_score'] = stored['average_score']
+    return stored['score_stats']
+
+
+def rebuild_player_stats():
+    """ricalcola gli aggregati di tutti i giocatori rileggendo l'intero storico CSV"""
+    with file_lock(PLAYERS_FILE):
+        return _rebuild_player_stats()
+
+
+def _rebuild_player_stats():
+    players = load_players()
+
+    for player in players.values():
+        player['score_stats'] = _empty_score_stats()
+        player['average_score'] = 0.0
+
+    for username, stats in _score_stats_by_player(load_scores(), players.keys()).items():
+        players[username]['score_stats'] = stats
+        players[username]['average_score'] = stats['sum'] / stats['count']
+
+    save_players(players)
+
+    return len(players)
+
+
+@app.cli.command('rebuild-player-stats')
+def rebuild_player_stats_command():
+    """Ricalcola gli aggregati dei giocatori dallo storico completo dei punteggi"""
+    count = rebuild_player_stats()
+    print(f"Statistiche ricalcolate per {count} giocatori")
+
+@timed_span('update_player_stats')
+def update_player_stats(username, won, attempts, lang):
+    """aggiorna le statistiche del giocatore dopo ogni partita ed utilizza numpy per calcoli statistici complessi"""
+
+    def apply_game(player):
+        #aumentiamo il numero di partite giocate
+        player['games_played'] += 1
+
+        #in caso di vittoria aumentareil numero di partite vinte 
+        if won:
+            player['games_won'] += 1
+
+        #umentare il numero di tenativi totali
+        player['total_attempts'] += attempts
+        player['last_played'] = datetime.now().isoformat()
+
+        #tramite pandas gestire le statistciche del giocatore in base alla lingua selezionata
+        if lang not in player['lang_stats']:
+            player['lang_stats'][lang] = {'played': 0, 'won': 0}
+
+        player['lang_stats'][lang]['played'] += 1
+        if won:
+            player['lang_stats'][lang]['won'] += 1
+
+        #calacolare il punteggio 
+        score = 100 - (attempts * 10)
+        if won:
+            score += 50
+
+        player['total_score'] += score
+        player['best_score'] = max(player.get('best_score', 0), score)
+
+        #aggiornare gli aggregati dei punteggi senza rileggere lo storico
+        #(i profili precedenti agli aggregati li ricavano dallo storico alla prima partita)
+        score_stats = player.get('score_stats')
+        if score_stats is None:
+            score_stats = _backfill_score_stats(username, player)
+        _add_score_to_stats(score_stats, score, won)
+        player['average_score'] = score_stats['sum'] / score_stats['count']
+
+        #gestire il numero di vittorie consecutive
+        if won:
+            player['current_streak'] = player.get('current_streak', 0) + 1
+            player['best_streak'] = max(player.get('best_streak', 0), player['current_streak'])
+        else:
+            player['current_streak'] = 0
+
+    #lettura, modifica e salvataggio del solo profilo interessato
+    player = modify_player(username, apply_game)
+    if player is None:
+        return False
+
+    LEADERBOARD.update(username, player)
+    RESPONSE_CACHE.invalidate('players')
+    return True
+
+#classifica dei giocatori mantenuta in memoria
+class LeaderboardIndex:
+    """indice ordinato per punteggio totale per rispondere a top-K e posizione senza riordinare tutto"""
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}
+        self._loaded = False
+        self._version = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(entry):
+        #punteggio decrescente, a parità di punteggio ordine alfabetico
+        return (-entry['total_score'], entry['username'])
+
+    @staticmethod
+    def _entry(username, player):
+        games_played = player.get('games_played', 0)
+        games_won = player.get('games_won', 0)
+        return {
+            'username': username,
+            'nome': player['nome'],
+            'total_score': player.get('total_score', 0),
+            'games_played': games_played,
+            'games_won': games_won,
+            'best_score': player.get('best_score', 0),
+            'best_streak': player.get('best_streak', 0),
+            'win_rate': round(games_won / games_played * 100, 2) if games_played > 0 else 0,
+        }
+
+    def _ensure_loaded(self):
+        #la versione cambia anche quando scrive un altro worker: l'indice va ricostruito
+        version = players_version()
+        if not self._loaded or version != self._version:
+            self.rebuild(load_players(), version)
+
+    def rebuild(self, players, version=None):
+        """ricostruisce l'indice a partire da tutti i giocatori"""
+        with self._lock:
+            self._entries = {username: self._entry(username, player) for username, player in players.items()}
+            self._keys = sorted(self._key(entry) for entry in self._entries.values())
+            self._version = version
+            self._loaded = True
+
+    def note_write(self, before, after):
+        """registra una scrittura di questo processo: se nessun altro ha scritto nel frattempo
+        l'indice resta valido e viene aggiornato con update()"""
+        with self._lock:
+            if self._loaded and self._version == before:
+                self._version = after
+
+    def update(self, username, player):
+        """inserisce o aggiorna un giocatore in O(log N)"""
+        with self._lock:
+            if not self._loaded:
+                return
+            old = self._entries.get(username)
+            if old is not None:
+                del self._keys[bisect.bisect_left(self._keys, self._key(old))]
+            entry = self._entry(username, player)
+            self._entries[username] = entry
+            bisect.insort(self._keys, self._key(entry))
+
+    def invalidate(self):
+        """forza la ricostruzione dell'indice alla prossima lettura"""
+        with self._lock:
+            self._loaded = False
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._keys)
+
+    def top(self, limit=10, offset=0):
+        """restituisce i giocatori da offset a offset+limit in O(K)"""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(self._entries[username]) for _, username in self._keys[offset:offset + limit]]
+
+    def rank(self, username):
+        """posizione in classifica (partendo da 1) del giocatore, None se non esiste"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            return bisect.bisect_left(self._keys, self._key(entry)) + 1
+
+
+LEADERBOARD = LeaderboardIndex()
+
+#funzioni per gestire le staistiche delle parole 
+@timed_span('load_word_statistics')
+def _read_word_statistics():
+    """legge le statistiche delle parole già salvate, senza i conteggi in attesa di scrittura"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.load_word_statistics()
+
+    if os.path.exists(WORD_STATS_FILE):
+        with open(WORD_STATS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'it': {}, 'en': {}}
+
+
+def _merge_word_counts(stats, pending):
+    """somma ai dati salvati i conteggi accumulati in memoria"""
+    for lang, words in pending.items():
+        lang_stats = stats.setdefault(lang, {})
+        for word, data in words.items():
+            if word in lang_stats:
+                lang_stats[word]['count'] += data['count']
+                lang_stats[word]['last_used'] = data['last_used']
+            else:
+                lang_stats[word] = dict(data)
+    return stats
+
+
+def load_word_statistics():
+    """carica le statistiche di quante volte vengono utilizzate le parole all'interno del file JSON"""
+    #i conteggi non ancora scritti sul disco vengono sommati a quelli salvati
+    return _merge_word_counts(_read_word_statistics(), WORD_COUNT_BUFFER.snapshot())
+
+
+def _atomic_write_json(path, data):
+    """scrive il file JSON su un file temporaneo e lo sostituisce in modo atomico"""
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, path)
+
+
+@timed_span('save_word_statistics')
+def save_word_statistics(stats):
+    """salva le statistiche delle parole utilizzate nel file JSON"""
+    store = get_sqlite_store()
+    if store is not None:
+        store.save_word_statistics(stats)
+        return
+
+    with file_lock(WORD_STATS_FILE) as lock:
+        _atomic_write_json(WORD_STATS_FILE, stats)
+        lock.bump()
+
+
+def word_stats_version():
+    """identifica l'ultima scrittura delle statistiche salvate, anche se fatta da un altro processo"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.version('word_stats_version')
+
+    return _file_version(WORD_STATS_FILE)
+
+
+def _to_epoch_us(values):
+    """converte timestamp ISO (o valori mancanti) in int64 di microsecondi, NaT se mancano"""
+    values = ['NaT' if not v or v == 'N/A' else v for v in values]
+    return np.array(values, dtype='datetime64[us]').view(np.int64)
+
+
+def _from_epoch_us(value):
+    """riporta un timestamp int64 in microsecondi al formato ISO salvato, 'N/A' se manca"""
+    if value == np.iinfo(np.int64).min:
+        return 'N/A'
+    #senza pandas: questo endpoint carica solo numpy
+    return (datetime(1970, 1, 1) + timedelta(microseconds=int(value))).isoformat()
+
+
+class WordFrequencyTable:
+    """conteggi di utilizzo di una lingua in array paralleli (conteggi e timestamp int64 in µs)"""
+
+    def __init__(self, words, counts, first_used, last_used):
+        self.words = words
+        self.counts = counts
+        self.first_used = first_used
+        self.last_used = last_used
+        self.index = {w: i for i, w in enumerate(words)}
+        self.total = int(counts.sum())
+
+    @classmethod
+    def from_stats(cls, lang_stats):
+        words = list(lang_stats)
+        data = lang_stats.values()
+        return cls(
+            words,
+            np.fromiter((d['count'] for d in data), dtype=np.int64, count=len(words)),
+            _to_epoch_us([d.get('first_used') for d in data]),
+            _to_epoch_us([d.get('last_used') for d in data]),
+        )
+
+    def __len__(self):
+        return len(self.words)
+
+    def merged(self, pending):
+        """nuova tabella con i conteggi non ancora salvati; senza conteggi restituisce se stessa"""
+        if not pending:
+            return self
+        words = list(self.words)
+        counts = self.counts.copy()
+        first_used = self.first_used.copy()
+        last_used = self.last_used.copy()
+        new_words = [w for w in pending if w not in self.index]
+        if new_words:
+            words += new_words
+            missing = np.full(len(new_words), np.iinfo(np.int64).min)
+            counts = np.concatenate([counts, np.zeros(len(new_words), dtype=np.int64)])
+            first_used = np.concatenate([first_used, _to_epoch_us([pending[w]['first_used'] for w in new_words])])
+            last_used = np.concatenate([last_used, missing])
+
+        positions = np.fromiter((self.index.get(w, -1) for w in pending), dtype=np.int64, count=len(pending))
+        positions[positions < 0] = np.arange(len(self.words), len(words))
+        counts[positions] += np.fromiter((d['count'] for d in pending.values()), dtype=np.int64, count=len(pending))
+        last_used[positions] = _to_epoch_us([d['last_used'] for d in pending.values()])
+        return WordFrequencyTable(words, counts, first_used, last_used)
+
+    @functools.cached_property
+    def _distinct_counts(self):
+        return np.unique(self.counts)
+
+    def frequency_rank(self, positions):
+        """rango denso per conteggio decrescente (1 = parola più usata)"""
+        distinct = self._distinct_counts
+        return (len(distinct) - np.searchsorted(distinct, self.counts[positions])).astype(float)
+
+    def _record(self, i, rank):
+        return {
+            'word': self.words[i],
+            'count': int(self.counts[i]),
+            'first_used': _from_epoch_us(self.first_used[i]),
+            'last_used': _from_epoch_us(self.last_used[i]),
+            'frequency_rank': float(rank),
+            'usage_percentage': float(self.counts[i] / self.total * 100) if self.total else 0.0,
+        }
+
+    def top(self, limit=10):
+        """le limit parole più usate in O(N) con argpartition, a parità nell'ordine di inserimento"""
+        if limit <= 0 or len(self) == 0:
+            return []
+        limit = min(limit, len(self))
+        positions = np.argpartition(-self.counts, limit - 1)[:limit]
+        #argpartition non è stabile: i pari merito al confine si scelgono come nlargest
+        threshold = self.counts[positions].min()
+        above = np.flatnonzero(self.counts > threshold)
+        ties = np.flatnonzero(self.counts == threshold)[:limit - len(above)]
+        positions = np.concatenate([above, ties])
+        positions = positions[np.lexsort((positions, -self.counts[positions]))]
+        return [self._record(i, rank) for i, rank in zip(positions, self.frequency_rank(positions))]
+
+    @functools.cached_property
+    def frame(self):
+        """DataFrame con le colonne di analyze_word_frequency, costruito solo se richiesto"""
+        if len(self) == 0:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            'word': self.words,
+            'count': self.counts,
+            'first_used': [_from_epoch_us(v) for v in self.first_used],
+            'last_used': [_from_epoch_us(v) for v in self.last_used],
+            'frequency_rank': self.frequency_rank(slice(None)),
+            'usage_percentage': self.counts / self.total * 100 if self.total else 0.0,
+        })
+
+
+class WordFrequencyIndex:
+    """tabelle delle frequenze per lingua: i dati salvati si rileggono solo quando cambiano,
+    i conteggi in memoria si sommano solo quando ne arrivano di nuovi"""
+
+    def __init__(self):
+        self._base = {}
+        self._base_version = object()
+        self._tables = {}
+        self._key = None
+        self._lock = threading.Lock()
+
+    def tables(self):
+        key = (word_stats_version(), WORD_COUNT_BUFFER.version)
+        if key == self._key:
+            return self._tables
+
+        with self._lock:
+            if key != self._key:
+                self._load_base(key[0])
+                pending = WORD_COUNT_BUFFER.snapshot()
+                empty = WordFrequencyTable.from_stats({})
+                self._tables = {
+                    lang: self._base.get(lang, empty).merged(pending.get(lang, {}))
+                    for lang in list(self._base) + [lang for lang in pending if lang not in self._base]
+                }
+                self._key = key
+        return self._tables
+
+    def _load_base(self, version):
+        """rilegge i conteggi salvati se sono cambiati (da chiamare con il lock acquisito)"""
+        if version != self._base_version:
+            self._base = {
+                lang: WordFrequencyTable.from_stats(words)
+                for lang, words in _read_word_statistics().items()
+            }
+            self._base_version = version
+
+    def get(self, lang):
+        return self.tables().get(lang)
+
+    def counts(self, lang, words):
+        """utilizzi delle parole indicate, salvati e in memoria, senza ricostruire le tabelle"""
+        version = word_stats_version()
+        with self._lock:
+            self._load_base(version)
+            table = self._base.get(lang)
+        pending = WORD_COUNT_BUFFER.pending_counts(words, lang)
+        if table is None:
+            return pending
+        return [(int(table.counts[table.index[word]]) if word in table.index else 0) + extra
+                for word, extra in zip(words, pending)]
+
+    def invalidate(self):
+        with self._lock:
+            self._key = None
+            self._base_version = object()
+
+
+WORD_FREQUENCY = WordFrequencyIndex()
+
+
+def analyze_word_frequency(lang='it'):
+    """analizza con che frequenza escono certe parole usando pandas"""
+    table = WORD_FREQUENCY.get(lang)
+    
+    if table is None or len(table) == 0:
+        return pd.DataFrame()
+    
+    #il DataFrame resta in cache finché i conteggi non cambiano: se ne restituisce una copia
+    return table.frame.copy()
+
+
+class WordCountBuffer:
+    """accumula in memoria i conteggi delle parole e li scrive a blocchi da un thread in background"""
+
+    def __init__(self, flush_interval=WORD_STATS_FLUSH_INTERVAL, flush_batch=WORD_STATS_FLUSH_BATCH):
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self._pending = {}
+        self._inflight = {}
+        self._updates = 0
+        #cresce a ogni utilizzo registrato: invalida le tabelle delle frequenze
+        self.version = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def add(self, word, lang='it'):
+        """registra un utilizzo della parola senza toccare il disco"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            words = self._pending.setdefault(lang, {})
+            if word in words:
+                words[word]['count'] += 1
+                words[word]['last_used'] = now
+            else:
+                words[word] = {'count': 1, 'first_used': now, 'last_used': now}
+            self._updates += 1
+            self.version += 1
+            if self._updates >= self.flush_batch:
+                self._wakeup.set()
+        self._ensure_thread()
+
+    def snapshot(self):
+        """copia dei conteggi non ancora salvati, compresi quelli in corso di scrittura"""
+        with self._lock:
+            merged = {}
+            for pending in (self._inflight, self._pending):
+                _merge_word_counts(merged, {
+                    lang: {word: dict(data) for word, data in words.items()}
+                    for lang, words in pending.items()
+                })
+            return merged
+
+    def pending_counts(self, words, lang='it'):
+        """utilizzi delle parole non ancora salvati"""
+        with self._lock:
+            return [sum(pending.get(lang, {}).get(word, {}).get('count', 0)
+                        for pending in (self._inflight, self._pending))
+                    for word in words]
+
+    def flush(self):
+        """scrive su disco tutti i conteggi accumulati"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._inflight, self._pending = self._pending, {}
+                updates, self._updates = self._updates, 0
+
+            try:
+                store = get_sqlite_store()
+                if store is not None:
+                    store.increment_words(self._inflight)
+                else:
+                    with file_lock(WORD_STATS_FILE):
+                        stats = _merge_word_counts(_read_word_statistics(), self._inflight)
+                        save_word_statistics(stats)
+            except Exception:
+                #in caso di errore i conteggi tornano in coda per il prossimo tentativo
+                with self._lock:
+                    self._pending = _merge_word_counts(self._inflight, self._pending)
+                    self._updates += updates
+                    self._inflight = {}
+                raise
+
+            with self._lock:
+                self._inflight = {}
+            return updates
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='word-count-flush', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[ERROR] Salvataggio statistiche parole fallito: {e}")
+
+
+WORD_COUNT_BUFFER = WordCountBuffer()
+#all'uscita del processo i conteggi ancora in memoria vengono salvati
+atexit.register(WORD_COUNT_BUFFER.flush)
+
+
+def increment_word_count(word, lang='it'):
+    """incrementa il contatore di utilizzo per una specifica parola"""
+    #il salvataggio avviene a blocchi in background, fuori dalla richiesta
+    WORD_COUNT_BUFFER.add(word, lang)
+    RESPONSE_CACHE.invalidate('words')
+    
+
+def get_top_words(lang='it', limit=10):
+    """restituisce le tot parole più utilizzate usando argpartition sugli array dei conteggi"""
+    table = WORD_FREQUENCY.get(lang)
+    
+    if table is None:
+        return []
+    
+    #selezione parziale delle prime limit parole, senza ordinare tutto il vocabolario
+    return table.top(limit)
+
+#motore di confronto: il risultato di un tentativo è un intero in base 3
+#(una cifra per posizione: 0 assente, 1 presente, 2 corretta)
+PATTERN_ABSENT = 0
+PATTERN_PRESENT = 1
+PATTERN_CORRECT = 2
+PATTERN_STATUSES = ('absent', 'present', 'correct')
+PATTERN_WEIGHTS = tuple(3 ** i for i in range(5))
+
+
+def encode_words(words):
+    """converte un array 'S5' di parole maiuscole in una matrice uint8 (N, 5) di lettere 0-25"""
+    words = np.ascontiguousarray(words, dtype='S5')
+    return words.view(np.uint8).reshape(-1, 5) - ord('A')
+
+
+def score_pattern(guess, secret):
+    """confronta un tentativo con la parola segreta e restituisce il pattern in base 3"""
+    digits = [PATTERN_ABSENT] * 5
+    remaining = {}
+
+    #prima le lettere nella posizione giusta
+    for i in range(5):
+        if guess[i] == secret[i]:
+            digits[i] = PATTERN_CORRECT
+        else:
+            remaining[secret[i]] = remaining.get(secret[i], 0) + 1
+
+    #poi le lettere presenti, assegnate da sinistra finché ne restano nella parola segreta
+    for i in range(5):
+        if digits[i] == PATTERN_ABSENT and remaining.get(guess[i], 0) > 0:
+            digits[i] = PATTERN_PRESENT
+            remaining[guess[i]] -= 1
+
+    return digits[0] + 3 * digits[1] + 9 * digits[2] + 27 * digits[3] + 81 * digits[4]
+
+
+def score_patterns(guess_codes, secret_codes):
+    """confronta un tentativo codificato con molte parole segrete codificate in una sola volta"""
+    secret_codes = np.asarray(secret_codes)
+    guess_codes = np.asarray(guess_codes)
+    n = len(secret_codes)
+    rows = np.arange(n)
+
+    correct = secret_codes == guess_codes
+    digits = np.where(correct, PATTERN_CORRECT, PATTERN_ABSENT).astype(np.uint8)
+
+    #quante volte ogni lettera compare nelle posizioni non indovinate di ciascuna parola segreta
+    remaining = np.zeros((n, 26), dtype=np.int8)
+    for j in range(5):
+        remaining[rows, secret_codes[:, j]] += ~correct[:, j]
+
+    #stessa regola della versione scalare: le presenti si assegnano da sinistra
+    for i in range(5):
+        letter = guess_codes[i]
+        present = ~correct[:, i] & (remaining[:, letter] > 0)
+        digits[present, i] = PATTERN_PRESENT
+        remaining[:, letter] -= present
+
+    return digits @ np.array(PATTERN_WEIGHTS, dtype=np.int32)
+
+
+def pattern_to_results(guess, pattern):
+    """trasforma il pattern in base 3 nella lista di risultati per lettera restituita dalle API"""
+    results = []
+    for i in range(5):
+        results.append({
+            'letter': guess[i],
+            'status': PATTERN_STATUSES[pattern % 3],
+            'position': i
+        })
+        pattern //= 3
+    return results
+
+
+#gestione parole
+class WordList:
+    """lista di parole di una lingua caricata in un array numpy a larghezza fissa di 5 byte"""
+
+    def __init__(self, lang, path, words, mtime, accepted=()):
+        self.lang = lang
+        self.path = path
+        self.mtime = mtime
+        self.words = np.array(words, dtype='S5')
+        #lettere codificate una sola volta per i confronti vettoriali
+        self.codes = encode_words(self.words)
+        #indice parola -> posizione per verificare l'appartenenza in O(1)
+        self.index = {w: i for i, w in enumerate(words)}
+        #parole accettate come tentativo ma mai estratte come parola segreta
+        self.accepted = frozenset(accepted) - self.index.keys()
+
+    @functools.cached_property
+    def guesses(self):
+        """tutti i tentativi validi: prima le parole segrete, poi quelle solo accettate"""
+        return np.concatenate([self.words, np.array(sorted(self.accepted), dtype='S5')])
+
+    @functools.cached_property
+    def secret_rows(self):
+        """posizione di ogni parola segreta in guesses"""
+        return np.arange(len(self.words))
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word.upper() in self.index
+
+    def is_valid_guess(self, word):
+        """verifica in O(1) che il tentativo sia una parola del dizionario"""
+        word = word.upper()
+        return word in self.index or word in self.accepted
+
+    def word_at(self, idx):
+        """restituisce la parola in posizione idx come stringa"""
+        return self.words[idx].decode('ascii')
+
+    def random_word(self):
+        """estrae una parola a caso in O(1)"""
+        return self.word_at(np.random.randint(0, len(self.words)))
+
+
+#formato binario dei dizionari: intestazione, record ordinati da 5 byte maiuscoli,
+#poi le colonne opzionali di metadati (frequenza uint32, idoneità come parola segreta uint8)
+WORD_BINARY_MAGIC = b'WLB1'
+WORD_BINARY_HEADER = struct.Struct('<4sHHI4x')
+WORD_BINARY_HAS_FREQUENCY = 1
+WORD_BINARY_HAS_SECRET_FLAG = 2
+
+
+def _align4(offset):
+    return (offset + 3) & ~3
+
+
+def write_binary_word_list(path, words, frequencies=None, secret=None):
+    """scrive il dizionario compilato: record ordinati e colonne di metadati allineate"""
+    words = np.array(sorted(set(words)), dtype='S5')
+    order = {w: i for i, w in enumerate(words.tolist())}
+    flags = 0
+
+    columns = []
+    if frequencies is not None:
+        flags |= WORD_BINARY_HAS_FREQUENCY
+        freq = np.zeros(len(words), dtype='<u4')
+        for word, count in frequencies.items():
+            idx = order.get(word.encode('ascii'))
+            if idx is not None:
+                freq[idx] = count
+        columns.append(freq)
+    if secret is not None:
+        flags |= WORD_BINARY_HAS_SECRET_FLAG
+        secret = {w.encode('ascii') for w in secret}
+        columns.append(np.array([w in secret for w in words.tolist()], dtype=np.uint8))
+
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(WORD_BINARY_HEADER.pack(WORD_BINARY_MAGIC, 1, flags, len(words)))
+        f.write(words.tobytes())
+        for column in columns:
+            f.write(b'\0' * (_align4(f.tell()) - f.tell()))
+            f.write(column.tobytes())
+    os.replace(tmp_file, path)
+    return len(words)
+
+
+class MappedWordList:
+    """dizionario compilato letto tramite mmap: le pagine sono condivise tra i processi e
+    la ricerca è binaria sui byte, senza creare un oggetto stringa per ogni parola"""
+
+    def __init__(self, lang, path, mtime):
+        self.lang = lang
+        self.path = path
+        self.mtime = mtime
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, flags, count = WORD_BINARY_HEADER.unpack_from(self._mmap)
+        if magic != WORD_BINARY_MAGIC or version != 1:
+            raise ValueError(f"{path} non è un dizionario compilato valido")
+
+        offset = WORD_BINARY_HEADER.size
+        #tutte le parole accettate come tentativo, in ordine
+        self.records = np.frombuffer(self._mmap, dtype='S5', count=count, offset=offset)
+        offset += count * 5
+
+        self.frequencies = None
+        if flags & WORD_BINARY_HAS_FREQUENCY:
+            offset = _align4(offset)
+            self.frequencies = np.frombuffer(self._mmap, dtype='<u4', count=count, offset=offset)
+            offset += count * 4
+
+        if flags & WORD_BINARY_HAS_SECRET_FLAG:
+            offset = _align4(offset)
+            eligible = np.frombuffer(self._mmap, dtype=np.uint8, count=count, offset=offset)
+            self.secret_indices = np.flatnonzero(eligible)
+        else:
+            self.secret_indices = None
+
+    @functools.cached_property
+    def words(self):
+        """parole che possono essere estratte come parola segreta"""
+        if self.secret_indices is None:
+            return self.records
+        return self.records[self.secret_indices]
+
+    @functools.cached_property
+    def codes(self):
+        #lettere codificate solo al primo confronto vettoriale
+        return encode_words(self.words)
+
+    @property
+    def guesses(self):
+        """tutti i tentativi validi, nell'ordine dei record"""
+        return self.records
+
+    @functools.cached_property
+    def secret_rows(self):
+        """posizione di ogni parola segreta in guesses"""
+        if self.secret_indices is None:
+            return np.arange(len(self.records))
+        return self.secret_indices
+
+    def __len__(self):
+        return len(self.records) if self.secret_indices is None else len(self.secret_indices)
+
+    def _find(self, word):
+        """posizione della parola nei record tramite ricerca binaria, None se assente"""
+        try:
+            key = word.upper().encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        if len(key) != 5:
+            return None
+        idx = int(np.searchsorted(self.records, key))
+        if idx < len(self.records) and self.records[idx] == key:
+            return idx
+        return None
+
+    def __contains__(self, word):
+        idx = self._find(word)
+        if idx is None:
+            return False
+        if self.secret_indices is None:
+            return True
+        pos = np.searchsorted(self.secret_indices, idx)
+        return pos < len(self.secret_indices) and self.secret_indices[pos] == idx
+
+    def is_valid_guess(self, word):
+        """verifica in O(log N) che il tentativo sia una parola del dizionario"""
+        return self._find(word) is not None
+
+    def word_at(self, idx):
+        """restituisce la parola segreta in posizione idx come stringa"""
+        if self.secret_indices is not None:
+            idx = self.secret_indices[idx]
+        return self.records[idx].decode('ascii')
+
+    def random_word(self):
+        """estrae una parola a caso in O(1)"""
+        return self.word_at(np.random.randint(0, len(self)))
+
+
+def _read_word_file(path):
+    """legge un file di parole separate da virgole"""
+    with open(path, "r", encoding='utf-8') as file:
+        return [p.strip().upper() for p in file.read().strip().split(",") if p.strip()]
+
+
+class WordRegistry:
+    """registro di processo delle liste di parole, ricaricate solo se il file cambia"""
+
+    def __init__(self, files, accepted_files=None, compiled_files=None):
+        self.files = files
+        self.accepted_files = accepted_files or {}
+        self.compiled_files = compiled_files or {}
+        self._lists = {}
+        self._lock = threading.Lock()
+
+    def _mtime(self, lang, path):
+        accepted_path = self.accepted_files.get(lang)
+        accepted_mtime = None
+        if accepted_path and os.path.exists(accepted_path):
+            accepted_mtime = os.stat(accepted_path).st_mtime_ns
+        return (os.stat(path).st_mtime_ns, accepted_mtime)
+
+    def _source(self, lang):
+        """sceglie il file da caricare: il dizionario compilato se non è più vecchio dei .txt"""
+        path = self.files.get(lang, self.files['it'])
+        compiled_path = self.compiled_files.get(lang if lang in self.files else 'it')
+        if compiled_path and os.path.exists(compiled_path):
+            compiled_mtime = os.stat(compiled_path).st_mtime_ns
+            sources = [path, self.accepted_files.get(lang)]
+            if all(not p or not os.path.exists(p) or os.stat(p).st_mtime_ns <= compiled_mtime for p in sources):
+                return compiled_path, (compiled_mtime, None)
+        return path, self._mtime(lang, path)
+
+    def get(self, lang='it'):
+        """restituisce la lista della lingua, rileggendo i file solo se l'mtime è cambiato"""
+        path, mtime = self._source(lang)
+        word_list = self._lists.get(lang)
+        if word_list is not None and word_list.path == path and word_list.mtime == mtime:
+            return word_list
+
+        with self._lock:
+            word_list = self._lists.get(lang)
+            if word_list is None or word_list.path != path or word_list.mtime != mtime:
+                if path == self.compiled_files.get(lang if lang in self.files else 'it'):
+                    word_list = MappedWordList(lang, path, mtime)
+                else:
+                    accepted = []
+                    if mtime[1] is not None:
+                        accepted = _read_word_file(self.accepted_files[lang])
+                    word_list = WordList(lang, path, _read_word_file(path), mtime, accepted)
+                self._lists[lang] = word_list
+        return word_list
+
+    def clear(self):
+        """svuota il registro forzando la rilettura dei file"""
+        with self._lock:
+            self._lists.clear()
+
+
+WORD_REGISTRY = WordRegistry(WORD_FILES, ACCEPTED_WORD_FILES, COMPILED_WORD_FILES)
+
+
+def compile_word_list(lang):
+    """compila il dizionario .txt della lingua (più le parole accettate) nel formato binario"""
+    secret = _read_word_file(WORD_FILES[lang])
+    accepted = []
+    accepted_path = ACCEPTED_WORD_FILES.get(lang)
+    if accepted_path and os.path.exists(accepted_path):
+        accepted = _read_word_file(accepted_path)
+
+    secret = [w for w in secret if len(w) == 5 and w.isascii() and w.isalpha()]
+    words = secret + [w for w in accepted if len(w) == 5 and w.isascii() and w.isalpha()]
+    #come frequenza si usa il numero di volte in cui la parola è già uscita
+    frequencies = {word: data['count'] for word, data in load_word_statistics().get(lang, {}).items()}
+    return write_binary_word_list(COMPILED_WORD_FILES[lang], words, frequencies, secret)
+
+
+@app.cli.command('compile-words')
+def compile_words_command():
+    """Compila i file .txt delle parole nel formato binario caricato tramite mmap"""
+    for lang, file_parole in WORD_FILES.items():
+        if not os.path.exists(file_parole):
+            print(f"File {file_parole} non trovato, lingua {lang} saltata")
+            continue
+        count = compile_word_list(lang)
+        print(f"Dizionario {lang}: {count} parole in {COMPILED_WORD_FILES[lang]}")
+    WORD_REGISTRY.clear()
+
+
+def deck_index(seed, position, size):
+    """carta in posizione position del mazzo mescolato di size parole, calcolata in O(1):
+    una rete di Feistel a 4 round è una permutazione del dominio 2^k (k pari, 2^k < 4*size)
+    e il cycle-walking la restringe a [0, size)"""
+    half = (max(2, (size - 1).bit_length()) + 1) // 2
+    mask = (1 << half) - 1
+    x = position
+    while True:
+        left, right = x >> half, x & mask
+        for round_number in range(4):
+            digest = hashlib.blake2b(f"{seed}:{round_number}:{right}".encode('ascii'), digest_size=8).digest()
+            left, right = right, left ^ (int.from_bytes(digest, 'little') & mask)
+        x = (left << half) | right
+        if x < size:
+            return x
+
+
+class PlayerDecks:
+    """mazzo di parole mescolato per giocatore e lingua: di ogni mazzo si tengono solo
+    seme, posizione, dimensione e una mano di al massimo DECK_HAND_SIZE carte, in
+    memoria, salvati a blocchi da un thread in background come i conteggi delle parole.
+
+    A ogni estrazione la mano si completa con le prossime carte del mazzo e si gioca
+    la carta meno usata globalmente (conteggi di increment_word_count): le altre
+    restano in mano, quindi nessuna parola si ripete finché il giocatore non ha visto
+    tutto il dizionario. Tra worker diversi le posizioni si riallineano a ogni salvataggio."""
+
+    def __init__(self, path=PLAYER_DECKS_FILE, flush_interval=WORD_STATS_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = None
+        self._decks = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def _read(self):
+        store = get_sqlite_store()
+        if store is not None:
+            return store.load_decks()
+
+        if not os.path.exists(self._file):
+            return {}
+        with open(self._file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        return {(player, lang): deck for player, langs in saved.items() for lang, deck in langs.items()}
+
+    def _ensure_loaded(self):
+        if self._decks is None:
+            #il percorso viene fissato al primo caricamento: il salvataggio finale (atexit)
+            #scrive nello stesso file anche se nel frattempo è cambiata la cartella corrente
+            self._file = os.path.abspath(self.path)
+            self._decks = self._read()
+
+    def draw(self, username, lang, size, usage):
+        """indice della prossima parola del mazzo; usage(indici) dà gli utilizzi globali"""
+        key = (username, lang)
+        with self._lock:
+            self._ensure_loaded()
+            deck = self._decks.get(key)
+            #mazzo finito o dizionario cambiato: si rimescola con un nuovo seme
+            if deck is None or deck[2] != size or (deck[1] >= size and not deck[3]):
+                deck = self._decks[key] = [secrets.randbits(63), 0, size, []]
+
+            seed, _, _, hand = deck
+            while len(hand) <= DECK_HAND_SIZE and deck[1] < size:
+                hand.append(deck_index(seed, deck[1], size))
+                deck[1] += 1
+            candidates = list(hand)
+            #segnato subito: flush() non deve sostituire il mazzo mentre si leggono gli utilizzi
+            self._dirty.add(key)
+
+        #i conteggi si leggono fuori dal lock, così le estrazioni dei giocatori non si serializzano;
+        #a parità di utilizzi vince la carta in mano da più tempo
+        counts = usage(candidates)
+        ranking = sorted(range(len(candidates)), key=counts.__getitem__)
+        with self._lock:
+            hand = self._decks[key][3]
+            choice = next((candidates[i] for i in ranking if candidates[i] in hand), None)
+            if choice is not None:
+                hand.remove(choice)
+        if choice is None:
+            #un'altra estrazione contemporanea dello stesso giocatore ha giocato tutta la mano
+            return self.draw(username, lang, size, usage)
+        self._ensure_thread()
+        return choice
+
+    def flush(self):
+        """salva i mazzi modificati e riprende le posizioni raggiunte dagli altri worker"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                dirty = {key: self._decks[key][:3] + [list(self._decks[key][3])] for key in self._dirty}
+                self._dirty = set()
+
+            try:
+                store = get_sqlite_store()
+                if store is not None:
+                    store.save_decks(dirty)
+                    saved = store.load_decks()
+                else:
+                    with file_lock(self._file):
+                        saved = self._read()
+                        for key, deck in dirty.items():
+                            current = saved.get(key)
+                            if current is None or current[0] != deck[0] or current[1] < deck[1]:
+                                saved[key] = deck
+                        by_player = {}
+                        for (player, lang), deck in saved.items():
+                            by_player.setdefault(player, {})[lang] = deck
+                        _atomic_write_json(self._file, by_player)
+            except Exception:
+                #in caso di errore i mazzi restano da salvare al prossimo tentativo
+                with self._lock:
+                    self._dirty |= dirty.keys()
+                raise
+
+            with self._lock:
+                for key, deck in saved.items():
+                    if key not in self._dirty:
+                        self._decks[key] = deck
+            return len(dirty)
+
+    def clear(self):
+        with self._lock:
+            self._decks, self._dirty = None, set()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='player-decks-flush', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[ERROR] Salvataggio mazzi dei giocatori fallito: {e}")
+
+
+PLAYER_DECKS = PlayerDecks()
+atexit.register(PLAYER_DECKS.flush)
+
+
+def get_random_word(lang='it', username=None):
+    """seleziona una parola dal registro in memoria; per un giocatore la estrae dal suo
+    mazzo, senza ripetizioni e preferendo le parole meno usate"""
+    file_parole = WORD_FILES.get(lang, WORD_FILES['it'])
+
+    if not os.path.exists(file_parole):
+        print(f"[ERROR] File {file_parole} non trovato!")
+        return "ERROR"
+
+    #la lista viene letta dal disco una sola volta per processo
+    word_list = WORD_REGISTRY.get(lang)
+    if username is None:
+        word = word_list.random_word()
+    else:
+        index = PLAYER_DECKS.draw(username, lang, len(word_list),
+                                  lambda hand: WORD_FREQUENCY.counts(lang, [word_list.word_at(i) for i in hand]))
+        word = word_list.word_at(index)
+
+    increment_word_count(word, lang)
+
+    return word
+
+
+def is_valid_guess(word, lang='it'):
+    """controlla che il tentativo sia nel dizionario della lingua (sempre valido se manca il file)"""
+    if not VALIDATE_GUESSES:
+        return True
+
+    try:
+        word_list = WORD_REGISTRY.get(lang)
+    except FileNotFoundError:
+        return True
+
+    return word_list.is_valid_guess(word)
+
+#modalità giornaliera
+def daily_number(day):
+    """numero progressivo del puzzle del giorno a partire da DAILY_EPOCH"""
+    return (day - DAILY_EPOCH).days
+
+
+class DailySchedule:
+    """calendario delle parole del giorno: una permutazione del dizionario per ogni ciclo,
+    calcolata con un seme fisso così che tutti i processi scelgano la stessa parola"""
+
+    def __init__(self, seed=DAILY_SEED, days=DAILY_SCHEDULE_DAYS, schedule_file=DAILY_SCHEDULE_FILE):
+        self.seed = seed
+        self.days = days
+        self.schedule_file = schedule_file
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def build(self, lang, start, days=None):
+        """parole dei giorni da start per days giorni: nessuna ripetizione finché il dizionario non si esaurisce"""
+        days = self.days if days is None else days
+        word_list = WORD_REGISTRY.get(lang)
+        n = len(word_list)
+        lang_seed = zlib.crc32(lang.encode('utf-8'))
+        permutations = {}
+        words = []
+        for number in range(daily_number(start), daily_number(start) + days):
+            cycle, position = divmod(number, n)
+            if cycle not in permutations:
+                permutations[cycle] = np.random.default_rng([self.seed, lang_seed, cycle]).permutation(n)
+            words.append(word_list.word_at(permutations[cycle][position]))
+        return words
+
+    def _load_file(self, lang):
+        """tabella salvata con flask daily-schedule, se esiste per la lingua"""
+        if not os.path.exists(self.schedule_file):
+            return None
+        with open(self.schedule_file, 'r', encoding='utf-8') as f:
+            table = json.load(f).get(lang)
+        if table is None:
+            return None
+        return {'start': date.fromisoformat(table['start']), 'words': table['words'], 'source': self.schedule_file}
+
+    def word_for(self, lang, day=None):
+        """parola del giorno per la lingua, in O(1) quando il giorno è nella tabella precalcolata"""
+        day = date.today() if day is None else day
+        table = self._tables.get(lang)
+        if table is None or not 0 <= (day - table['start']).days < len(table['words']):
+            with self._lock:
+                table = self._load_file(lang)
+                if table is None or not 0 <= (day - table['start']).days < len(table['words']):
+                    #senza file (o fuori dal suo intervallo) la tabella si calcola in memoria da oggi
+                    table = {'start': day, 'words': self.build(lang, day), 'source': None}
+                self._tables[lang] = table
+        return table['words'][(day - table['start']).days]
+
+    def save(self, start=None, days=None):
+        """precalcola il calendario di tutte le lingue e lo salva su file"""
+        start = date.today() if start is None else start
+        tables = {
+            lang: {'start': start.isoformat(), 'words': self.build(lang, start, days)}
+            for lang in WORD_FILES
+        }
+        with file_lock(self.schedule_file):
+            _atomic_write_json(self.schedule_file, tables)
+        self.clear()
+        return tables
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+
+DAILY_SCHEDULE = DailySchedule()
+
+
+def get_daily_word(lang='it', day=None):
+    """parola del giorno, uguale per tutti i giocatori della stessa lingua"""
+    word = DAILY_SCHEDULE.word_for(lang, day)
+    increment_word_count(word, lang)
+    return word
+
+
+@app.cli.command('daily-schedule')
+def daily_schedule_command():
+    """Precalcola le parole del giorno per il prossimo anno"""
+    tables = DAILY_SCHEDULE.save()
+    for lang, table in tables.items():
+        print(f"Calendario {lang}: {len(table['words'])} giorni dal {table['start']} in {DAILY_SCHEDULE_FILE}")
+
 
-# caricamento e gestione salvataggi, giocatori
-def load_players():
-    """legge il file JSON che contiene tutti i giocatori registrati"""
-    if os.path.exists(PLAYERS_FILE):
-        with open(PLAYERS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+class DailyLeaderboard:
+    """classifiche giornaliere aggiornate a ogni partita conclusa: il registro JSONL viene
+    letto solo nella parte aggiunta dopo l'ultima lettura, anche dagli altri worker.
+    Nel registro finisce anche l'inizio di ogni partita, che si può iniziare una volta sola"""
 
+    def __init__(self, path=DAILY_SCORES_FILE):
+        self.path = path
+        self._boards = {}
+        self._offset = 0
+        self._lock = threading.RLock()
 
-def save_players(players):
-    """scrive i dati dei giocatori all'interno del file JSON"""
-    with open(PLAYERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(players, f, indent=2, ensure_ascii=False)
+    @staticmethod
+    def _key(row):
+        #punteggio decrescente, poi chi ha finito prima
+        return (-row['score'], row['timestamp'], row['player'])
 
+    def _add(self, row):
+        board = self._boards.setdefault((row['day'], row['lang']), {'keys': [], 'rows': {}, 'started': set()})
+        if row.get('type') == 'start':
+            if row['player'] in board['started']:
+                return False
+            board['started'].add(row['player'])
+            return True
+        board['started'].add(row['player'])
+        if row['player'] in board['rows']:
+            return False
+        board['rows'][row['player']] = row
+        bisect.insort(board['keys'], self._key(row))
+        return True
 
-def calculate_player_analytics(username):
-    """calcola le statistiche avanzate del giocatore usando numpy e pandas"""
-    if not os.path.exists(SCORES_FILE):
-        return None
-    
-    #tramite pandas caricare i file e i risultati
-    df_scores = pd.read_csv(SCORES_FILE)
-    player_data = df_scores[df_scores['player'] == username]
-    
-    if len(player_data) == 0:
+    def _refresh(self):
+        """legge le righe aggiunte al registro dall'ultima lettura"""
+        if not os.path.exists(self.path):
+            self._boards, self._offset = {}, 0
+            return
+        size = os.path.getsize(self.path)
+        if size < self._offset:
+            self._boards, self._offset = {}, 0
+        if size == self._offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                self._add(json.loads(line))
+                self._offset += len(line)
+
+    def record(self, username, day, lang, attempts, won):
+        """registra il risultato della partita giornaliera, False se già registrato"""
+        score = 100 - (attempts * 10)
+        if won:
+            score += 50
+        row = {
+            'day': day,
+            'lang': lang,
+            'player': username,
+            'score': score,
+            'attempts': attempts,
+            'won': won,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        store = get_sqlite_store()
+        if store is not None:
+            return store.record_daily(row)
+
+        return self._append(row)
+
+    def start(self, username, day, lang):
+        """segna l'inizio della partita giornaliera, False se il giocatore l'aveva già iniziata"""
+        row = {
+            'type': 'start',
+            'day': day,
+            'lang': lang,
+            'player': username,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        store = get_sqlite_store()
+        if store is not None:
+            return store.start_daily(row)
+
+        return self._append(row)
+
+    def _append(self, row):
+        """aggiunge la riga al registro se non è un duplicato"""
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            if not self._add(row):
+                return False
+            line = (json.dumps(row, ensure_ascii=False) + '\n').encode('utf-8')
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._offset += len(line)
+        return True
+
+    def top(self, day, lang, limit=10, offset=0):
+        store = get_sqlite_store()
+        if store is not None:
+            return store.daily_top(day, lang, limit, offset)
+
+        with self._lock:
+            self._refresh()
+            board = self._boards.get((day, lang))
+            if board is None:
+                return []
+            return [
+                {key: board['rows'][player][key] for key in ('player', 'score', 'attempts', 'won', 'timestamp')}
+                for _, _, player in board['keys'][offset:offset + limit]
+            ]
+
+    def count(self, day, lang):
+        store = get_sqlite_store()
+        if store is not None:
+            return store.daily_count(day, lang)
+
+        with self._lock:
+            self._refresh()
+            board = self._boards.get((day, lang))
+            return len(board['rows']) if board else 0
+
+    def rank(self, day, lang, username):
+        """posizione del giocatore nella classifica del giorno, None se non ha giocato"""
+        store = get_sqlite_store()
+        if store is not None:
+            return store.daily_rank(day, lang, username)
+
+        with self._lock:
+            self._refresh()
+            board = self._boards.get((day, lang))
+            if board is None or username not in board['rows']:
+                return None
+            return bisect.bisect_left(board['keys'], self._key(board['rows'][username])) + 1
+
+    def clear(self):
+        with self._lock:
+            self._boards, self._offset = {}, 0
+
+
+DAILY_LEADERBOARD = DailyLeaderboard()
+
+#risolutore e suggerimenti basati sulla matrice dei pattern
+PATTERN_ALL_CORRECT = 242
+
+
+def results_to_pattern(results):
+    """ricostruisce il pattern in base 3 dai risultati per lettera di un tentativo"""
+    return sum(PATTERN_STATUSES.index(r['status']) * 3 ** r['position'] for r in results)
+
+
+def build_pattern_matrix(word_list, path):
+    """calcola e salva la matrice uint8 dei pattern (righe: tentativi, colonne: parole segrete)"""
+    guess_codes = encode_words(word_list.guesses)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_file = f"{path}.{os.getpid()}.tmp.npy"
+    matrix = np.lib.format.open_memmap(tmp_file, mode='w+', dtype=np.uint8,
+                                       shape=(len(guess_codes), len(word_list.codes)))
+    for row, codes in enumerate(guess_codes):
+        matrix[row] = score_patterns(codes, word_list.codes)
+    matrix.flush()
+    del matrix
+    os.replace(tmp_file, path)
+
+
+def pattern_matrix_path(word_list, cache_dir=PATTERN_CACHE_DIR):
+    """file della matrice dei pattern, legato al contenuto del dizionario"""
+    digest = hashlib.sha256(word_list.guesses.tobytes() + b'|' + word_list.words.tobytes()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"patterns_{word_list.lang}_{digest}.npy")
+
+
+def load_pattern_matrix(word_list, cache_dir=PATTERN_CACHE_DIR, build=True):
+    """matrice dei pattern del dizionario tramite mmap, calcolata solo la prima volta;
+    con build=False restituisce None se non è ancora stata calcolata"""
+    path = pattern_matrix_path(word_list, cache_dir)
+    if not os.path.exists(path):
+        if not build:
+            return None
+        os.makedirs(cache_dir, exist_ok=True)
+        with file_lock(path):
+            if not os.path.exists(path):
+                build_pattern_matrix(word_list, path)
+    return np.load(path, mmap_mode='r')
+
+
+_pattern_builds = set()
+_pattern_builds_lock = threading.Lock()
+
+
+def schedule_pattern_build(word_list):
+    """calcola la matrice dei pattern in un thread separato, una volta sola per dizionario"""
+    path = pattern_matrix_path(word_list)
+    with _pattern_builds_lock:
+        if path in _pattern_builds or os.path.exists(path):
+            return
+        _pattern_builds.add(path)
+
+    @timed_span('pattern_matrix_build')
+    def build():
+        try:
+            load_pattern_matrix(word_list)
+        except Exception as e:
+            print(f"[ERROR] Calcolo della matrice dei pattern {word_list.lang} non riuscito: {e}")
+        finally:
+            with _pattern_builds_lock:
+                _pattern_builds.discard(path)
+
+    threading.Thread(target=build, name=f"patterns-{word_list.lang}", daemon=True).start()
+
+
+class Solver:
+    """filtra le parole candidate con maschere numpy e suggerisce il tentativo con il
+    massimo guadagno di informazione atteso (entropia della distribuzione dei pattern)"""
+
+    def __init__(self, word_list, matrix=None):
+        self.word_list = word_list
+        self.matrix = load_pattern_matrix(word_list) if matrix is None else matrix
+        self.rows = {w: i for i, w in enumerate(word_list.guesses.tolist())}
+        #migliori tentativi già calcolati per i primi turni, indicizzati dalla storia (riga, pattern)
+        self._memo = {}
+
+    def guess_row(self, word):
+        return self.rows.get(word.upper().encode('ascii', 'replace'))
+
+    def filter(self, history, candidates=None):
+        """parole segrete compatibili con i tentativi [(riga, pattern)] già fatti"""
+        if candidates is None:
+            candidates = np.arange(self.matrix.shape[1])
+        for row, pattern in history:
+            candidates = candidates[self.matrix[row, candidates] == pattern]
+        return candidates
+
+    def entropies(self, candidates):
+        """informazione attesa (in bit) di ogni tentativo sulle parole candidate"""
+        n = len(candidates)
+        result = np.empty(self.matrix.shape[0])
+        offsets = np.arange(PATTERN_BLOCK_ROWS)[:, None] * 243
+        for start in range(0, self.matrix.shape[0], PATTERN_BLOCK_ROWS):
+            block = np.asarray(self.matrix[start:start + PATTERN_BLOCK_ROWS][:, candidates], dtype=np.int64)
+            rows = len(block)
+            counts = np.bincount((block + offsets[:rows]).ravel(), minlength=243 * rows).reshape(rows, 243)
+            p = counts / n
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result[start:start + rows] = -np.nansum(p * np.log2(p), axis=1)
+        return result
+
+    def best_guess(self, candidates, history=None):
+        """riga del tentativo migliore: massima entropia, a parità una parola candidata"""
+        if len(candidates) <= 2:
+            return int(self.word_list.secret_rows[candidates[0]]), 0.0 if len(candidates) == 1 else 1.0
+
+        #apertura e secondo tentativo si ripetono in quasi tutte le partite
+        key = tuple(history) if history is not None and len(history) <= 1 else None
+        if key is not None and key in self._memo:
+            return self._memo[key]
+
+        entropy = self.entropies(candidates)
+        bonus = np.zeros(len(entropy))
+        bonus[self.word_list.secret_rows[candidates]] = 1e-9
+        row = int(np.argmax(entropy + bonus))
+        best = (row, float(entropy[row]))
+        if key is not None:
+            self._memo[key] = best
+        return best
+
+    def hint(self, guesses):
+        """suggerimento per la partita in corso a partire dai tentativi [(parola, pattern)]"""
+        history = [(self.guess_row(word), pattern) for word, pattern in guesses]
+        history = [(row, pattern) for row, pattern in history if row is not None]
+        candidates = self.filter(history)
+        if len(candidates) == 0:
+            return None
+        row, bits = self.best_guess(candidates, history)
+        return {
+            'word': self.word_list.guesses[row].decode('ascii'),
+            'expected_bits': round(bits, 3),
+            'candidates': int(len(candidates)),
+        }
+
+    def solve(self, secret, max_turns=20):
+        """gioca contro la parola segreta (indice di colonna) e restituisce i tentativi usati"""
+        candidates = np.arange(self.matrix.shape[1])
+        history = []
+        for turn in range(1, max_turns + 1):
+            row, _ = self.best_guess(candidates, history)
+            pattern = int(self.matrix[row, secret])
+            if pattern == PATTERN_ALL_CORRECT:
+                return turn
+            history.append((row, pattern))
+            candidates = candidates[self.matrix[row, candidates] == pattern]
         return None
-    
-    #tramite numpy analizziamo le statistiche dei giocatori 
-    scores_array = player_data['score'].values
-    
-    analytics = {
-        'mean_score': float(np.mean(scores_array)),
-        'min_score': int(np.min(scores_array)),
-        'max_score': int(np.max(scores_array)),
-        'total_games': len(player_data),
-        'win_rate': float(player_data['won'].mean() * 100),
-    }
-    
-    return analytics
 
-def update_player_stats(username, won, attempts, lang):
-    """aggiorna le statistiche del giocatore dopo ogni partita ed utilizza numpy per calcoli statistici complessi"""
-    players = load_players()
-    
-    if username not in players:
-        return False
-    
-    player = players[username]
-    
-    #aumentiamo il numero di partite giocate
-    player['games_played'] += 1
-    
-    #in caso di vittoria aumentareil numero di partite vinte 
-    if won:
-        player['games_won'] += 1
-    
-    #umentare il numero di tenativi totali
-    player['total_attempts'] += attempts
-    player['last_played'] = datetime.now().isoformat()
-    
-    #tramite pandas gestire le statistciche del giocatore in base alla lingua selezionata
-    if lang not in player['lang_stats']:
-        player['lang_stats'][lang] = {'played': 0, 'won': 0}
-    
-    player['lang_stats'][lang]['played'] += 1
-    if won:
-        player['lang_stats'][lang]['won'] += 1
-    
-    #calacolare il punteggio 
-    score = 100 - (attempts * 10)
-    if won:
-        score += 50
-    
-    player['total_score'] += score
-    player['best_score'] = max(player.get('best_score', 0), score)
-    
-    #tramite numpy calcolare la media dei punteggi per ricavare la media
-    if os.path.exists(SCORES_FILE):
-        df = pd.read_csv(SCORES_FILE)
-        user_scores = df[df['player'] == username]['score'].values
-        if len(user_scores) > 0:
-            player['average_score'] = float(np.mean(user_scores))
-    
-    #gestire il numero di vittorie consecutive
-    if won:
-        player['current_streak'] = player.get('current_streak', 0) + 1
-        player['best_streak'] = max(player.get('best_streak', 0), player['current_streak'])
+
+_solvers = {}
+_solvers_lock = threading.Lock()
+
+
+def get_solver(lang='it', build=True):
+    """risolutore della lingua, ricreato quando il registro ricarica il dizionario.
+    Con build=False non calcola mai la matrice: se manca ne avvia il calcolo in
+    background e restituisce None"""
+    word_list = WORD_REGISTRY.get(lang)
+    solver = _solvers.get(lang)
+    if solver is not None and solver.word_list is word_list:
+        return solver
+
+    if build:
+        matrix = load_pattern_matrix(word_list)
     else:
-        player['current_streak'] = 0
-    
-    save_players(players)
-    
-    return True
+        matrix = load_pattern_matrix(word_list, build=False)
+        if matrix is None:
+            schedule_pattern_build(word_list)
+            return None
 
-#funzioni per gestire le staistiche delle parole 
-def load_word_statistics():
-    """carica le statistiche di quante volte vengono utilizzate le parole all'interno del file JSON"""
-    if os.path.exists(WORD_STATS_FILE):
-        with open(WORD_STATS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {'it': {}, 'en': {}}
+    with _solvers_lock:
+        solver = _solvers.get(lang)
+        if solver is None or solver.word_list is not word_list:
+            solver = _solvers[lang] = Solver(word_list, matrix)
+    return solver
 
 
-def save_word_statistics(stats):
-    """salva le statistiche delle parole utilizzate nel file JSON"""
-    with open(WORD_STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, indent=2, ensure_ascii=False)
+@app.cli.command('build-patterns')
+@click.option('--lang', 'langs', multiple=True, help="lingua del dizionario (ripetibile, predefinite tutte)")
+def build_patterns_command(langs):
+    """Calcola in anticipo le matrici dei pattern usate da /hint e dal risolutore"""
+    for lang in langs or WORD_FILES:
+        word_list = WORD_REGISTRY.get(lang)
+        path = pattern_matrix_path(word_list)
+        if os.path.exists(path):
+            print(f"Matrice dei pattern {lang} già presente: {path}")
+            continue
+        start = time.perf_counter()
+        load_pattern_matrix(word_list)
+        print(f"Matrice dei pattern {lang} calcolata in {time.perf_counter() - start:.1f}s: {path}")
 
 
-def analyze_word_frequency(lang='it'):
-    """analizza con che frequenza escono certe parole usando pandas"""
-    stats = load_word_statistics()
-    
-    if lang not in stats or not stats[lang]:
-        return pd.DataFrame()
-    
-    #utilizziamo Dataframe per calcolare le analisi
-    words_data = []
-    for word, data in stats[lang].items():
-        words_data.append({
-            'word': word,
-            'count': data['count'],
-            'first_used': data.get('first_used', 'N/A'),
-            'last_used': data.get('last_used', 'N/A')
-        })
-    
-    df = pd.DataFrame(words_data)
-    
-    if len(df) > 0:
-        #aggiunta delle colonne per le statistiche
-        df['frequency_rank'] = df['count'].rank(ascending=False, method='dense')
-        df['usage_percentage'] = (df['count'] / df['count'].sum()) * 100
-    
-    return df
+@app.cli.command('solve')
+@click.argument('word')
+@click.option('--lang', default='it', help="lingua del dizionario")
+def solve_command(word, lang):
+    """Risolve la parola indicata mostrando i tentativi del risolutore"""
+    solver = get_solver(lang)
+    secret = solver.guess_row(word)
+    columns = np.flatnonzero(solver.word_list.secret_rows == secret) if secret is not None else []
+    if len(columns) == 0:
+        print(f"{word.upper()} non è una parola segreta del dizionario {lang}")
+        return
 
-def increment_word_count(word, lang='it'):
-    """incrementa il contatore di utilizzo per una specifica parola"""
-    stats = load_word_statistics()
-    
-    if lang not in stats:
-        stats[lang] = {}
-    
-    if word in stats[lang]:
-        stats[lang][word]['count'] += 1
-        stats[lang][word]['last_used'] = datetime.now().isoformat()
-    else:
-        stats[lang][word] = {
-            'count': 1,
-            'first_used': datetime.now().isoformat(),
-            'last_used': datetime.now().isoformat()
-        }
-    
-    
-    save_word_statistics(stats)
-    
+    candidates = np.arange(solver.matrix.shape[1])
+    history = []
+    for turn in range(1, 21):
+        row, bits = solver.best_guess(candidates, history)
+        guess = solver.word_list.guesses[row].decode('ascii')
+        pattern = int(solver.matrix[row, columns[0]])
+        print(f"{turn}. {guess}  {len(candidates):5d} candidate  {bits:.2f} bit")
+        if pattern == PATTERN_ALL_CORRECT:
+            break
+        history.append((row, pattern))
+        candidates = candidates[solver.matrix[row, candidates] == pattern]
 
-def get_top_words(lang='it', limit=10):
-    """restituisce le tot parole più utilizzate usando pandas per ordinarle"""
-    df = analyze_word_frequency(lang)
-    
-    if df.empty:
-        return []
-    
-    #ordina in base a qunate volte sono uscite le parole e prendi le prime
-    top_df = df.nlargest(limit, 'count')
-    
-    return top_df.to_dict('records')
 
-#gestione parole
-def get_random_word(lang='it'):
-    """seleziona casualmente una parola usando numpy random più efficiente per grandi dataset"""
-    file_parole = WORD_FILES.get(lang, WORD_FILES['it'])
-    
-    if not os.path.exists(file_parole):
-        print(f"[ERROR] File {file_parole} non trovato!")
-        return "ERROR"
-    
-    with open(file_parole, "r", encoding='utf-8') as file:
-        parole = file.read().strip().split(",")
-        
-    #tramite numpy facciamo una selezione randomica
-    idx = np.random.randint(0, len(parole))
-    word = parole[idx].upper()
-    
-    increment_word_count(word, lang)
-    
-    return word
+@app.cli.command('solver-benchmark')
+@click.option('--lang', default='it', help="lingua del dizionario")
+@click.option('--limit', type=int, default=None, help="numero massimo di parole da risolvere")
+def solver_benchmark_command(lang, limit):
+    """Risolve tutte le parole del dizionario e riporta la lunghezza media delle soluzioni"""
+    start = time.perf_counter()
+    solver = get_solver(lang)
+    setup_time = time.perf_counter() - start
+
+    secrets_to_solve = range(solver.matrix.shape[1] if limit is None else min(limit, solver.matrix.shape[1]))
+    start = time.perf_counter()
+    turns = np.array([solver.solve(secret) or 0 for secret in secrets_to_solve])
+    elapsed = time.perf_counter() - start
+
+    solved = turns[turns > 0]
+    print(f"Dizionario {lang}: {len(turns)} parole in {elapsed:.2f}s (matrice pronta in {setup_time:.2f}s)")
+    print(f"Tentativi medi: {solved.mean():.3f}, massimo {solved.max()}, "
+          f"oltre {MAX_ATTEMPTS}: {int((solved > MAX_ATTEMPTS).sum())}, non risolte: {int((turns == 0).sum())}")
+    for n, count in zip(*np.unique(solved, return_counts=True)):
+        print(f"  {n}: {count}")
 
 #gestione della classifica e dei sitemi di punteggio
 
+def _scores_header():
+    """legge l'intestazione del file CSV dei punteggi (solo la prima riga)"""
+    if not os.path.exists(SCORES_FILE) or os.path.getsize(SCORES_FILE) == 0:
+        return None
+    with open(SCORES_FILE, 'r', encoding='utf-8', newline='') as f:
+        return next(csv.reader(f), None)
+
+
+@timed_span('save_score')
 def save_score(player_name, attempts, won, lang):
-    """salva il punteggio e utilizzando pandas gestire in modo efficiente il file CSV"""
+    """aggiunge il punteggio in coda al file CSV senza rileggerlo né riordinarlo"""
     score = 100 - (attempts * 10)
     if won:
         score += 50
-    
-    #creazione o caricamento Dataframe
-    if os.path.exists(SCORES_FILE):
-        df = pd.read_csv(SCORES_FILE)
-    else:
-        df = pd.DataFrame(columns=['player', 'score', 'attempts', 'won', 'lang', 'timestamp'])
-    
-    # aggiungi nuova statistica giocatore
-    new_row = pd.DataFrame([{
+
+    row = {
         'player': player_name,
         'score': score,
         'attempts': attempts,
         'won': won,
         'lang': lang,
         'timestamp': datetime.now().isoformat()
-    }])
-    
-    df = pd.concat([df, new_row], ignore_index=True)
-    
-    #ordina in base al punteggio
-    df = df.sort_values(by='score', ascending=False)
-    
-    #tramite pandas salva e trasforma in un file csv
-    df.to_csv(SCORES_FILE, index=False)
-    
+    }
+
+    store = get_sqlite_store()
+    if store is not None:
+        with file_lock(SCORES_FILE):
+            store.append_score(row)
+            ANALYTICS.append([row])
+        RESPONSE_CACHE.invalidate('scores')
+        return
+
+    #il file viene usato come registro append-only: una sola riga per partita
+    #il lock impedisce intestazioni doppie e righe scritte durante una compattazione
+    with file_lock(SCORES_FILE):
+        _append_score_rows([row])
+
+        #stesso lock: la riga finisce nell'istantanea oppure nella sua prossima ricostruzione
+        ANALYTICS.append([row])
+
+    RESPONSE_CACHE.invalidate('scores')
+
+
+def _append_score_rows(rows):
+    """aggiunge le righe in coda al file CSV dei punteggi (da chiamare con il lock del file)"""
+    header = _scores_header()
+    buffer = io.StringIO()
+    if header is None:
+        header = SCORE_COLUMNS
+        csv.writer(buffer).writerow(header)
+    csv.DictWriter(buffer, fieldnames=header, restval='', extrasaction='ignore').writerows(rows)
+
+    #una singola write in modalità O_APPEND evita di perdere righe con più scrittori
+    fd = os.open(SCORES_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, buffer.getvalue().encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+@timed_span('load_scores')
+def load_scores():
+    """carica lo storico dei punteggi ordinato per punteggio al momento della lettura"""
+    store = get_sqlite_store()
+    if store is not None:
+        return store.load_scores()
+
+    if not os.path.exists(SCORES_FILE):
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+
+    df = pd.read_csv(SCORES_FILE)
+    #ordinamento stabile: a parità di punteggio resta l'ordine di inserimento
+    return df.sort_values(by='score', ascending=False, kind='mergesort')
+
+
+@timed_span('compact_scores')
+def compact_scores():
+    """riscrive il file CSV ordinato per punteggio (compattazione periodica del registro)"""
+    if get_sqlite_store() is not None:
+        #con sqlite l'ordinamento è servito dall'indice sul punteggio
+        return len(load_scores())
+
+    with file_lock(SCORES_FILE):
+        if not os.path.exists(SCORES_FILE):
+            return 0
+
+        df = load_scores()
+        tmp_file = f"{SCORES_FILE}.{os.getpid()}.tmp"
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, SCORES_FILE)
+
+    return len(df)
+
+
+@app.cli.command('compact-scores')
+def compact_scores_command():
+    """Ordina per punteggio il file della classifica (da eseguire periodicamente)"""
+    rows = compact_scores()
+    print(f"Classifica compattata: {rows} righe in {SCORES_FILE}")
+
+def _int_or_none(value):
+    """intero di una cella CSV (dopo una compattazione pandas può essere scritto come 3.0)"""
+    return int(float(value)) if value not in (None, '') else None
+
+
+def iter_scores(player=None, lang=None, since=None, until=None):
+    """righe dello storico dei punteggi lette una alla volta, nell'ordine del registro;
+    since è incluso e until escluso (timestamp ISO confrontati come stringhe)"""
+    store = get_sqlite_store()
+    if store is not None:
+        yield from store.iter_scores(player, lang, since, until)
+        return
+
+    try:
+        f = open(SCORES_FILE, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        #solo le righe già complete all'apertura: una compattazione sostituisce il file
+        #con un rename, quindi il descrittore aperto continua a leggere la versione vecchia
+        size = os.fstat(f.fileno()).st_size
+
+        def lines():
+            while f.tell() < size:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    return
+                yield line.decode('utf-8')
+
+        reader = csv.reader(lines())
+        header = next(reader, None)
+        if header is None:
+            return
+        for values in reader:
+            row = dict(zip(header, values))
+            if player is not None and row.get('player') != player:
+                continue
+            if lang is not None and row.get('lang') != lang:
+                continue
+            timestamp = row.get('timestamp') or None
+            if since is not None and (timestamp is None or timestamp < since):
+                continue
+            if until is not None and (timestamp is None or timestamp >= until):
+                continue
+            yield {
+                'player': row.get('player'),
+                'score': _int_or_none(row.get('score')),
+                'attempts': _int_or_none(row.get('attempts')),
+                'won': row.get('won') == 'True',
+                'lang': row.get('lang') or None,
+                'timestamp': timestamp,
+            }
+
+
+def export_scores(rows, fmt='csv', compress=False):
+    """serializza le righe in blocchi CSV o NDJSON di EXPORT_CHUNK_ROWS righe,
+    eventualmente compressi con gzip man mano che vengono prodotti"""
+    chunks = _ndjson_chunks(rows) if fmt == 'ndjson' else _csv_chunks(rows)
+    if not compress:
+        yield from (chunk.encode('utf-8') for chunk in chunks)
+        return
+
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SCORE_COLUMNS)
+    writer.writeheader()
+    #l'intestazione parte subito, prima della lettura della prima riga
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False) + '\n')
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def _export_bound(value):
+    """normalizza un estremo dell'intervallo (data o data e ora ISO), ValueError se non valido"""
+    if value is None or value == '':
+        return None
+    return datetime.fromisoformat(value).isoformat()
+
+
+@app.cli.command('export-scores')
+@click.option('--format', 'fmt', type=click.Choice(sorted(EXPORT_FORMATS)), default='csv', show_default=True)
+@click.option('--player', help="solo le partite del giocatore")
+@click.option('--lang', help="solo le partite della lingua")
+@click.option('--since', help="data o data e ora ISO di inizio (inclusa)")
+@click.option('--until', help="data o data e ora ISO di fine (esclusa)")
+@click.option('--gzip', 'compress', is_flag=True, help="comprime l'output con gzip")
+@click.option('--output', '-o', type=click.File('wb'), default='-', help="file di destinazione (predefinito lo standard output)")
+def export_scores_command(fmt, player, lang, since, until, compress, output):
+    """Esporta lo storico dei punteggi in CSV o NDJSON senza caricarlo in memoria"""
+    try:
+        since, until = _export_bound(since), _export_bound(until)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    for chunk in export_scores(iter_scores(player, lang, since, until), fmt, compress):
+        output.write(chunk)
+
+#istantanea colonnare dello storico dei punteggi per le statistiche
+ANALYTICS_FIELDS = [
+    ('timestamp', '<i8'),
+    ('score', '<i2'),
+    ('attempts', 'i1'),
+    ('won', '?'),
+    ('lang', 'S2'),
+]
+#intestazione .npy di dimensione fissa, così il numero di righe si aggiorna sul posto
+ANALYTICS_HEADER_SIZE = 256
+ANALYTICS_MAX_DAYS = 366
+
+
+@functools.cache
+def analytics_dtype():
+    """tipo strutturato delle righe dell'istantanea (numpy viene importato solo qui)"""
+    return np.dtype(ANALYTICS_FIELDS)
+
+
+def _npy_header(count):
+    """intestazione .npy (versione 1.0) per un array di count righe, riempita fino a ANALYTICS_HEADER_SIZE"""
+    header = repr({
+        'descr': np.lib.format.dtype_to_descr(analytics_dtype()),
+        'fortran_order': False,
+        'shape': (count,),
+    }).encode('latin1')
+    prefix = b'\x93NUMPY\x01\x00'
+    padding = ANALYTICS_HEADER_SIZE - len(prefix) - 2 - len(header) - 1
+    return prefix + struct.pack('<H', ANALYTICS_HEADER_SIZE - len(prefix) - 2) + header + b' ' * padding + b'\n'
+
+
+def _analytics_records(rows):
+    """converte righe o un DataFrame di punteggi nell'array colonnare dell'istantanea"""
+    if isinstance(rows, list):
+        #poche righe appena giocate: convertite senza pandas
+        records = np.zeros(len(rows), dtype=analytics_dtype())
+        for i, row in enumerate(rows):
+            timestamp = row.get('timestamp')
+            records[i] = (
+                int((datetime.fromisoformat(timestamp) - datetime(1970, 1, 1)).total_seconds()) if timestamp else 0,
+                int(row['score']),
+                int(row.get('attempts') or 0),
+                str(row.get('won')) == 'True',
+                (row.get('lang') or '').encode('ascii', 'replace'),
+            )
+        return records
+
+    df = pd.DataFrame(rows, columns=SCORE_COLUMNS)
+    records = np.zeros(len(df), dtype=analytics_dtype())
+    if len(df) == 0:
+        return records
+    timestamps = pd.to_datetime(df['timestamp'], errors='coerce', format='ISO8601')
+    records['timestamp'] = np.where(timestamps.isna(), 0, timestamps.values.astype('datetime64[s]').astype(np.int64))
+    records['score'] = df['score'].astype(int)
+    records['attempts'] = df['attempts'].fillna(0).astype(int)
+    records['won'] = df['won'].astype(str) == 'True'
+    records['lang'] = df['lang'].fillna('').astype(str).str.encode('ascii', 'replace')
+    return records
+
+
+class AnalyticsSnapshot:
+    """storico dei punteggi in colonne tipizzate dentro un file .npy letto tramite mmap:
+    ogni partita conclusa viene aggiunta in coda e le statistiche aggregate vengono
+    ricalcolate con numpy solo quando il file è cambiato"""
+
+    def __init__(self, path=ANALYTICS_FILE):
+        self.path = path
+        self._signature = None
+        self._records = None
+        self._rollups = {}
+        self._lock = threading.Lock()
+        self._building = False
+
+    @staticmethod
+    def _count(f):
+        """numero di righe scritto nell'intestazione del file"""
+        f.seek(0)
+        np.lib.format.read_magic(f)
+        shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        return shape[0]
+
+    def build(self):
+        """ricostruisce l'istantanea leggendo tutto lo storico (prima volta o dopo una migrazione)"""
+        with file_lock(SCORES_FILE), file_lock(self.path):
+            df = load_scores()
+            if len(df) > 0:
+                df = df[df['player'].notna()]
+                if 'timestamp' in df:
+                    #in ordine cronologico, come le righe che verranno aggiunte dopo
+                    df = df.sort_values('timestamp', kind='mergesort')
+            records = _analytics_records(df)
+            tmp_file = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(_npy_header(len(records)))
+                f.write(records.tobytes())
+            os.replace(tmp_file, self.path)
+        return len(records)
+
+    def append(self, rows):
+        """aggiunge le partite in coda e aggiorna il numero di righe nell'intestazione"""
+        with file_lock(self.path):
+            if not os.path.exists(self.path):
+                #verrà creata da build() includendo già queste righe
+                return 0
+            records = _analytics_records(rows)
+            with open(self.path, 'r+b') as f:
+                count = self._count(f)
+                #si scrive dopo l'ultima riga valida, sovrascrivendo eventuali resti di una scrittura interrotta
+                f.seek(ANALYTICS_HEADER_SIZE + count * analytics_dtype().itemsize)
+                f.write(records.tobytes())
+                f.truncate()
+                f.flush()
+                f.seek(0)
+                f.write(_npy_header(count + len(records)))
+            return len(records)
+
+    def schedule_build(self):
+        """costruisce l'istantanea mancante in un thread separato, una volta sola"""
+        with self._lock:
+            if self._building or os.path.exists(self.path):
+                return
+            self._building = True
+
+        @timed_span('analytics_build')
+        def build():
+            try:
+                self.build()
+            except Exception as e:
+                print(f"[ERROR] Costruzione dell'istantanea delle statistiche non riuscita: {e}")
+            finally:
+                with self._lock:
+                    self._building = False
+
+        threading.Thread(target=build, name='analytics-build', daemon=True).start()
+
+    def records(self):
+        """colonne dell'istantanea tramite mmap, riaperte solo se il file è cambiato;
+        (None, None) se l'istantanea non esiste ancora (viene costruita in background)"""
+        #lo storico CSV non viene mai analizzato dentro una richiesta
+        if not os.path.exists(self.path):
+            self.schedule_build()
+            return None, None
+        st = os.stat(self.path)
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if signature != self._signature:
+                self._records = np.load(self.path, mmap_mode='r')
+                self._signature = signature
+                self._rollups = {}
+            return self._records, signature
+
+    def rollups(self, days=30):
+        """statistiche aggregate per lingua, tentativi, punteggi e giorni (memorizzate per versione
+        del file), None finché l'istantanea non è pronta"""
+        records, signature = self.records()
+        if records is None:
+            return None
+        key = (signature, days)
+        cached = self._rollups.get(key)
+        if cached is not None:
+            return cached
+
+        result = {
+            'total_games': int(len(records)),
+            'overall': _rollup(records),
+            'by_lang': {},
+            'score_histogram': {},
+            'daily': [],
+        }
+        if len(records) > 0:
+            langs = records['lang']
+            for lang in np.unique(langs):
+                result['by_lang'][lang.decode('ascii', 'replace') or 'N/A'] = _rollup(records[langs == lang])
+
+            scores, counts = np.unique(records['score'], return_counts=True)
+            result['score_histogram'] = {int(score): int(count) for score, count in zip(scores, counts)}
+
+            day_numbers = records['timestamp'] // 86400
+            first_day = day_numbers.max() - days + 1
+            recent = day_numbers >= first_day
+            day_index = (day_numbers[recent] - first_day).astype(np.int64)
+            games = np.bincount(day_index, minlength=days)
+            wins = np.bincount(day_index, weights=records['won'][recent], minlength=days)
+            score_sum = np.bincount(day_index, weights=records['score'][recent], minlength=days)
+            for i in np.flatnonzero(games):
+                result['daily'].append({
+                    'day': str(np.datetime64(int(first_day + i), 'D')),
+                    'games': int(games[i]),
+                    'wins': int(wins[i]),
+                    'mean_score': float(score_sum[i] / games[i]),
+                })
+
+        with self._lock:
+            if self._signature == signature:
+                self._rollups[key] = result
+        return result
+
+
+def _rollup(records):
+    """partite, vittorie, punteggio medio e distribuzione dei tentativi di un gruppo di righe"""
+    games = len(records)
+    if games == 0:
+        return {'games': 0, 'wins': 0, 'win_rate': 0.0, 'mean_score': 0.0, 'attempts_distribution': {}}
+    won = records['won']
+    wins = int(won.sum())
+    #tentativi delle partite vinte; le perse sono contate a parte
+    attempts = np.bincount(records['attempts'][won].astype(np.int64), minlength=MAX_ATTEMPTS + 1)
+    distribution = {str(n): int(attempts[n]) for n in range(1, len(attempts)) if attempts[n]}
+    distribution['lost'] = games - wins
+    return {
+        'games': games,
+        'wins': wins,
+        'win_rate': round(wins / games * 100, 2),
+        'mean_score': float(records['score'].mean()),
+        'attempts_distribution': distribution,
+    }
+
+
+ANALYTICS = AnalyticsSnapshot()
+
+
+@app.cli.command('build-analytics')
+def build_analytics_command():
+    """Ricostruisce l'istantanea colonnare delle statistiche dallo storico dei punteggi"""
+    count = ANALYTICS.build()
+    print(f"Istantanea statistiche: {count} partite in {ANALYTICS_FILE}")
+
 #utilizzo di numpy per i calcoli più complicati
 class Game:
     """gestisce una singola partita del gioco e usa numpy per operazioni su array di lettere"""
     
-    def __init__(self, lang='it', secret_word=None, attempts=0, guesses = [], game_over=False, won=False):
+    def __init__(self, lang='it', secret_word=None, attempts=0, guesses=None, game_over=False, won=False,
+                 mode='classic', day=None, player=None):
         self.lang = lang
-        self.secret_word = get_random_word(lang) if secret_word is None else secret_word
+        self.mode = mode
+        self.day = day
+        if secret_word is None:
+            if mode == 'daily':
+                self.day = date.today().isoformat() if day is None else day
+                secret_word = get_daily_word(lang, date.fromisoformat(self.day))
+            else:
+                secret_word = get_random_word(lang, player)
+        self.secret_word = secret_word
         self.attempts = attempts
-        self.guesses = guesses
+        self.guesses = [] if guesses is None else guesses
         self.game_over = game_over
         self.won = won
         
+    @timed_span('Game.check_guess')
     def check_guess(self, guess):
         """controlla un tentativo usando numpy per confronti veloci"""
         guess = guess.upper().strip()
@@ -267,6 +3122,10 @@ class Game:
         if self.game_over:
             return {'success': False, 'error': 'Il gioco è già finito!'}
         
+        #le parole fuori dal dizionario non consumano tentativi
+        if not is_valid_guess(guess, self.lang):
+            return {'success': False, 'error': 'Parola non presente nel dizionario!'}
+        
         #analizzare la parola
         results = self._check_word_logic(guess)
         self.attempts += 1
@@ -289,43 +3148,9 @@ class Game:
     
     def _check_word_logic(self, guess):
         """
-        Algoritmo di confronto usando numpy per operazioni vettoriali.
+        Confronta il tentativo con la parola segreta tramite il motore a pattern in base 3.
         """
-        #converitre stringhe in array numpy
-        guess_arr = np.array(list(guess))
-        secret_arr = np.array(list(self.secret_word))
-        
-        results = []
-        used = np.zeros(5, dtype=bool)
-        
-        #controllare se le lettere sono nella posizione giusta e segnalrle in verde
-        correct_mask = guess_arr == secret_arr
-        
-        for i in range(5):
-            if correct_mask[i]:
-                results.append({
-                    'letter': guess_arr[i],
-                    'status': 'correct',
-                    'position': i
-                })
-                used[i] = True
-            else:
-                results.append({
-                    'letter': guess_arr[i],
-                    'status': 'absent',
-                    'position': i
-                })
-        
-        #controllare se le lettere sono presenti nella parola e segnalarle in giallo
-        for i in range(5):
-            if not correct_mask[i]:
-                for j in range(5):
-                    if not used[j] and guess_arr[i] == secret_arr[j]:
-                        results[i]['status'] = 'present'
-                        used[j] = True
-                        break
-        
-        return results
+        return pattern_to_results(guess, score_pattern(guess, self.secret_word))
     
     def get_state(self):
         """Restituisce lo stato completo con analytics numpy"""
@@ -336,9 +3161,481 @@ class Game:
             'game_over': self.game_over,
             'won': self.won,
             'lang': self.lang,
+            'mode': self.mode,
+            'day': self.day,
             'secret_word': self.secret_word
         }
 
+#archivio lato server delle partite in corso: nel cookie resta solo l'id della partita
+class MemoryGameStore:
+    """partite in corso tenute in memoria con scadenza (TTL)"""
+
+    def __init__(self, ttl=GAME_TTL):
+        self.ttl = ttl
+        self._games = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        #le partite sono in ordine di ultimo utilizzo: le scadute sono in testa
+        while self._games:
+            game_id, (expires_at, _) = next(iter(self._games.items()))
+            if expires_at > now:
+                break
+            del self._games[game_id]
+
+    def get(self, game_id):
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            item = self._games.get(game_id)
+            if item is None:
+                return None
+            self._games[game_id] = (now + self.ttl, item[1])
+            self._games.move_to_end(game_id)
+            return item[1]
+
+    def put(self, game_id, state):
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            self._games[game_id] = (now + self.ttl, state)
+            self._games.move_to_end(game_id)
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def __len__(self):
+        with self._lock:
+            self._evict(time.time())
+            return len(self._games)
+
+
+class SqliteGameStore:
+    """partite in corso salvate su sqlite, condivise tra più processi"""
+
+    def __init__(self, path, ttl=GAME_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS games (id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_games_expires_at ON games (expires_at)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, game_id):
+        row = self.connection().execute(
+            "SELECT state FROM games WHERE id = ? AND expires_at > ?", (game_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, game_id, state):
+        now = time.time()
+        conn = self.connection()
+        conn.execute("DELETE FROM games WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "INSERT INTO games (id, state, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET state = excluded.state, expires_at = excluded.expires_at",
+            (game_id, json.dumps(state, ensure_ascii=False), now + self.ttl)
+        )
+
+    def delete(self, game_id):
+        self.connection().execute("DELETE FROM games WHERE id = ?", (game_id,))
+
+    def __len__(self):
+        row = self.connection().execute("SELECT COUNT(*) FROM games WHERE expires_at > ?", (time.time(),)).fetchone()
+        return row[0]
+
+
+def create_game_store():
+    """crea l'archivio delle partite scelto con WORDLE_GAME_STORE (memory o sqlite)"""
+    if GAME_STORE_BACKEND == 'sqlite':
+        return SqliteGameStore(DATABASE_FILE)
+    return MemoryGameStore()
+
+
+GAME_STORE = create_game_store()
+
+
+def record_finished_game(username, game):
+    """salva una partita conclusa (profilo, classifica, classifica del giorno) e restituisce
+    i campi da aggiungere alla risposta del tentativo"""
+    update_player_stats(username, game.won, game.attempts, game.lang)
+    save_score(username, game.attempts, game.won, game.lang)
+    extra = {}
+
+    #le partite giornaliere entrano anche nella classifica del giorno
+    if game.mode == 'daily':
+        DAILY_LEADERBOARD.record(username, game.day, game.lang, game.attempts, game.won)
+        extra['daily_rank'] = DAILY_LEADERBOARD.rank(game.day, game.lang, username)
+
+    #calcolare le statistiche avanzate 
+    extra['analytics'] = calculate_player_analytics(username)
+    return extra
+
+
+def finished_game_row(username, game, played_at=None):
+    """riga dello storico dei punteggi per una partita conclusa"""
+    score = 100 - (game.attempts * 10)
+    if game.won:
+        score += 50
+
+    return {
+        'player': username,
+        'score': score,
+        'attempts': game.attempts,
+        'won': game.won,
+        'lang': game.lang,
+        'timestamp': (played_at or datetime.now()).isoformat()
+    }
+
+
+class InlineGameResults:
+    """salva le partite concluse nel thread della richiesta (server WSGI); la variante
+    ASGI lo sostituisce con un writer dedicato che salva in background (vedi asgi.py)"""
+
+    def record(self, username, game):
+        return record_finished_game(username, game)
+
+
+GAME_RESULTS = InlineGameResults()
+
+
+#importazione in blocco: le partite vengono rigiocate con le regole di Game e salvate a blocchi
+def replay_game(record):
+    """rigioca una partita importata e restituisce la riga del punteggio;
+    ValueError se la partita non è valida o non è conclusa"""
+    if not isinstance(record, dict):
+        raise ValueError("La partita deve essere un oggetto JSON")
+    player = str(record.get('player') or '').strip()
+    lang = record.get('lang', 'it')
+    secret_word = str(record.get('secret_word') or '').upper().strip()
+    guesses = record.get('guesses')
+
+    if not player:
+        raise ValueError("Giocatore mancante")
+    if not isinstance(lang, str) or lang not in WORD_FILES:
+        raise ValueError(f"Lingua non supportata: {lang}")
+    if len(secret_word) != 5 or not secret_word.isalpha():
+        raise ValueError("Parola segreta non valida")
+    if not isinstance(guesses, list):
+        raise ValueError("I tentativi devono essere una lista")
+
+    game = Game(lang, secret_word=secret_word)
+    for guess in guesses:
+        #si accettano sia le parole sia i tentativi nel formato di get_state()
+        word = guess.get('word') if isinstance(guess, dict) else guess
+        result = game.check_guess(str(word or ''))
+        if not result['success']:
+            raise ValueError(f"{word}: {result['error']}")
+    if not game.game_over:
+        raise ValueError("Partita non conclusa")
+
+    timestamp = record.get('timestamp')
+    if timestamp is None:
+        played_at = datetime.now()
+    else:
+        played_at = datetime.fromisoformat(str(timestamp))
+        #lo storico usa orari locali senza fuso, come datetime.now()
+        if played_at.tzinfo is not None:
+            played_at = played_at.astimezone().replace(tzinfo=None)
+
+    return finished_game_row(player, game, played_at)
+
+
+def _aggregate_games(rows):
+    """aggregati per giocatore di un blocco di partite, calcolati con numpy in un solo passaggio"""
+    players, inverse = np.unique(np.array([row['player'] for row in rows]), return_inverse=True)
+    langs, lang_inverse = np.unique(np.array([row['lang'] for row in rows]), return_inverse=True)
+    scores = np.array([row['score'] for row in rows], dtype=np.int64)
+    attempts = np.array([row['attempts'] for row in rows], dtype=np.int64)
+    won = np.array([row['won'] for row in rows], dtype=bool)
+    n = len(players)
+
+    min_score = np.full(n, np.iinfo(np.int64).max)
+    np.minimum.at(min_score, inverse, scores)
+    max_score = np.full(n, np.iinfo(np.int64).min)
+    np.maximum.at(max_score, inverse, scores)
+    lang_key = inverse * len(langs) + lang_inverse
+
+    #serie di vittorie: le partite di ogni giocatore, nell'ordine del file, divise in tratti di esito uguale
+    order = np.argsort(inverse, kind='stable')
+    by_player, by_player_won = inverse[order], won[order]
+    run_start = np.ones(len(order), dtype=bool)
+    run_start[1:] = (by_player[1:] != by_player[:-1]) | (by_player_won[1:] != by_player_won[:-1])
+    run_length = np.bincount(np.cumsum(run_start) - 1)
+    run_player, run_won = by_player[run_start], by_player_won[run_start]
+    first_run = np.searchsorted(run_player, np.arange(n))
+    last_run = np.append(first_run[1:], len(run_length)) - 1
+    longest = np.zeros(n, dtype=np.int64)
+    np.maximum.at(longest, run_player[run_won], run_length[run_won])
+    last_game = order[np.append(np.flatnonzero(by_player[1:] != by_player[:-1]), len(order) - 1)]
+
+    return {
+        'players': [str(username) for username in players],
+        'langs': [str(lang) for lang in langs],
+        'games': np.bincount(inverse, minlength=n),
+        'wins': np.bincount(inverse, weights=won, minlength=n).astype(np.int64),
+        'attempts': np.bincount(inverse, weights=attempts, minlength=n).astype(np.int64),
+        'score_sum': np.bincount(inverse, weights=scores, minlength=n).astype(np.int64),
+        'score_sum_sq': np.bincount(inverse, weights=scores * scores, minlength=n).astype(np.int64),
+        'min_score': min_score,
+        'max_score': max_score,
+        'lang_played': np.bincount(lang_key, minlength=n * len(langs)).reshape(n, len(langs)),
+        'lang_won': np.bincount(lang_key, weights=won, minlength=n * len(langs)).astype(np.int64).reshape(n, len(langs)),
+        'leading_wins': np.where(run_won[first_run], run_length[first_run], 0),
+        'trailing_wins': np.where(run_won[last_run], run_length[last_run], 0),
+        'all_won': (first_run == last_run) & run_won[first_run],
+        'longest_streak': longest,
+        'last_played': [rows[i]['timestamp'] for i in last_game],
+    }
+
+
+def _apply_game_aggregates(players, aggregates):
+    """somma gli aggregati del blocco ai profili {username: profilo}, creando quelli mancanti;
+    restituisce il numero di profili creati"""
+    created = 0
+    for i, username in enumerate(aggregates['players']):
+        player = players.get(username)
+        if player is None:
+            player = players[username] = new_player(username, username)
+            created += 1
+
+        games, wins = int(aggregates['games'][i]), int(aggregates['wins'][i])
+        player['games_played'] += games
+        player['games_won'] += wins
+        player['total_attempts'] += int(aggregates['attempts'][i])
+        player['total_score'] += int(aggregates['score_sum'][i])
+        player['best_score'] = max(player.get('best_score', 0), int(aggregates['max_score'][i]))
+        if player.get('last_played') is None or aggregates['last_played'][i] > player['last_played']:
+            player['last_played'] = aggregates['last_played'][i]
+
+        for j, lang in enumerate(aggregates['langs']):
+            played = int(aggregates['lang_played'][i, j])
+            if played:
+                lang_stats = player['lang_stats'].setdefault(lang, {'played': 0, 'won': 0})
+                lang_stats['played'] += played
+                lang_stats['won'] += int(aggregates['lang_won'][i, j])
+
+        score_stats = player.get('score_stats')
+        if score_stats is None:
+            score_stats = _backfill_score_stats(username, player)
+        score_stats['count'] += games
+        score_stats['sum'] += int(aggregates['score_sum'][i])
+        score_stats['sum_sq'] += int(aggregates['score_sum_sq'][i])
+        min_score, max_score = int(aggregates['min_score'][i]), int(aggregates['max_score'][i])
+        score_stats['min'] = min_score if score_stats['min'] is None else min(score_stats['min'], min_score)
+        score_stats['max'] = max_score if score_stats['max'] is None else max(score_stats['max'], max_score)
+        score_stats['wins'] += wins
+        player['average_score'] = score_stats['sum'] / score_stats['count']
+
+        #la serie in corso prosegue solo se il blocco è tutto di vittorie
+        current = player.get('current_streak', 0)
+        player['best_streak'] = max(player.get('best_streak', 0), current + int(aggregates['leading_wins'][i]),
+                                    int(aggregates['longest_streak'][i]))
+        if aggregates['all_won'][i]:
+            player['current_streak'] = current + games
+        else:
+            player['current_streak'] = int(aggregates['trailing_wins'][i])
+    return created
+
+
+@timed_span('ingest_game_batch')
+def ingest_game_batch(rows):
+    """salva un blocco di partite rigiocate: una sola scrittura dei profili e una dello storico;
+    restituisce il numero di giocatori creati"""
+    aggregates = _aggregate_games(rows)
+
+    store = get_sqlite_store()
+    if store is not None:
+        with file_lock(SCORES_FILE):
+            created = store.ingest_games(aggregates['players'],
+                                         lambda players: _apply_game_aggregates(players, aggregates), rows)
+            ANALYTICS.append(rows)
+        LEADERBOARD.invalidate()
+        PLAYER_CACHE.invalidate()
+        RESPONSE_CACHE.invalidate('players')
+    else:
+        #stesso ordine dei lock di rebuild_player_stats: prima i giocatori, poi i punteggi
+        with file_lock(PLAYERS_FILE), file_lock(SCORES_FILE):
+            players = load_players()
+            created = _apply_game_aggregates(players, aggregates)
+            _append_score_rows(rows)
+            save_players(players)
+            ANALYTICS.append(rows)
+
+    RESPONSE_CACHE.invalidate('scores')
+    return created
+
+
+def ingest_games(lines, batch_size=INGEST_BATCH_SIZE):
+    """importa partite concluse da righe JSONL ({player, lang, secret_word, guesses, timestamp});
+    le righe non valide vengono scartate e riportate nel riepilogo"""
+    summary = {'games': 0, 'rejected': 0, 'created_players': 0, 'errors': []}
+    batch = []
+    for number, line in enumerate(lines, 1):
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            batch.append(replay_game(json.loads(line)))
+        except ValueError as e:
+            summary['rejected'] += 1
+            if len(summary['errors']) < INGEST_MAX_ERRORS:
+                summary['errors'].append({'line': number, 'error': str(e)})
+            continue
+
+        if len(batch) >= batch_size:
+            summary['created_players'] += ingest_game_batch(batch)
+            summary['games'] += len(batch)
+            batch = []
+
+    if batch:
+        summary['created_players'] += ingest_game_batch(batch)
+        summary['games'] += len(batch)
+    return summary
+
+
+@app.cli.command('import-games')
+@click.argument('source', type=click.File('rb'))
+@click.option('--batch-size', default=INGEST_BATCH_SIZE, show_default=True, help="partite salvate per ogni scrittura")
+def import_games_command(source, batch_size):
+    """Importa partite concluse da un file JSONL ('-' per lo standard input)"""
+    start = time.perf_counter()
+    summary = ingest_games(source, batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"Partite importate: {summary['games']} in {elapsed:.1f}s ({summary['games'] / elapsed:.0f} partite/s)")
+    print(f"Nuovi giocatori: {summary['created_players']}, righe scartate: {summary['rejected']}")
+    for error in summary['errors'][:10]:
+        print(f"  riga {error['line']}: {error['error']}")
+
+
+def daily_game_id(username, day, lang):
+    """id fisso della partita giornaliera del giocatore, così da poterla riprendere"""
+    return f"daily:{day}:{lang}:{username}"
+
+
+def is_daily_game_id(game_id):
+    return game_id.startswith('daily:')
+
+
+def load_current_game():
+    """restituisce l'id e lo stato della partita associata alla sessione"""
+    game_id = session.get('game_id')
+    if not game_id:
+        return None, None
+    return game_id, GAME_STORE.get(game_id)
+
+#cache delle risposte degli endpoint di sola lettura
+class ResponseCache:
+    """corpi JSON già serializzati, in LRU per endpoint e parametri della richiesta.
+    Ogni voce dipende da alcuni argomenti ('players', 'scores', 'words'): gli hook di
+    scrittura chiamano invalidate() e la voce sparisce; la firma salvata insieme alla
+    voce copre anche le scritture fatte da altri worker"""
+
+    def __init__(self, capacity=RESPONSE_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._by_topic = {}
+        #contatore per argomento: una risposta calcolata durante una scrittura non resta valida
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def stamp(self, topics):
+        """firma attuale degli argomenti: generazione locale e versione dei dati salvati"""
+        with self._lock:
+            generations = tuple(self._generations.get(topic, 0) for topic in topics)
+        return generations + tuple(RESPONSE_CACHE_STAMPS[topic]() for topic in topics)
+
+    def get(self, key, stamp):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, topics, stamp, body):
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        entry = (stamp, body, etag)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            for topic in topics:
+                self._by_topic.setdefault(topic, set()).add(key)
+            while len(self._entries) > self.capacity:
+                old_key, _ = self._entries.popitem(last=False)
+                for keys in self._by_topic.values():
+                    keys.discard(old_key)
+        return entry
+
+    def invalidate(self, topic):
+        """elimina solo le risposte che dipendono dall'argomento"""
+        with self._lock:
+            self._generations[topic] = self._generations.get(topic, 0) + 1
+            for key in self._by_topic.pop(topic, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_topic.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _analytics_version():
+    try:
+        st = os.stat(ANALYTICS_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+#versione dei dati salvati da cui dipende ogni argomento, anche se scritti da un altro worker
+RESPONSE_CACHE_STAMPS = {
+    'players': players_version,
+    'scores': _analytics_version,
+    'words': word_stats_version,
+}
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def cached_response(*topics):
+    """decoratore per le GET di sola lettura: la risposta viene servita dalla cache con
+    ETag, e con 304 senza corpo se il client ha già la versione attuale"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.endpoint, tuple(sorted(request.args.items(multi=True))))
+            stamp = RESPONSE_CACHE.stamp(topics)
+            entry = RESPONSE_CACHE.get(key, stamp)
+            if entry is None:
+                response = app.make_response(view(*args, **kwargs))
+                #gli errori non vengono memorizzati
+                if response.status_code != 200:
+                    return response
+                entry = RESPONSE_CACHE.put(key, topics, stamp, response.get_data())
+
+            response = Response(entry[1], mimetype='application/json')
+            response.set_etag(entry[2])
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
 #intaurare le rotte per l'html
 @app.route('/')
 def root():
@@ -405,32 +3702,17 @@ def create_player():
             'error': 'Nome e username obbligatori'
         }), 400
     
-    players = load_players()
+    #creare un nuovo profilo di un giocatore
+    player = new_player(nome, username)
     
-    if username in players:
+    if not insert_player(username, player):
         return jsonify({
             'success': False,
             'error': 'Username già esistente'
         }), 409
     
-    #creare un nuovo profilo di un giocatore
-    players[username] = {
-        'nome': nome,
-        'username': username,
-        'created_at': datetime.now().isoformat(),
-        'last_played': None,
-        'games_played': 0,
-        'games_won': 0,
-        'total_attempts': 0,
-        'total_score': 0,
-        'average_score': 0.0,
-        'best_score': 0,
-        'current_streak': 0,
-        'best_streak': 0,
-        'lang_stats': {}
-    }
-    
-    save_players(players)
+    LEADERBOARD.update(username, player)
+    RESPONSE_CACHE.invalidate('players')
     
     session['player'] = {
         'nome': nome,
@@ -439,7 +3721,7 @@ def create_player():
     
     return jsonify({
         'success': True,
-        'player': players[username],
+        'player': player,
         'message': f'Giocatore {username} creato con successo!'
     })
 
@@ -456,16 +3738,14 @@ def login():
             'error': 'Username obbligatorio'
         }), 400
     
-    players = load_players()
+    player = load_player(username)
     
-    if username not in players:
+    if player is None:
         return jsonify({
             'success': False,
             'error': 'Username non trovato'
         }), 404
     
-    player = players[username]
-    
     session['player'] = {
         'nome': player['nome'],
         'username': username
@@ -484,7 +3764,10 @@ def logout():
     username = session.get('player', {}).get('username', 'Unknown')
     
     session.pop('player', None)
-    session.pop('game_state', None)
+    game_id = session.pop('game_id', None)
+    #la partita giornaliera resta nell'archivio per poterla riprendere
+    if game_id and not is_daily_game_id(game_id):
+        GAME_STORE.delete(game_id)
 
     return jsonify({
         'success': True,
@@ -503,10 +3786,10 @@ def check_session():
             'message': 'Nessuna sessione attiva'
         })
     
-    players = load_players()
     username = player.get('username')
+    player_data = load_player(username)
     
-    if username not in players:
+    if player_data is None:
         session.pop('player', None)
         return jsonify({
             'authenticated': False,
@@ -515,7 +3798,7 @@ def check_session():
     
     return jsonify({
         'authenticated': True,
-        'player': players[username]
+        'player': player_data
     })
 
 #gestione dei tenativi e delle partite
@@ -533,13 +3816,57 @@ def new_game():
     
     data = request.get_json()
     lang = data.get('lang', 'it')
+    mode = data.get('mode', 'classic')
+    
+    if mode not in ('classic', 'daily'):
+        return jsonify({
+            'success': False,
+            'error': 'Modalità non valida'
+        }), 400
+    
+    username = player_session.get('username')
+    resumed = False
+    
+    if mode == 'daily':
+        #la parola del giorno si gioca una sola volta per lingua: una partita già iniziata
+        #viene ripresa con i suoi tentativi, invece di ricominciare da zero
+        day = date.today().isoformat()
+        game_id = daily_game_id(username, day, lang)
+        game_state = GAME_STORE.get(game_id)
+        
+        #senza stato e senza risultato registrato la partita è andata persa (scadenza o
+        #riavvio del processo): si ricomincia, altrimenti il giocatore resterebbe escluso
+        if game_state is None and (DAILY_LEADERBOARD.start(username, day, lang)
+                                   or DAILY_LEADERBOARD.rank(day, lang, username) is None):
+            game_state = Game(lang, mode='daily', day=day).get_state()
+            GAME_STORE.put(game_id, game_state)
+        elif game_state is None or game_state['game_over']:
+            return jsonify({
+                'success': False,
+                'error': 'Hai già giocato la parola del giorno!'
+            }), 409
+        else:
+            resumed = True
+    else:
+        #nella modalità classica ogni giocatore scorre il proprio mazzo di parole
+        game_state = Game(lang, mode=mode, player=username).get_state()
+        game_id = secrets.token_urlsafe(16)
+        GAME_STORE.put(game_id, game_state)
     
-    game = Game(lang)
-    session['game_state'] = game.get_state()
+    #lo stato resta sul server, il cookie contiene solo l'id della partita
+    old_game_id = session.get('game_id')
+    if old_game_id and old_game_id != game_id and not is_daily_game_id(old_game_id):
+        GAME_STORE.delete(old_game_id)
+    session['game_id'] = game_id
     
     return jsonify({
         'success': True,
         'message': f'Nuova partita iniziata in {lang}!',
+        'mode': mode,
+        'day': game_state['day'],
+        'resumed': resumed,
+        'attempts': game_state['attempts'],
+        'guesses': game_state['guesses'],
         'max_attempts': MAX_ATTEMPTS
     })
 
@@ -559,7 +3886,7 @@ def check_word():
     guess = data.get('word', '')
     username = player_session.get('username')
     
-    game_state = session.get('game_state')
+    game_id, game_state = load_current_game()
     
     if not game_state:
         return jsonify({
@@ -567,28 +3894,97 @@ def check_word():
             'error': 'Nessuna partita attiva!'
         })
     
-    #ricreare lo stato del gioco una volta terminata la sessione e riaperta
-    game = Game(game_state['lang'], game_state['secret_word'], game_state['attempts'],game_state['guesses'], game_state['game_over'], game_state['won'])
+    #ricreare lo stato del gioco a partire dall'archivio delle partite
+    game = Game(game_state['lang'], game_state['secret_word'], game_state['attempts'],game_state['guesses'], game_state['game_over'], game_state['won'],
+                game_state.get('mode', 'classic'), game_state.get('day'))
     
     result = game.check_guess(guess)
-    session['game_state'] = game.get_state()
+    GAME_STORE.put(game_id, game.get_state())
     
     #in caso di partita terminata aggiornare le satistiche 
+    #(con il writer ASGI il salvataggio avviene dopo la risposta: niente analytics né daily_rank)
     if result.get('game_over'):
-        update_player_stats(username, game.won, game.attempts, game.lang)
-        save_score(username, game.attempts, game.won, game.lang)
-        
-        #calcolare le statistiche avanzate 
-        analytics = calculate_player_analytics(username)
-        result['analytics'] = analytics
+        result.update(GAME_RESULTS.record(username, game))
 
     return jsonify(result)
 
 
+@app.route('/hint', methods=['GET'])
+def hint():
+    """Suggerisce il tentativo con il massimo guadagno di informazione atteso"""
+    player_session = session.get('player')
+    
+    if not player_session:
+        return jsonify({
+            'success': False,
+            'error': 'Devi essere autenticato per giocare!'
+        }), 401
+    
+    _, game_state = load_current_game()
+    
+    if not game_state or game_state['game_over']:
+        return jsonify({
+            'success': False,
+            'error': 'Nessuna partita attiva!'
+        })
+    
+    #la parola del giorno è uguale per tutti: niente aiuti per non falsare la classifica
+    if game_state.get('mode') == 'daily':
+        return jsonify({
+            'success': False,
+            'error': 'Suggerimenti non disponibili per la parola del giorno'
+        }), 403
+    
+    #la matrice dei pattern non viene mai calcolata dentro la richiesta
+    solver = get_solver(game_state['lang'], build=False)
+    if solver is None:
+        return jsonify({
+            'success': False,
+            'error': 'Suggerimenti non ancora disponibili, riprova tra poco'
+        }), 503
+    
+    #il suggerimento usa solo i pattern già mostrati al giocatore, non la parola segreta
+    history = [(g['word'], results_to_pattern(g['results'])) for g in game_state['guesses']]
+    suggestion = solver.hint(history)
+    
+    if suggestion is None:
+        return jsonify({
+            'success': False,
+            'error': 'Nessuna parola del dizionario è compatibile con i tentativi'
+        })
+    
+    return jsonify({
+        'success': True,
+        'hint': suggestion
+    })
+
+
+@app.route('/api/games/import', methods=['POST'])
+def import_games():
+    """Importa in blocco partite concluse in formato JSONL (una partita per riga), solo con il token di amministrazione"""
+    #scrive profili e classifica di qualunque giocatore: mai aperto senza un token configurato
+    if not ADMIN_TOKEN:
+        return jsonify({
+            'success': False,
+            'error': 'Importazione disattivata (WORDLE_ADMIN_TOKEN non impostato): usare flask import-games'
+        }), 403
+    
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return jsonify({
+            'success': False,
+            'error': 'Token di amministrazione non valido'
+        }), 401
+    
+    #il corpo viene letto riga per riga: anche file grandi non restano interi in memoria
+    summary = ingest_games(request.stream)
+    return jsonify({'success': True, **summary})
+
+
 @app.route('/get-secret-word', methods=['GET'])
 def get_secret_word():
     """Mostra la parola segreta (cheat per debug/aiuto)"""
-    game_state = session.get('game_state')
+    _, game_state = load_current_game()
     
     if not game_state:
         return jsonify({
@@ -596,16 +3992,22 @@ def get_secret_word():
             'error': 'Nessuna partita attiva!'
         })
     
+    if game_state.get('mode') == 'daily':
+        return jsonify({
+            'success': False,
+            'error': 'La parola del giorno non può essere mostrata'
+        }), 403
+    
     return jsonify(game_state)
 
 @app.route('/api/word-stats/all', methods=['GET'])
+@cached_response('words')
 def api_all_word_stats():
     """Restituisce le statistiche per tutte le lingue con pandas"""
     limit = int(request.args.get('limit', 10))
-    stats = load_word_statistics()
     result = {}
     
-    for lang in stats.keys():
+    for lang in WORD_FREQUENCY.tables():
         result[lang] = get_top_words(lang, limit)
     
     return jsonify({
@@ -625,67 +4027,130 @@ def player_stats():
         }), 401
     
     username = player_session.get('username')
-    players = load_players()
+    player = load_player(username)
     
-    if username not in players:
+    if player is None:
         return jsonify({
             'success': False,
             'error': 'Giocatore non trovato'
         }), 404
     
-    #statistiche avanzate
-    analytics = calculate_player_analytics(username)
+    #statistiche avanzate calcolate dagli aggregati del profilo già letto
+    analytics = analytics_from_score_stats(player_score_stats(username, player))
     
     return jsonify({
         'success': True,
-        'stats': players[username],
-        'analytics': analytics
+        'stats': player,
+        'analytics': analytics,
+        'rank': LEADERBOARD.rank(username)
     })
 
 @app.route('/top-players', methods=['GET'])
+@cached_response('players')
 def top_players():
-    """Restituisce la classifica dei migliori giocatori con pandas"""
+    """Restituisce la classifica dei migliori giocatori dall'indice in memoria"""
     limit = int(request.args.get('limit', 10))
-    players = load_players()
+    offset = int(request.args.get('offset', 0))
     
-    #crazione Dataframe
-    df = pd.DataFrame([
-        {
-            'username': username,
-            'nome': data['nome'],
-            'total_score': data['total_score'],
-            'games_played': data['games_played'],
-            'games_won': data['games_won'],
-            'best_score': data['best_score'],
-            'best_streak': data.get('best_streak', 0),
-        }
-        for username, data in players.items()
-    ])
+    #l'indice è già ordinato per punteggio: basta prendere la pagina richiesta
+    leaderboard = LEADERBOARD.top(limit, offset)
+    
+    return jsonify({
+        'success': True,
+        'total_players': len(LEADERBOARD),
+        'offset': offset,
+        'leaderboard': leaderboard
+    })
+
+@app.route('/api/analytics', methods=['GET'])
+@cached_response('scores')
+def api_analytics():
+    """Restituisce le statistiche aggregate dall'istantanea colonnare, senza leggere il CSV"""
+    #il numero di giorni determina la dimensione degli array aggregati: va limitato
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        days = None
+    if days is None or not 1 <= days <= ANALYTICS_MAX_DAYS:
+        return jsonify({
+            'success': False,
+            'error': f'Il parametro days deve essere un intero tra 1 e {ANALYTICS_MAX_DAYS}'
+        }), 400
     
-    if df.empty:
+    rollups = ANALYTICS.rollups(days)
+    if rollups is None:
         return jsonify({
-            'success': True,
-            'total_players': 0,
-            'leaderboard': []
-        })
+            'success': False,
+            'error': 'Statistiche non ancora disponibili, riprova tra poco'
+        }), 503
     
-    #tramite numpy calcolare il rapporto vittorie-sconfitte
-    df['win_rate'] = np.where(
-        df['games_played'] > 0,
-        np.round((df['games_won'] / df['games_played']) * 100, 2),
-        0
-    )
+    return jsonify({
+        'success': True,
+        'analytics': rollups
+    })
+
+@app.route('/api/scores/export', methods=['GET'])
+def api_scores_export():
+    """Esporta in streaming lo storico dei punteggi (CSV o NDJSON) con filtri e gzip opzionale"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'error': f"Formato non valido: usare {' o '.join(sorted(EXPORT_FORMATS))}"
+        }), 400
+    try:
+        since = _export_bound(request.args.get('since'))
+        until = _export_bound(request.args.get('until'))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'I parametri since e until devono essere date ISO (AAAA-MM-GG o AAAA-MM-GGTHH:MM:SS)'
+        }), 400
+    compress = request.args.get('gzip') == '1'
+
+    #la risposta parte con la prima riga letta: lo storico non viene mai caricato per intero
+    rows = iter_scores(request.args.get('player') or None, request.args.get('lang') or None, since, until)
+    response = Response(export_scores(rows, fmt, compress), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=scores.{fmt}'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+@app.route('/daily-leaderboard', methods=['GET'])
+def daily_leaderboard():
+    """Restituisce la classifica della parola del giorno"""
+    lang = request.args.get('lang', 'it')
+    day = request.args.get('day', date.today().isoformat())
+    limit = int(request.args.get('limit', 10))
+    offset = int(request.args.get('offset', 0))
+    
+    try:
+        number = daily_number(date.fromisoformat(day))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Data non valida (formato AAAA-MM-GG)'
+        }), 400
     
-    #ordina le parole e fai un limite di parole con un massimo di 10
-    df = df.sort_values(by='total_score', ascending=False).head(limit)
+    player_session = session.get('player')
+    rank = None
+    if player_session:
+        rank = DAILY_LEADERBOARD.rank(day, lang, player_session.get('username'))
     
     return jsonify({
         'success': True,
-        'total_players': len(players),
-        'leaderboard': df.to_dict('records')
+        'day': day,
+        'number': number,
+        'lang': lang,
+        'total_players': DAILY_LEADERBOARD.count(day, lang),
+        'offset': offset,
+        'rank': rank,
+        'leaderboard': DAILY_LEADERBOARD.top(day, lang, limit, offset)
     })
 
 @app.route('/rules', methods=['GET'])
+@cached_response()
 def rules():
     """Restituisce le regole del gioco"""
     rules_text = """
@@ -716,38 +4181,141 @@ Regole del gioco:
    - Miglior punteggio
    - Serie di vittorie consecutive
 
+7. Nella modalità giornaliera tutti i giocatori hanno la stessa parola,
+   che cambia ogni giorno: si può giocare una sola volta per lingua e il
+   risultato entra nella classifica del giorno.
+
 Buon divertimento!  
 """
     return jsonify({'rules': rules_text})
 
-#tramite beautifulsoup popolare il databese delle parole da indovinare prese da un sito utilizzanod il web scraping
+#popolare il databese delle parole da indovinare prese da un sito utilizzando il web scraping
+#le pagine vengono scaricate in parallelo, salvate in una cache su disco e analizzate a blocchi
 
-def prendi_parole_italiane():
-    """Scarica parole italiane da listediparole.it tramite web scraping"""
+ITALIAN_WORDS_URL = "https://www.listediparole.it/"
+ITALIAN_WORDS_PAGES = ["5lettereparole.htm"] + [f"5lettereparolepagina{n}.htm" for n in range(2, 18)]
+ENGLISH_WORDS_URL = "https://www-cs-faculty.stanford.edu/~knuth/sgb-words.txt"
+SCRAPER_CACHE_DIR = ".http_cache"
+SCRAPER_WORKERS = 8
+SCRAPER_TIMEOUT = 10
+
+
+def _http_session(pool_size=SCRAPER_WORKERS):
+    """sessione HTTP con un pool di connessioni riutilizzabili tra i thread"""
     import requests
-    from bs4 import BeautifulSoup
-    
+    from requests.adapters import HTTPAdapter
+
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http.mount("http://", adapter)
+    http.mount("https://", adapter)
+    return http
+
+
+def cached_get(http, url, cache_dir=SCRAPER_CACHE_DIR, chunk_size=16384):
+    """scarica url a blocchi usando la cache su disco con richieste condizionali (ETag/Last-Modified)"""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    body_file = os.path.join(cache_dir, key + ".body")
+    meta_file = os.path.join(cache_dir, key + ".json")
+
+    headers = {}
+    if os.path.exists(body_file) and os.path.exists(meta_file):
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    with http.get(url, headers=headers, timeout=SCRAPER_TIMEOUT, stream=True) as response:
+        if response.status_code == 304:
+            #la pagina non è cambiata: si rilegge la copia in cache
+            with open(body_file, 'rb') as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        response.raise_for_status()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = f"{body_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                yield chunk
+        os.replace(tmp_file, body_file)
+        _atomic_write_json(meta_file, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        })
+
+
+class WordListParser(HTMLParser):
+    """estrae in streaming il testo del primo elemento con classe "mt" della pagina"""
+
+    #elementi senza tag di chiusura: non cambiano la profondità
+    VOID_ELEMENTS = frozenset({
+        'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+        'link', 'meta', 'param', 'source', 'track', 'wbr',
+    })
+
+    def __init__(self):
+        super().__init__()
+        self._depth = 0
+        self._done = False
+        self._parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        if self._depth:
+            #ogni tag separa le parole, come gli a capo <br> tra una parola e l'altra
+            self._parts.append(' ')
+            if tag not in self.VOID_ELEMENTS:
+                self._depth += 1
+        elif tag not in self.VOID_ELEMENTS and 'mt' in (dict(attrs).get('class') or '').split():
+            self._depth = 1
+
+    def handle_endtag(self, tag):
+        if self._depth and tag not in self.VOID_ELEMENTS:
+            self._parts.append(' ')
+            self._depth -= 1
+            if not self._depth:
+                self._done = True
+
+    def handle_data(self, data):
+        if self._depth:
+            self._parts.append(data)
+
+    @property
+    def words(self):
+        return "".join(self._parts).split()
+
+
+def _scrape_italian_page(http, url, cache_dir):
+    """scarica e analizza una pagina di parole italiane"""
+    parser = WordListParser()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    for chunk in cached_get(http, url, cache_dir):
+        parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return parser.words
+
+
+def prendi_parole_italiane(base_url=ITALIAN_WORDS_URL, cache_dir=SCRAPER_CACHE_DIR, workers=SCRAPER_WORKERS):
+    """Scarica parole italiane da listediparole.it tramite web scraping"""
     print("Inizio download parole italia...")
     lista_parole = []
     
     try:
-        url = "https://www.listediparole.it/5lettereparole.htm"
-        page = requests.get(url, timeout=10)
-        soup = BeautifulSoup(page.content, 'html.parser')
-        parole = soup.find(class_="mt")
+        urls = [urljoin(base_url, page) for page in ITALIAN_WORDS_PAGES]
         
-        if parole:
-            lista_parole = parole.text.strip().split(" ")
-        
-        for pagenumber in range(2, 18):
-            url = f"https://www.listediparole.it/5lettereparolepagina{pagenumber}.htm"
-            
-            page = requests.get(url, timeout=10)
-            soup = BeautifulSoup(page.content, 'html.parser')
-            parole = soup.find(class_="mt")
-            
-            if parole:
-                nuove_parole = parole.text.strip().split(" ")
+        #tutte le pagine vengono scaricate in parallelo sulla stessa sessione
+        with _http_session(workers) as http, ThreadPoolExecutor(max_workers=workers) as executor:
+            for nuove_parole in executor.map(lambda url: _scrape_italian_page(http, url, cache_dir), urls):
                 lista_parole += nuove_parole
         
         #creare array di numpy e controllare che vengano salvate soltanto le parole con 5 lettere
@@ -757,28 +4325,29 @@ def prendi_parole_italiane():
         return lista_parole
     
     except Exception as e:
+        print("Impossibile scaricare parole italiane: " + str(e))
         return [
             'CARNE', 'PALLA', 'FORNO', 'PORTA', 'SEDIA',
             'PIANO', 'LIBRO', 'CAMPO', 'TEMPO', 'MONDO'
         ]
 
 
-def prendi_parole_inglesi():
+def prendi_parole_inglesi(url=ENGLISH_WORDS_URL, cache_dir=SCRAPER_CACHE_DIR):
     """Scarica parole inglesi dal dataset Stanford"""
-    import requests
-    
     print("[SCRAPING] Inizio download parole inglesi...")
     lista_parole = []
     
     try:
-        url = "https://www-cs-faculty.stanford.edu/~knuth/sgb-words.txt"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            parole = response.text.strip().split('\n')
-            
-            parole_array = np.array([p.strip().upper() for p in parole if len(p.strip()) == 5])
-            lista_parole = parole_array.tolist()
+        #le righe vengono lette man mano che arrivano i blocchi
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        resto = ""
+        with _http_session(1) as http:
+            for chunk in cached_get(http, url, cache_dir):
+                righe = (resto + decoder.decode(chunk)).split('\n')
+                resto = righe.pop()
+                lista_parole += [p.strip().upper() for p in righe if len(p.strip()) == 5]
+        if len(resto.strip()) == 5:
+            lista_parole.append(resto.strip().upper())
             
         if len(lista_parole) < 100:
             parole_aggiuntive = [
@@ -819,35 +4388,102 @@ def salva_parole(lang='it', file_parole="parole_it.txt"):
             else:
                 parole = prendi_parole_italiane()
             
-            with open(file_parole, "w", encoding='utf-8') as file:
+            #scrittura atomica: gli altri worker leggono il file vecchio o quello completo
+            tmp_file = f"{file_parole}.{os.getpid()}.tmp"
+            with open(tmp_file, "w", encoding='utf-8') as file:
                 file.write(",".join(parole))
+            os.replace(tmp_file, file_parole)
             
         else:
             print("File " + file_parole + " già esistente")
-    #avvio del gioco
 
-if __name__ == '__main__':
-        print("\n" + "="*60)
-        print(" "*15 + "WORDLE GAME - INIZIALIZZAZIONE")
-        print("="*60 + "\n")
-        
-        #creare e sistemare i file delle parole per ogni lingua
-        for lang, file_name in WORD_FILES.items():
+
+def init_data_files():
+    """crea i file delle parole, dei giocatori e delle statistiche se mancano"""
+    #creare e sistemare i file delle parole per ogni lingua
+    for lang, file_name in WORD_FILES.items():
+        with file_lock(file_name):
             salva_parole(lang, file_name)
-            print()
-        
-        #creare e sistemare il file dei giocatori
-        if not os.path.exists(PLAYERS_FILE):
+        print()
+
+    #creare e sistemare il file dei giocatori
+    with file_lock(PLAYERS_FILE):
+        if get_sqlite_store() is None and not os.path.exists(PLAYERS_FILE):
             print("Creazione file database giocatori: " + PLAYERS_FILE)
             save_players({})
         else:
             print("Database giocatori trovato: " + PLAYERS_FILE)
-        
-        #creare e sistemare il file con le statistiche delle parole
-        if not os.path.exists(WORD_STATS_FILE):
+
+    #creare e sistemare il file con le statistiche delle parole
+    with file_lock(WORD_STATS_FILE):
+        if get_sqlite_store() is None and not os.path.exists(WORD_STATS_FILE):
             print("Creazione file statistiche parole: " + WORD_STATS_FILE)
             save_word_statistics({'it': {}, 'en': {}})
         else:
             print("File statistiche parole trovato: " + WORD_STATS_FILE)
+
+    #l'istantanea delle statistiche viene poi aggiornata a ogni partita conclusa
+    if not os.path.exists(ANALYTICS_FILE):
+        print(f"Istantanea statistiche: {ANALYTICS.build()} partite in {ANALYTICS_FILE}")
+
+
+def load_secret_key():
+    """chiave delle sessioni condivisa da tutti i worker (WORDLE_SECRET_KEY o file .secret_key)"""
+    secret_key = os.environ.get('WORDLE_SECRET_KEY')
+    if secret_key:
+        return secret_key
+
+    with file_lock(SECRET_KEY_FILE):
+        if os.path.exists(SECRET_KEY_FILE):
+            with open(SECRET_KEY_FILE, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+
+        secret_key = secrets.token_hex(32)
+        fd = os.open(SECRET_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(secret_key)
+        return secret_key
+
+
+def create_app():
+    """factory WSGI per l'avvio con più worker, ad esempio: gunicorn -w 4 'app:create_app()'"""
+    global GAME_STORE
+
+    #ogni worker deve poter leggere i cookie firmati dagli altri
+    app.secret_key = load_secret_key()
+
+    #le partite in memoria sarebbero visibili solo al worker che le ha create
+    if isinstance(GAME_STORE, MemoryGameStore):
+        GAME_STORE = SqliteGameStore(DATABASE_FILE)
+
+    #l'avvio del worker non scarica parole né controlla i file: lo fa una volta sola 'flask init'
+    return app
+
+
+@app.cli.command('init')
+@click.option('--patterns/--no-patterns', default=True, help="calcola anche le matrici dei pattern per /hint")
+def init_command(patterns):
+    """Prepara i file di dati (parole, giocatori, statistiche) prima di avviare i worker"""
+    init_data_files()
+    if patterns:
+        for lang in WORD_FILES:
+            word_list = WORD_REGISTRY.get(lang)
+            if not os.path.exists(pattern_matrix_path(word_list)):
+                print(f"Calcolo della matrice dei pattern {lang}...")
+                load_pattern_matrix(word_list)
+
+#avvio del gioco
+
+if __name__ == '__main__':
+        print("\n" + "="*60)
+        print(" "*15 + "WORDLE GAME - INIZIALIZZAZIONE")
+        print("="*60 + "\n")
+        
+        #la preparazione dei dati è separata dall'avvio: flask --app app init
+        missing = [f for f in WORD_FILES.values() if not os.path.exists(f)]
+        if get_sqlite_store() is None and not os.path.exists(PLAYERS_FILE):
+            missing.append(PLAYERS_FILE)
+        if missing:
+            print("File mancanti: " + ", ".join(missing) + " (eseguire prima: flask --app app init)")
         
         app.run(debug=True, port=5000, host='0.0.0.0')
@@ -0,0 +1,225 @@
+"""Variante ASGI del server di gioco per molti giocatori contemporanei.
+
+Espone le stesse rotte dell'app Flask (/new-game, /check-word, /player-stats,
+/top-players, ...) senza duplicarne la logica: ogni richiesta viene eseguita
+dall'app WSGI di app.py in un pool di thread limitato, mentre il ciclo asyncio
+gestisce le connessioni e passa il corpo delle richieste man mano che arriva.
+
+Le partite concluse non vengono salvate nel thread della richiesta: /check-word
+le mette in coda e risponde subito, senza i campi analytics e daily_rank. Un task
+writer dedicato salva ogni gruppo di partite in coda con il salvataggio a blocchi
+dell'importazione (ingest_game_batch: una scrittura dei profili e una dello
+storico per gruppo). Il profilo e le classifiche mostrano la partita appena il
+writer l'ha salvata, di solito pochi millisecondi dopo la risposta.
+
+Avvio (un solo processo, le partite in corso restano in memoria):
+    uvicorn asgi:application --port 8000
+"""
+import asyncio
+import concurrent.futures
+import io
+import os
+import sys
+from datetime import datetime
+
+import app as wordle
+
+REQUEST_THREADS = int(os.environ.get('WORDLE_ASGI_THREADS', 32))
+
+
+class GameWriter:
+    """task asyncio che raccoglie le partite concluse e le salva a gruppi su un thread dedicato;
+    chi le invia non aspetta il salvataggio"""
+
+    def __init__(self):
+        self._executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='game-writer')
+        self._loop = None
+        self._queue = None
+        self._task = None
+
+    def start(self, loop):
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+
+    def record(self, username, game):
+        """chiamato dai thread delle richieste: accoda la partita e ritorna subito"""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (username, game, datetime.now()))
+        return {'queued': True}
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            #le partite arrivate nel frattempo vengono salvate nello stesso giro
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._loop.run_in_executor(self._executor, self._write, batch)
+            except Exception as e:
+                print(f"[ERROR] Salvataggio di {len(batch)} partite non riuscito: {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(batch):
+        #profili e storico con una sola scrittura per gruppo, come l'importazione in blocco
+        wordle.ingest_game_batch([wordle.finished_game_row(username, game, played_at)
+                                  for username, game, played_at in batch])
+        for username, game, _ in batch:
+            if game.mode == 'daily':
+                wordle.DAILY_LEADERBOARD.record(username, game.day, game.lang, game.attempts, game.won)
+
+    async def stop(self):
+        """salva le partite ancora in coda e ferma il task"""
+        await self._queue.join()
+        self._task.cancel()
+        self._executor.shutdown()
+
+
+class RequestBody(io.RawIOBase):
+    """corpo della richiesta ASGI letto dal thread della vista un messaggio alla volta,
+    così i caricamenti grandi (/api/games/import) non vengono raccolti in memoria"""
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b''
+        self._done = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer and not self._done:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._done = True
+            else:
+                self._buffer = message.get('body', b'')
+                self._done = not message.get('more_body', False)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class AsgiApplication:
+    """adattatore ASGI 3 per l'app Flask con writer delle partite dedicato"""
+
+    def __init__(self, flask_app, threads=REQUEST_THREADS):
+        self.flask_app = flask_app
+        self.threads = threads
+        self.writer = GameWriter()
+        self._executor = None
+        self._started = False
+
+    def _start(self):
+        if self._started:
+            return
+        self._executor = concurrent.futures.ThreadPoolExecutor(self.threads, thread_name_prefix='asgi-request')
+        self.writer.start(asyncio.get_running_loop())
+        wordle.GAME_RESULTS = self.writer
+        self._started = True
+
+    async def _shutdown(self):
+        if not self._started:
+            return
+        await self.writer.stop()
+        wordle.GAME_RESULTS = wordle.InlineGameResults()
+        self._executor.shutdown()
+        #i conteggi e i mazzi ancora in memoria vengono salvati prima di uscire
+        wordle.WORD_COUNT_BUFFER.flush()
+        wordle.PLAYER_DECKS.flush()
+        self._started = False
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            self._start()
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self._shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    def _environ(scope, body):
+        """ambiente WSGI equivalente alla richiesta ASGI; body è lo stream del corpo"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            #senza Content-Length (chunked) il corpo finisce quando lo stream è esaurito
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin1').upper().replace('-', '_')
+            value = value.decode('latin1')
+            if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                environ[name] = value
+            else:
+                key = f'HTTP_{name}'
+                environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    def _start_wsgi(self, environ):
+        """esegue la vista Flask nel thread del pool e restituisce stato, intestazioni e corpo"""
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(k.lower().encode('latin1'), v.encode('latin1')) for k, v in headers]
+
+        iterable = self.flask_app.wsgi_app(environ, start_response)
+        return started['status'], started['headers'], iter(iterable), iterable
+
+    async def _http(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        #la vista parte subito e legge il corpo man mano che arriva
+        environ = self._environ(scope, io.BufferedReader(RequestBody(receive, loop)))
+        status, headers, iterator, iterable = await loop.run_in_executor(self._executor, self._start_wsgi, environ)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        try:
+            #le risposte in streaming vengono lette un blocco alla volta, sempre nel pool
+            while True:
+                chunk = await loop.run_in_executor(self._executor, next, iterator, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                await loop.run_in_executor(self._executor, close)
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+
+def create_asgi_app():
+    """factory ASGI: stessa chiave delle sessioni dei worker WSGI, partite in memoria"""
+    wordle.app.secret_key = wordle.load_secret_key()
+    return AsgiApplication(wordle.app)
+
+
+application = create_asgi_app()
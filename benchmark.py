@@ -0,0 +1,275 @@
+"""Benchmark dei percorsi critici del gioco e dello strato di salvataggio.
+
+Genera storici sintetici (partite, giocatori, statistiche delle parole) in una
+cartella temporanea, esegue gli endpoint tramite il test client di Flask e
+misura singolarmente le funzioni principali. I risultati vengono scritti in
+JSON per poter confrontare esecuzioni diverse.
+
+Esempio:
+    python benchmark.py --games 1000 100000 1000000 --players 5000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+
+BENCH_PLAYER = 'bench_player'
+
+
+def summarize(samples, total_time=None):
+    """riassume una lista di tempi in secondi con p50/p99 (in millisecondi) e throughput"""
+    samples = np.asarray(samples, dtype=float)
+    total_time = samples.sum() if total_time is None else total_time
+    return {
+        'count': int(len(samples)),
+        'mean_ms': float(samples.mean() * 1000),
+        'p50_ms': float(np.percentile(samples, 50) * 1000),
+        'p99_ms': float(np.percentile(samples, 99) * 1000),
+        'max_ms': float(samples.max() * 1000),
+        'throughput_per_s': float(len(samples) / total_time) if total_time > 0 else None,
+    }
+
+
+def timed(func, repeat):
+    """esegue func repeat volte e restituisce i tempi delle singole chiamate"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def word_list(lang):
+    """parole del dizionario della lingua come lista di stringhe"""
+    words = wordle.WORD_REGISTRY.get(lang).words
+    return [w.decode('ascii') for w in words]
+
+
+#generazione dei dati sintetici
+def generate_players(n_players, rng):
+    """crea n_players profili con statistiche casuali ma coerenti"""
+    players = {}
+    for i in range(n_players):
+        username = f'player{i:07d}'
+        games = int(rng.integers(0, 200))
+        won = int(rng.integers(0, games + 1))
+        score_sum = won * 150 - games * 30
+        players[username] = {
+            'nome': f'Giocatore {i}',
+            'username': username,
+            'created_at': datetime(2025, 1, 1).isoformat(),
+            'last_played': None,
+            'games_played': games,
+            'games_won': won,
+            'total_attempts': games * 3,
+            'total_score': score_sum,
+            'average_score': score_sum / games if games else 0.0,
+            'best_score': 140 if won else 0,
+            'current_streak': 0,
+            'best_streak': int(rng.integers(0, won + 1)),
+            'lang_stats': {'it': {'played': games, 'won': won}},
+            'score_stats': {'count': games, 'sum': score_sum, 'sum_sq': score_sum * 100,
+                            'min': 40 if games else None, 'max': 140 if games else None, 'wins': won},
+        }
+    return players
+
+
+def generate_scores(n_games, usernames, rng):
+    """crea uno storico di n_games partite nel formato di classifica.csv"""
+    attempts = rng.integers(1, wordle.MAX_ATTEMPTS + 1, n_games)
+    won = rng.random(n_games) < 0.7
+    scores = 100 - attempts * 10 + np.where(won, 50, 0)
+    start = datetime(2025, 1, 1)
+    offsets = np.sort(rng.integers(0, 365 * 24 * 3600, n_games))
+    return pd.DataFrame({
+        'player': np.asarray(usernames)[rng.integers(0, len(usernames), n_games)],
+        'score': scores,
+        'attempts': attempts,
+        'won': won,
+        'lang': np.where(rng.random(n_games) < 0.5, 'it', 'en'),
+        'timestamp': [(start + timedelta(seconds=int(s))).isoformat() for s in offsets],
+    })
+
+
+def generate_word_statistics(rng, n_games):
+    """distribuisce n_games estrazioni sulle parole dei dizionari"""
+    stats = {}
+    for lang in wordle.WORD_FILES:
+        words = word_list(lang)
+        counts = np.bincount(rng.integers(0, len(words), n_games // 2 + 1), minlength=len(words))
+        now = datetime(2025, 1, 1).isoformat()
+        stats[lang] = {
+            word: {'count': int(count), 'first_used': now, 'last_used': now}
+            for word, count in zip(words, counts) if count > 0
+        }
+    return stats
+
+
+def prepare_dataset(directory, n_games, n_players, seed):
+    """scrive nella cartella i file sintetici usati dall'applicazione"""
+    rng = np.random.default_rng(seed)
+    for file_name in wordle.WORD_FILES.values():
+        shutil.copy(os.path.join(REPO_DIR, file_name), directory)
+
+    os.chdir(directory)
+    reset_app_state()
+
+    players = generate_players(n_players, rng)
+    players[BENCH_PLAYER] = generate_players(1, rng)['player0000000']
+    players[BENCH_PLAYER]['username'] = BENCH_PLAYER
+    with open(wordle.PLAYERS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(players, f)
+
+    generate_scores(n_games, list(players.keys()), rng).to_csv(wordle.SCORES_FILE, index=False)
+
+    with open(wordle.WORD_STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(generate_word_statistics(rng, n_games), f)
+
+
+def reset_app_state():
+    """svuota le cache di processo dell'applicazione dopo aver cambiato i file"""
+    wordle.WORD_COUNT_BUFFER.flush()
+    wordle.PLAYER_DECKS.flush()
+    wordle.PLAYER_DECKS.clear()
+    wordle.WORD_REGISTRY.clear()
+    wordle.LEADERBOARD.invalidate()
+
+
+#benchmark degli endpoint
+def bench_endpoints(requests_per_endpoint, rng):
+    """misura latenza e throughput degli endpoint tramite il test client di Flask"""
+    client = wordle.app.test_client()
+    client.post('/login', json={'username': BENCH_PLAYER})
+    guesses = word_list('en')
+    results = {}
+
+    new_game, check_word = [], []
+    total_new = total_check = 0.0
+    for _ in range(requests_per_endpoint):
+        start = time.perf_counter()
+        client.post('/new-game', json={'lang': 'en'})
+        elapsed = time.perf_counter() - start
+        new_game.append(elapsed)
+        total_new += elapsed
+
+        #si gioca la partita fino alla fine per includere il salvataggio dei risultati
+        for _ in range(wordle.MAX_ATTEMPTS):
+            start = time.perf_counter()
+            response = client.post('/check-word', json={'word': guesses[rng.integers(0, len(guesses))]})
+            elapsed = time.perf_counter() - start
+            check_word.append(elapsed)
+            total_check += elapsed
+            if response.get_json().get('game_over'):
+                break
+
+    results['/new-game'] = summarize(new_game, total_new)
+    results['/check-word'] = summarize(check_word, total_check)
+
+    for name, url in (('/top-players', '/top-players?limit=10'),
+                      ('/api/word-stats/all', '/api/word-stats/all?limit=10'),
+                      ('/player-stats', '/player-stats')):
+        results[name] = summarize(timed(lambda: client.get(url), requests_per_endpoint))
+
+    return results
+
+
+#benchmark delle singole funzioni
+def bench_functions(repeat, rng):
+    """misura singolarmente le funzioni dei percorsi critici"""
+    words = word_list('en')
+    game = wordle.Game('en', secret_word=words[0])
+    results = {}
+
+    results['Game._check_word_logic'] = summarize(
+        timed(lambda: game._check_word_logic(words[rng.integers(0, len(words))]), repeat * 10)
+    )
+    results['get_random_word'] = summarize(timed(lambda: wordle.get_random_word('en'), repeat))
+    results['save_score'] = summarize(
+        timed(lambda: wordle.save_score(BENCH_PLAYER, int(rng.integers(1, 7)), True, 'en'), repeat)
+    )
+    results['update_player_stats'] = summarize(
+        timed(lambda: wordle.update_player_stats(BENCH_PLAYER, True, int(rng.integers(1, 7)), 'en'), repeat)
+    )
+    return results
+
+
+def run(games_sizes, n_players, requests_per_endpoint, repeat, seed):
+    """esegue i benchmark per ogni dimensione dello storico"""
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'players': n_players,
+        'storage_backend': wordle.STORAGE_BACKEND,
+        'runs': [],
+    }
+    cwd = os.getcwd()
+
+    for n_games in games_sizes:
+        directory = tempfile.mkdtemp(prefix='wordle_bench_')
+        try:
+            print(f"[BENCH] {n_games} partite, {n_players} giocatori...")
+            start = time.perf_counter()
+            prepare_dataset(directory, n_games, n_players, seed)
+            setup_time = time.perf_counter() - start
+
+            rng = np.random.default_rng(seed)
+            report['runs'].append({
+                'games': n_games,
+                'setup_s': setup_time,
+                'endpoints': bench_endpoints(requests_per_endpoint, rng),
+                'functions': bench_functions(repeat, rng),
+            })
+        finally:
+            reset_app_state()
+            os.chdir(cwd)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return report
+
+
+def print_report(report):
+    """stampa una tabella riassuntiva dei risultati"""
+    for run_result in report['runs']:
+        print(f"\n== {run_result['games']} partite ==")
+        for section in ('endpoints', 'functions'):
+            for name, stats in run_result[section].items():
+                print(f"  {name:<28} p50 {stats['p50_ms']:9.3f} ms   p99 {stats['p99_ms']:9.3f} ms   "
+                      f"{stats['throughput_per_s']:10.1f} /s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del gioco delle parole")
+    parser.add_argument('--games', type=int, nargs='+', default=[1_000, 100_000, 1_000_000],
+                        help="dimensioni dello storico delle partite")
+    parser.add_argument('--players', type=int, default=5_000, help="numero di giocatori registrati")
+    parser.add_argument('--requests', type=int, default=200, help="richieste per endpoint")
+    parser.add_argument('--repeat', type=int, default=200, help="ripetizioni per funzione")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_results.json', help="file JSON dei risultati")
+    args = parser.parse_args(argv)
+
+    report = run(args.games, args.players, args.requests, args.repeat, args.seed)
+    print_report(report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRisultati salvati in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""Test di carico della modalità multi-worker.
+
+Avvia N processi indipendenti, ognuno con la propria istanza di create_app(),
+che giocano contemporaneamente sugli stessi file (o sullo stesso database
+sqlite). Ogni worker alterna partite del proprio giocatore e di un giocatore
+condiviso da tutti. Alla fine controlla che ogni partita sia stata registrata
+esattamente una volta nella classifica, nei profili e nelle statistiche delle
+parole.
+
+Con --compare-servers confronta invece, sulla stessa macchina, il server
+attuale (app.run con thread) e la variante ASGI (uvicorn asgi:application):
+per ogni livello di concorrenza avvia N giocatori HTTP simultanei per una
+durata fissa e riporta partite al secondo, latenza dei tentativi ed errori.
+
+Con --ingest N genera un file JSONL di N partite concluse e misura le partite
+al secondo dell'importazione in blocco (flask import-games).
+
+Esempi:
+    python loadtest.py --workers 8 --games 50 --storage json
+    python loadtest.py --compare-servers --players 8,32,128 --duration 10
+    python loadtest.py --ingest 1000000 --storage sqlite
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+SHARED_PLAYER = 'shared_player'
+
+
+def player_for(worker, game):
+    """le partite pari sono del giocatore del worker, le dispari del giocatore condiviso"""
+    return f'worker{worker:03d}' if game % 2 == 0 else SHARED_PLAYER
+
+
+def play_game(client, words, rng):
+    """gioca una partita completa e restituisce tentativi ed esito"""
+    client.post('/new-game', json={'lang': 'en'})
+    secret = client.get('/get-secret-word').get_json()['secret_word']
+    wrong = [w for w in rng.sample(words, 8) if w != secret]
+
+    #da 0 a 6 tentativi sbagliati: con 6 la partita è persa
+    misses = rng.randint(0, 6)
+    for attempt in range(misses):
+        result = client.post('/check-word', json={'word': wrong[attempt]}).get_json()
+        if not result['success']:
+            raise RuntimeError(result['error'])
+    if misses < 6:
+        result = client.post('/check-word', json={'word': secret}).get_json()
+        if not result.get('won'):
+            raise RuntimeError(f"partita non vinta: {result}")
+        return misses + 1, True
+    return misses, False
+
+
+def worker(index, n_games, barrier, queue):
+    """processo worker: crea l'app, registra il proprio giocatore e gioca n_games partite"""
+    import random
+    import contextlib
+    import io
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as wordle
+        application = wordle.create_app()
+
+    rng = random.Random(index)
+    words = [w.decode('ascii') for w in wordle.WORD_REGISTRY.get('en').words]
+
+    own = application.test_client()
+    own.post('/players', json={'nome': f'Worker {index}', 'username': player_for(index, 0)})
+    shared = application.test_client()
+    shared.post('/login', json={'username': SHARED_PLAYER})
+
+    barrier.wait()
+    played = []
+    for game in range(n_games):
+        client = own if game % 2 == 0 else shared
+        played.append((player_for(index, game),) + play_game(client, words, rng))
+
+    wordle.WORD_COUNT_BUFFER.flush()
+    queue.put(played)
+
+
+def check(wordle, played):
+    """confronta le partite giocate con quanto salvato; restituisce la lista degli errori"""
+    errors = []
+    expected = {}
+    for username, attempts, won in played:
+        expected.setdefault(username, []).append(100 - attempts * 10 + (50 if won else 0))
+
+    scores = wordle.load_scores()
+    if len(scores) != len(played):
+        errors.append(f"classifica: {len(scores)} righe, attese {len(played)}")
+    by_player = scores.groupby('player')['score'].agg(['size', 'sum'])
+
+    players = wordle.load_players()
+    for username, games in expected.items():
+        player = players.get(username)
+        if player is None:
+            errors.append(f"{username}: profilo mancante")
+            continue
+        if player['games_played'] != len(games):
+            errors.append(f"{username}: games_played {player['games_played']}, attese {len(games)}")
+        if player['score_stats']['count'] != len(games):
+            errors.append(f"{username}: score_stats.count {player['score_stats']['count']}, attese {len(games)}")
+        if player['total_score'] != sum(games):
+            errors.append(f"{username}: total_score {player['total_score']}, atteso {sum(games)}")
+        if username not in by_player.index or by_player.loc[username, 'sum'] != sum(games):
+            errors.append(f"{username}: punteggi in classifica diversi dal profilo")
+
+    used = sum(data['count'] for data in wordle.load_word_statistics().get('en', {}).values())
+    if used != len(played):
+        errors.append(f"statistiche parole: {used} estrazioni, attese {len(played)}")
+
+    return errors
+
+
+def run(n_workers, n_games, storage):
+    """esegue il test in una cartella temporanea e restituisce gli errori trovati"""
+    directory = tempfile.mkdtemp(prefix='wordle_load_')
+    cwd = os.getcwd()
+    try:
+        for file_name in ('parole_it.txt', 'words_en.txt'):
+            shutil.copy(os.path.join(REPO_DIR, file_name), directory)
+        os.chdir(directory)
+        os.environ['WORDLE_STORAGE'] = storage
+
+        import app as wordle
+        #come 'flask init' prima dell'avvio dei worker
+        wordle.init_data_files()
+        wordle.create_app()
+        wordle.insert_player(SHARED_PLAYER, {
+            'nome': 'Condiviso', 'username': SHARED_PLAYER, 'created_at': None, 'last_played': None,
+            'games_played': 0, 'games_won': 0, 'total_attempts': 0, 'total_score': 0,
+            'average_score': 0.0, 'best_score': 0, 'current_streak': 0, 'best_streak': 0,
+            'lang_stats': {}, 'score_stats': wordle._empty_score_stats(),
+        })
+
+        #processi avviati da zero, senza memoria condivisa, come worker separati
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(n_workers)
+        queue = ctx.Queue()
+        processes = [ctx.Process(target=worker, args=(i, n_games, barrier, queue)) for i in range(n_workers)]
+
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        played = []
+        for _ in processes:
+            played += queue.get()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        if any(process.exitcode != 0 for process in processes):
+            return ["almeno un worker è terminato con errore"]
+
+        print(f"[LOAD] {len(played)} partite in {elapsed:.2f}s con {n_workers} worker ({storage})")
+        return check(wordle, played)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+#confronto tra server HTTP reali
+SERVERS = {
+    'app.run': "import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)",
+    'asgi': "import uvicorn; uvicorn.run('asgi:application', host='127.0.0.1', port={port}, log_level='warning')",
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(name, directory, storage):
+    """avvia il server in un processo separato e attende che risponda"""
+    import requests
+
+    port = free_port()
+    env = dict(os.environ, WORDLE_STORAGE=storage, PYTHONPATH=REPO_DIR)
+    process = subprocess.Popen([sys.executable, '-c', SERVERS[name].format(port=port)], cwd=directory, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(200):
+        try:
+            requests.get(base + '/rules', timeout=1)
+            return process, base
+        except requests.ConnectionError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"il server {name} non risponde")
+
+
+def http_player(base, index, words, deadline, results):
+    """giocatore HTTP: gioca partite complete fino alla scadenza"""
+    import random
+    import requests
+
+    rng = random.Random(index)
+    http = requests.Session()
+    username = f'player{index:04d}'
+    http.post(base + '/players', json={'nome': username, 'username': username})
+    games, latencies, errors = 0, [], 0
+    while time.perf_counter() < deadline:
+        try:
+            http.post(base + '/new-game', json={'lang': 'en'})
+            secret = http.get(base + '/get-secret-word').json()['secret_word']
+            guesses = [w for w in rng.sample(words, 4) if w != secret][:rng.randint(0, 3)] + [secret]
+            for guess in guesses:
+                start = time.perf_counter()
+                result = http.post(base + '/check-word', json={'word': guess}).json()
+                latencies.append(time.perf_counter() - start)
+            if not result.get('won'):
+                errors += 1
+            games += 1
+        except Exception:
+            errors += 1
+    results.append((games, latencies, errors))
+
+
+def measure(base, players, duration, words):
+    """N giocatori contemporanei per duration secondi: partite/s, latenze, errori"""
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=http_player, args=(base, i, words, deadline, results)) for i in range(players)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(l for _, lat, _ in results for l in lat)
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    return {
+        'games_per_s': sum(g for g, _, _ in results) / duration,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'errors': sum(e for _, _, e in results),
+    }
+
+
+def compare_servers(levels, duration, storage):
+    """stessa macchina, stessi dati iniziali: app.run contro la variante ASGI"""
+    with open(os.path.join(REPO_DIR, 'words_en.txt'), encoding='utf-8') as f:
+        words = [w.strip().upper() for w in f.read().split(',') if w.strip()]
+
+    print(f"{'server':8} {'giocatori':>9} {'partite/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'errori':>7}")
+    for name in SERVERS:
+        for players in levels:
+            directory = tempfile.mkdtemp(prefix='wordle_http_')
+            try:
+                for file_name in ('parole_it.txt', 'words_en.txt'):
+                    shutil.copy(os.path.join(REPO_DIR, file_name), directory)
+                process, base = start_server(name, directory, storage)
+                try:
+                    r = measure(base, players, duration, words)
+                finally:
+                    process.terminate()
+                    process.wait()
+                print(f"{name:8} {players:9d} {r['games_per_s']:10.1f} {r['p50_ms']:8.1f} "
+                      f"{r['p95_ms']:8.1f} {r['errors']:7d}")
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def ingest_benchmark(n_games, n_players, storage, batch_size):
+    """importa n_games partite casuali di n_players giocatori e restituisce il riepilogo e i secondi"""
+    import json
+    import random
+
+    directory = tempfile.mkdtemp(prefix='wordle_ingest_')
+    cwd = os.getcwd()
+    try:
+        for file_name in ('parole_it.txt', 'words_en.txt'):
+            shutil.copy(os.path.join(REPO_DIR, file_name), directory)
+        os.chdir(directory)
+        os.environ['WORDLE_STORAGE'] = storage
+
+        import app as wordle
+        wordle.init_data_files()
+        words = [w.decode('ascii') for w in wordle.WORD_REGISTRY.get('en').words]
+        rng = random.Random(0)
+        with open('games.jsonl', 'w', encoding='utf-8') as f:
+            for i in range(n_games):
+                secret = rng.choice(words)
+                misses = rng.randint(0, 6)
+                guesses = [w for w in rng.sample(words, 7) if w != secret][:misses] + ([secret] if misses < 6 else [])
+                f.write(json.dumps({'player': f'bot{rng.randrange(n_players):06d}', 'lang': 'en',
+                                    'secret_word': secret, 'guesses': guesses}) + '\n')
+
+        start = time.perf_counter()
+        with open('games.jsonl', 'rb') as f:
+            summary = wordle.ingest_games(f, batch_size)
+        return summary, time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test di carico con più worker concorrenti")
+    parser.add_argument('--workers', type=int, default=4, help="numero di processi worker")
+    parser.add_argument('--games', type=int, default=50, help="partite giocate da ogni worker")
+    parser.add_argument('--storage', choices=('json', 'sqlite'), default='json')
+    parser.add_argument('--compare-servers', action='store_true', help="confronta app.run e la variante ASGI via HTTP")
+    parser.add_argument('--players', default='8,32,128', help="livelli di concorrenza per --compare-servers")
+    parser.add_argument('--duration', type=float, default=10, help="secondi di gioco per ogni livello")
+    parser.add_argument('--ingest', type=int, metavar='N', help="misura l'importazione in blocco di N partite")
+    parser.add_argument('--ingest-players', type=int, default=10000, help="giocatori distinti per --ingest")
+    parser.add_argument('--batch-size', type=int, default=10000, help="partite per blocco per --ingest")
+    args = parser.parse_args(argv)
+
+    if args.ingest:
+        summary, elapsed = ingest_benchmark(args.ingest, args.ingest_players, args.storage, args.batch_size)
+        print(f"[{args.storage}] {summary['games']} partite importate in {elapsed:.1f}s "
+              f"({summary['games'] / elapsed:.0f} partite/s), scartate {summary['rejected']}")
+        return
+
+    if args.compare_servers:
+        compare_servers([int(n) for n in args.players.split(',')], args.duration, args.storage)
+        return
+
+    errors = run(args.workers, args.games, args.storage)
+    for error in errors:
+        print(f"[ERROR] {error}")
+    if errors:
+        sys.exit(1)
+    print("[LOAD] ogni partita è stata registrata esattamente una volta")
+
+
+if __name__ == '__main__':
+    main()
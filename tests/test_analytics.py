@@ -0,0 +1,55 @@
+"""Test dell'istantanea colonnare delle statistiche usata da /api/analytics."""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+
+
+class AnalyticsSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_analytics_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        wordle.RESPONSE_CACHE.clear()
+        self.client = wordle.app.test_client()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def wait_for_snapshot(self):
+        deadline = time.monotonic() + 30
+        while not os.path.exists(wordle.ANALYTICS_FILE) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(os.path.exists(wordle.ANALYTICS_FILE))
+
+    def test_missing_snapshot_is_built_in_background(self):
+        wordle.save_score('anna', 2, True, 'en')
+        wordle.save_score('bruno', 6, False, 'it')
+
+        #la richiesta non analizza lo storico: risponde subito 503 e avvia la costruzione
+        self.assertEqual(self.client.get('/api/analytics').status_code, 503)
+        self.wait_for_snapshot()
+
+        analytics = self.client.get('/api/analytics').get_json()['analytics']
+        self.assertEqual(analytics['total_games'], 2)
+        self.assertEqual(analytics['overall']['wins'], 1)
+
+        #le partite successive vengono aggiunte in coda all'istantanea
+        wordle.save_score('anna', 1, True, 'en')
+        analytics = self.client.get('/api/analytics').get_json()['analytics']
+        self.assertEqual(analytics['total_games'], 3)
+        self.assertEqual(analytics['by_lang']['en']['games'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Test della variante ASGI: stesse rotte dell'app Flask e salvataggi tramite il writer."""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+import asgi
+
+
+async def call(application, method, path, body=None, cookie=None, chunks=None, headers=None):
+    """esegue una richiesta ASGI e restituisce stato, intestazioni e corpo;
+    con chunks il corpo arriva in più messaggi, senza Content-Length"""
+    if chunks is None:
+        chunks = [json.dumps(body).encode() if body is not None else b'']
+    headers = list(headers or [(b'content-type', b'application/json')])
+    if cookie:
+        headers.append((b'cookie', cookie))
+    path, _, query = path.partition('?')
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(), 'headers': headers}
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    start = sent[0]
+    payload = b''.join(m.get('body', b'') for m in sent[1:])
+    return start['status'], dict(start['headers']), payload
+
+
+class AsgiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_asgi_')
+        self.cwd = os.getcwd()
+        for file_name in wordle.WORD_FILES.values():
+            shutil.copy(os.path.join(REPO_DIR, file_name), self.directory)
+        os.chdir(self.directory)
+        wordle.RESPONSE_CACHE.clear()
+        wordle.LEADERBOARD.invalidate()
+
+    def tearDown(self):
+        wordle.GAME_RESULTS = wordle.InlineGameResults()
+        #i mazzi vanno salvati nella cartella del test, non in quella da cui parte pytest
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_game_is_played_and_saved_through_the_writer(self):
+        application = asgi.AsgiApplication(wordle.app, threads=4)
+
+        async def scenario():
+            application._start()
+            self.assertIs(wordle.GAME_RESULTS, application.writer)
+            status, headers, _ = await call(application, 'POST', '/players', {'nome': 'Anna', 'username': 'anna'})
+            self.assertEqual(status, 200)
+            cookie = headers[b'set-cookie'].split(b';', 1)[0]
+            status, headers, _ = await call(application, 'POST', '/new-game', {'lang': 'en'}, cookie)
+            cookie = headers.get(b'set-cookie', cookie).split(b';', 1)[0]
+            _, _, body = await call(application, 'GET', '/get-secret-word', cookie=cookie)
+            secret = json.loads(body)['secret_word']
+            _, _, body = await call(application, 'POST', '/check-word', {'word': secret}, cookie)
+            result = json.loads(body)
+            #lo stop del writer salva le partite ancora in coda
+            await application.writer.stop()
+            application.writer.start(asyncio.get_running_loop())
+            _, _, top = await call(application, 'GET', '/top-players?limit=1')
+            await application._shutdown()
+            return result, json.loads(top)
+
+        result, top = asyncio.run(scenario())
+        #la risposta non aspetta il salvataggio
+        self.assertTrue(result['won'])
+        self.assertTrue(result['queued'])
+        self.assertNotIn('analytics', result)
+        self.assertEqual(wordle.load_player('anna')['games_won'], 1)
+        self.assertEqual(top['leaderboard'][0]['username'], 'anna')
+        self.assertIsInstance(wordle.GAME_RESULTS, wordle.InlineGameResults)
+
+    def test_request_body_is_streamed_to_the_view(self):
+        application = asgi.AsgiApplication(wordle.app, threads=2)
+        games = [{'player': 'bruno', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['SLATE', 'CRANE']},
+                 {'player': 'bruno', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['CRANE']}]
+        body = '\n'.join(json.dumps(game) for game in games).encode()
+        #il corpo arriva spezzato a metà riga, come da una connessione lenta
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+        headers = [(b'content-type', b'application/x-ndjson'), (b'authorization', b'Bearer segreto')]
+
+        async def scenario():
+            status, _, payload = await call(application, 'POST', '/api/games/import', chunks=chunks, headers=headers)
+            await application._shutdown()
+            return status, json.loads(payload)
+
+        previous, wordle.ADMIN_TOKEN = wordle.ADMIN_TOKEN, 'segreto'
+        try:
+            status, summary = asyncio.run(scenario())
+        finally:
+            wordle.ADMIN_TOKEN = previous
+        self.assertEqual(status, 200)
+        self.assertEqual(summary['games'], 2)
+        self.assertEqual(wordle.load_player('bruno')['games_won'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Test dei dizionari compilati (.wlb): compilazione, lettura tramite mmap e ritorno ai .txt più recenti."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+class CompiledWordListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_wlb_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        with open(wordle.WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write('SLATE,CRANE,PLANT,CAFÉS,TOOLONG')
+        with open(wordle.ACCEPTED_WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write('AUDIO,ADIEU')
+        with open(wordle.WORD_STATS_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'it': {}, 'en': {'CRANE': {'count': 7, 'first_used': None, 'last_used': None}}}, f)
+        self.registry = wordle.WordRegistry(wordle.WORD_FILES, wordle.ACCEPTED_WORD_FILES, wordle.COMPILED_WORD_FILES)
+
+    def tearDown(self):
+        self.registry.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_compiled_list_round_trip(self):
+        #le parole non ASCII o non di 5 lettere restano fuori
+        self.assertEqual(wordle.compile_word_list('en'), 5)
+        word_list = self.registry.get('en')
+        self.assertIsInstance(word_list, wordle.MappedWordList)
+
+        self.assertEqual(sorted(word_list.word_at(i) for i in range(len(word_list))), ['CRANE', 'PLANT', 'SLATE'])
+        self.assertIn('crane', word_list)
+        self.assertNotIn('AUDIO', word_list)
+        self.assertTrue(word_list.is_valid_guess('audio'))
+        self.assertFalse(word_list.is_valid_guess('CAFÉS'))
+        self.assertFalse(word_list.is_valid_guess('ZZZZZ'))
+        self.assertEqual(word_list.guesses.tolist(), [b'ADIEU', b'AUDIO', b'CRANE', b'PLANT', b'SLATE'])
+        self.assertEqual(word_list.frequencies.tolist(), [0, 0, 7, 0, 0])
+        self.assertEqual(word_list.codes.shape, (3, 5))
+        #lo stesso file non viene riaperto finché non cambia
+        self.assertIs(self.registry.get('en'), word_list)
+
+    def test_stale_compiled_list_falls_back_to_the_text_file(self):
+        wordle.compile_word_list('en')
+        compiled_mtime = os.stat(wordle.COMPILED_WORD_FILES['en']).st_mtime_ns
+        self.assertIsInstance(self.registry.get('en'), wordle.MappedWordList)
+
+        #un .txt modificato dopo la compilazione vince sul dizionario compilato
+        with open(wordle.WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write('SLATE,CRANE,PLANT,GHOST')
+        os.utime(wordle.WORD_FILES['en'], ns=(compiled_mtime + 10 ** 9, compiled_mtime + 10 ** 9))
+        self.assertEqual(self.registry._source('en')[0], wordle.WORD_FILES['en'])
+        word_list = self.registry.get('en')
+        self.assertIsInstance(word_list, wordle.WordList)
+        self.assertIn('GHOST', word_list)
+        self.assertTrue(word_list.is_valid_guess('AUDIO'))
+
+        #anche le parole accettate più recenti rendono obsoleto il file compilato
+        os.utime(wordle.WORD_FILES['en'], ns=(compiled_mtime, compiled_mtime))
+        wordle.compile_word_list('en')
+        self.assertEqual(self.registry._source('en')[0], wordle.COMPILED_WORD_FILES['en'])
+        compiled_mtime = os.stat(wordle.COMPILED_WORD_FILES['en']).st_mtime_ns
+        os.utime(wordle.ACCEPTED_WORD_FILES['en'], ns=(compiled_mtime + 10 ** 9, compiled_mtime + 10 ** 9))
+        self.assertEqual(self.registry._source('en')[0], wordle.WORD_FILES['en'])
+
+    def test_invalid_compiled_file_is_rejected(self):
+        with open(wordle.COMPILED_WORD_FILES['en'], 'wb') as f:
+            f.write(wordle.WORD_BINARY_HEADER.pack(b'XXXX', 1, 0, 0))
+        with self.assertRaises(ValueError):
+            wordle.MappedWordList('en', wordle.COMPILED_WORD_FILES['en'], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
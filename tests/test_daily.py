@@ -0,0 +1,63 @@
+"""Test della modalità giornaliera: ripresa, partita persa dal server e niente aiuti."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+
+
+class DailyModeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_daily_')
+        self.cwd = os.getcwd()
+        for file_name in wordle.WORD_FILES.values():
+            shutil.copy(os.path.join(REPO_DIR, file_name), self.directory)
+        os.chdir(self.directory)
+        wordle.DAILY_LEADERBOARD.clear()
+        wordle.DAILY_SCHEDULE.clear()
+        self.client = wordle.app.test_client()
+        self.client.post('/players', json={'nome': 'Anna', 'username': 'anna'})
+
+    def tearDown(self):
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        wordle.DAILY_LEADERBOARD.clear()
+        wordle.DAILY_SCHEDULE.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def start_daily(self):
+        return self.client.post('/new-game', json={'lang': 'en', 'mode': 'daily'})
+
+    def test_no_hint_or_secret_word_during_the_daily_game(self):
+        self.assertEqual(self.start_daily().status_code, 200)
+        self.assertEqual(self.client.get('/hint').status_code, 403)
+        self.assertEqual(self.client.get('/get-secret-word').status_code, 403)
+
+    def test_lost_state_without_result_can_be_restarted(self):
+        self.assertEqual(self.start_daily().status_code, 200)
+        with self.client.session_transaction() as flask_session:
+            game_id = flask_session['game_id']
+
+        #stato scaduto o processo riavviato: l'inizio è registrato, il risultato no
+        wordle.GAME_STORE.delete(game_id)
+        restarted = self.start_daily()
+        self.assertEqual(restarted.status_code, 200)
+        self.assertFalse(restarted.get_json()['resumed'])
+
+        #a partita conclusa non si può più rigiocare
+        secret = wordle.GAME_STORE.get(game_id)['secret_word']
+        self.assertTrue(self.client.post('/check-word', json={'word': secret}).get_json()['won'])
+        wordle.GAME_STORE.delete(game_id)
+        self.assertEqual(self.start_daily().status_code, 409)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Test dei mazzi di parole per giocatore: permutazione, nessuna ripetizione e salvataggio."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+class DeckTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_decks_')
+        self.decks = wordle.PlayerDecks(os.path.join(self.directory, 'player_decks.json'), flush_interval=3600)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_deck_index_is_a_permutation(self):
+        for size in (1, 2, 3, 10, 255, 256, 1000):
+            cards = [wordle.deck_index(1234, position, size) for position in range(size)]
+            self.assertEqual(sorted(cards), list(range(size)))
+
+    def test_no_repeats_until_the_deck_is_exhausted(self):
+        size = 50
+        cards = [self.decks.draw('alice', 'it', size, lambda hand: [0] * len(hand)) for _ in range(size * 2)]
+        self.assertEqual(sorted(cards[:size]), list(range(size)))
+        self.assertEqual(sorted(cards[size:]), list(range(size)))
+
+    def test_less_used_words_come_first(self):
+        size = 40
+        #le parole con indice pari sono già molto usate dagli altri giocatori
+        usage = lambda hand: [100 if i % 2 == 0 else 0 for i in hand]
+        #seme fisso: con uno casuale i pari possono capitare quasi tutti in testa al mazzo
+        with mock.patch.object(wordle.secrets, 'randbits', return_value=1234):
+            cards = [self.decks.draw('bob', 'it', size, usage) for _ in range(size)]
+        self.assertEqual(sorted(cards), list(range(size)))
+        early = sum(1 for card in cards[:size // 2] if card % 2 == 1)
+        self.assertGreater(early, size // 4)
+
+    def test_usage_is_read_outside_the_lock(self):
+        #la lettura dei conteggi può toccare il disco: non deve bloccare le estrazioni degli altri
+        def usage(hand):
+            self.assertFalse(self.decks._lock.locked())
+            return [0] * len(hand)
+        self.decks.draw('dave', 'it', 20, usage)
+
+    def test_flush_persists_the_position(self):
+        first = [self.decks.draw('carol', 'en', 30, lambda hand: [0] * len(hand)) for _ in range(10)]
+        self.assertEqual(self.decks.flush(), 1)
+
+        reloaded = wordle.PlayerDecks(self.decks.path, flush_interval=3600)
+        rest = [reloaded.draw('carol', 'en', 30, lambda hand: [0] * len(hand)) for _ in range(20)]
+        self.assertEqual(sorted(first + rest), list(range(30)))
+
+
+if __name__ == '__main__':
+    unittest.main()
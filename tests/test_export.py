@@ -0,0 +1,79 @@
+"""Test dell'esportazione in streaming dello storico dei punteggi."""
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+
+GAMES = [
+    {'player': 'anna', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['CRANE'], 'timestamp': '2026-01-01T10:00:00'},
+    {'player': 'bruno', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['SLATE', 'CRANE'],
+     'timestamp': '2026-01-02T10:00:00'},
+    {'player': 'anna', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['SLATE', 'CRANE'],
+     'timestamp': '2026-01-03T10:00:00'},
+]
+
+
+class ScoreExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_export_')
+        self.cwd = os.getcwd()
+        for file_name in wordle.WORD_FILES.values():
+            shutil.copy(os.path.join(REPO_DIR, file_name), self.directory)
+        os.chdir(self.directory)
+        wordle.ingest_games(json.dumps(game) for game in GAMES)
+        self.client = wordle.app.test_client()
+
+    def tearDown(self):
+        #i mazzi vanno salvati nella cartella del test, non in quella da cui parte pytest
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_csv_export_is_streamed_with_header(self):
+        response = self.client.get('/api/scores/export')
+        self.assertTrue(response.is_streamed)
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual([row['player'] for row in rows], ['anna', 'bruno', 'anna'])
+        self.assertEqual(list(rows[0]), wordle.SCORE_COLUMNS)
+
+    def test_filters_on_player_lang_and_time_range(self):
+        response = self.client.get('/api/scores/export?format=ndjson&player=anna&since=2026-01-02')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(rows, [{'player': 'anna', 'score': 130, 'attempts': 2, 'won': True, 'lang': 'en',
+                                 'timestamp': '2026-01-03T10:00:00'}])
+
+        response = self.client.get('/api/scores/export?format=ndjson&until=2026-01-02')
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 1)
+        response = self.client.get('/api/scores/export?format=ndjson&lang=it')
+        self.assertEqual(response.get_data(), b'')
+
+    def test_gzip_and_invalid_parameters(self):
+        response = self.client.get('/api/scores/export?format=ndjson&gzip=1')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(len(gzip.decompress(response.get_data()).splitlines()), len(GAMES))
+
+        self.assertEqual(self.client.get('/api/scores/export?format=xml').status_code, 400)
+        self.assertEqual(self.client.get('/api/scores/export?since=ieri').status_code, 400)
+
+    def test_incomplete_last_line_is_not_exported(self):
+        #una riga ancora in scrittura da un altro processo resta fuori dall'esportazione
+        with open(wordle.SCORES_FILE, 'a', encoding='utf-8') as f:
+            f.write('carla,140,1,Tr')
+        self.assertEqual(len(list(wordle.iter_scores())), len(GAMES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Test dell'archivio delle partite in corso: scadenza (TTL) e rinnovo a ogni utilizzo."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+class GameStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_games_')
+        self.now = 1000.0
+        #orologio fermo, spostato a mano dai test
+        self.clock = mock.patch.object(wordle.time, 'time', side_effect=lambda: self.now)
+        self.clock.start()
+
+    def tearDown(self):
+        self.clock.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def check_expiry(self, store):
+        store.put('a', {'word': 'CRANE'})
+        self.now += 5
+        store.put('b', {'word': 'SLATE'})
+        self.now += 4
+        #leggere 'a' ne rinnova la scadenza
+        self.assertEqual(store.get('a'), {'word': 'CRANE'})
+        self.now += 7
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(store.get('a'), {'word': 'CRANE'})
+        self.assertEqual(len(store), 1)
+        self.now += 10
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(len(store), 0)
+
+    def test_memory_store_expires_unused_games(self):
+        self.check_expiry(wordle.MemoryGameStore(ttl=10))
+
+    def test_sqlite_store_expires_unused_games(self):
+        store = wordle.SqliteGameStore(os.path.join(self.directory, 'games.db'), ttl=10)
+        store.put('a', {'word': 'CRANE'})
+        self.now += 5
+        store.put('b', {'word': 'SLATE'})
+        self.now += 6
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(store.get('b'), {'word': 'SLATE'})
+        self.now += 10
+        self.assertEqual(len(store), 0)
+
+    def test_memory_store_evicts_in_order_of_last_use(self):
+        store = wordle.MemoryGameStore(ttl=10)
+        for i, game_id in enumerate('abc'):
+            store.put(game_id, {'n': i})
+            self.now += 1
+        store.put('a', {'n': 3})
+        self.now += 9.5
+        #'b' e 'c' scadono, 'a' (aggiornata per ultima) resta e passa in fondo
+        self.assertEqual(list(store._games), ['b', 'c', 'a'])
+        self.assertEqual(len(store), 1)
+        self.assertEqual(list(store._games), ['a'])
+        store.delete('a')
+        self.assertIsNone(store.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Test della validazione dei tentativi: le parole fuori dal dizionario non consumano tentativi."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+class GuessValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_guesses_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        with open(wordle.WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write('CRANE,SLATE,PLANT')
+        with open(wordle.ACCEPTED_WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write('AUDIO')
+        wordle.WORD_REGISTRY.clear()
+        wordle.RESPONSE_CACHE.clear()
+        wordle.LEADERBOARD.invalidate()
+
+    def tearDown(self):
+        wordle.VALIDATE_GUESSES = True
+        #conteggi e mazzi vanno salvati nella cartella del test
+        wordle.WORD_COUNT_BUFFER.flush()
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        wordle.WORD_REGISTRY.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_unknown_words_do_not_spend_an_attempt(self):
+        game = wordle.Game('en', 'CRANE')
+        result = game.check_guess('zzzzz')
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'Parola non presente nel dizionario!')
+        self.assertEqual((game.attempts, game.guesses), (0, []))
+
+        #anche le parole solo accettate (mai segrete) sono tentativi validi
+        self.assertTrue(game.check_guess('audio')['success'])
+        self.assertTrue(game.check_guess('SLATE')['success'])
+        self.assertEqual(game.attempts, 2)
+        self.assertEqual([guess['word'] for guess in game.guesses], ['AUDIO', 'SLATE'])
+
+    def test_validation_can_be_disabled(self):
+        wordle.VALIDATE_GUESSES = False
+        game = wordle.Game('en', 'CRANE')
+        self.assertTrue(game.check_guess('ZZZZZ')['success'])
+        self.assertEqual(game.attempts, 1)
+
+    def test_rejected_guess_leaves_the_stored_game_unchanged(self):
+        client = wordle.app.test_client()
+        client.post('/players', json={'nome': 'Anna', 'username': 'anna'})
+        client.post('/new-game', json={'lang': 'en'})
+
+        response = client.post('/check-word', json={'word': 'QQQQQ'})
+        self.assertFalse(response.get_json()['success'])
+        with client.session_transaction() as session:
+            game_id = session['game_id']
+        state = wordle.GAME_STORE.get(game_id)
+        self.assertEqual((state['attempts'], state['guesses']), (0, []))
+
+        response = client.post('/check-word', json={'word': 'PLANT'}).get_json()
+        self.assertTrue(response['success'])
+        self.assertEqual(response['attempts'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Test dell'importazione in blocco: stesse statistiche delle partite giocate una alla volta."""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+
+#campi che dipendono dall'orologio e non dalle partite
+CLOCK_FIELDS = ('created_at', 'last_played')
+
+
+def random_games(rng, words, players, count):
+    """partite concluse casuali, vinte al tentativo da 1 a 6 oppure perse"""
+    games = []
+    for i in range(count):
+        lang = rng.choice(sorted(words))
+        secret = rng.choice(words[lang])
+        misses = rng.randint(0, 6)
+        guesses = [w for w in rng.sample(words[lang], 8) if w != secret][:misses]
+        if misses < 6:
+            guesses.append(secret)
+        games.append({
+            'player': rng.choice(players), 'lang': lang, 'secret_word': secret,
+            'guesses': guesses, 'timestamp': f'2026-01-01T00:00:{i % 60:02d}',
+        })
+    return games
+
+
+class IngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_ingest_')
+        self.cwd = os.getcwd()
+        for file_name in wordle.WORD_FILES.values():
+            shutil.copy(os.path.join(REPO_DIR, file_name), self.directory)
+        os.chdir(self.directory)
+        wordle.RESPONSE_CACHE.clear()
+        wordle.LEADERBOARD.invalidate()
+        wordle.PLAYER_CACHE.invalidate()
+
+    def tearDown(self):
+        #i mazzi vanno salvati nella cartella del test, non in quella da cui parte pytest
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def profiles(self):
+        players = wordle.load_players()
+        for player in players.values():
+            for name in CLOCK_FIELDS:
+                player.pop(name)
+        return players
+
+    def test_batch_matches_games_played_one_at_a_time(self):
+        rng = random.Random(7)
+        words = {lang: [w.decode('ascii') for w in wordle.WORD_REGISTRY.get(lang).words[:300]] for lang in ('en', 'it')}
+        games = random_games(rng, words, ['anna', 'bruno', 'carla'], 120)
+
+        #riferimento: le stesse partite salvate come a fine /check-word
+        for username in ('anna', 'bruno', 'carla'):
+            wordle.insert_player(username, wordle.new_player(username, username))
+        for game in games:
+            row = wordle.replay_game(game)
+            wordle.update_player_stats(row['player'], row['won'], row['attempts'], row['lang'])
+            wordle.save_score(row['player'], row['attempts'], row['won'], row['lang'])
+        expected = self.profiles()
+
+        os.remove(wordle.PLAYERS_FILE)
+        os.remove(wordle.SCORES_FILE)
+        #blocchi piccoli: le serie di vittorie devono proseguire da un blocco all'altro
+        summary = wordle.ingest_games((json.dumps(game) for game in games), batch_size=17)
+        self.assertEqual(summary['games'], len(games))
+        self.assertEqual(summary['created_players'], 3)
+        self.assertEqual(self.profiles(), expected)
+        self.assertEqual(len(wordle.load_scores()), len(games))
+
+    def test_invalid_games_are_rejected_with_their_line(self):
+        lines = [
+            json.dumps({'player': 'anna', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['CRANE']}),
+            json.dumps({'player': 'anna', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['SLATE']}),
+            json.dumps({'player': 'anna', 'lang': 'xx', 'secret_word': 'CRANE', 'guesses': ['CRANE']}),
+            json.dumps({'player': 'anna', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['CRANE', 'SLATE']}),
+            '{non json',
+            '',
+        ]
+        summary = wordle.ingest_games(lines)
+        self.assertEqual(summary['games'], 1)
+        self.assertEqual(summary['rejected'], 4)
+        self.assertEqual([error['line'] for error in summary['errors']], [2, 3, 4, 5])
+
+    def post_import(self, body, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        return wordle.app.test_client().post('/api/games/import', data=body, headers=headers,
+                                              content_type='application/x-ndjson')
+
+    def test_import_endpoint_reads_jsonl(self):
+        body = '\n'.join(json.dumps(game) for game in [
+            {'player': 'dario', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['SLATE', 'CRANE']},
+            {'player': 'dario', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': [{'word': 'CRANE'}]},
+        ])
+        previous, wordle.ADMIN_TOKEN = wordle.ADMIN_TOKEN, 'segreto'
+        try:
+            response = self.post_import(body, 'segreto')
+        finally:
+            wordle.ADMIN_TOKEN = previous
+        self.assertEqual(response.get_json()['games'], 2)
+        self.assertEqual(wordle.load_player('dario')['games_won'], 2)
+
+    def test_import_endpoint_requires_the_admin_token(self):
+        body = json.dumps({'player': 'eva', 'lang': 'en', 'secret_word': 'CRANE', 'guesses': ['CRANE']})
+        previous = wordle.ADMIN_TOKEN
+        try:
+            #senza token configurato l'endpoint è disattivato
+            wordle.ADMIN_TOKEN = None
+            self.assertEqual(self.post_import(body, 'qualunque').status_code, 403)
+            wordle.ADMIN_TOKEN = 'segreto'
+            self.assertEqual(self.post_import(body).status_code, 401)
+            self.assertEqual(self.post_import(body, 'sbagliato').status_code, 401)
+        finally:
+            wordle.ADMIN_TOKEN = previous
+        self.assertIsNone(wordle.load_player('eva'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Test del confronto tentativo/parola segreta: le versioni a pattern danno gli stessi risultati di quella originale."""
+import itertools
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+def check_word_logic(guess, secret_word):
+    """algoritmo originale di Game._check_word_logic, tenuto come riferimento"""
+    guess_arr = np.array(list(guess))
+    secret_arr = np.array(list(secret_word))
+
+    results = []
+    used = np.zeros(5, dtype=bool)
+    correct_mask = guess_arr == secret_arr
+
+    for i in range(5):
+        if correct_mask[i]:
+            results.append({'letter': guess_arr[i], 'status': 'correct', 'position': i})
+            used[i] = True
+        else:
+            results.append({'letter': guess_arr[i], 'status': 'absent', 'position': i})
+
+    for i in range(5):
+        if not correct_mask[i]:
+            for j in range(5):
+                if not used[j] and guess_arr[i] == secret_arr[j]:
+                    results[i]['status'] = 'present'
+                    used[j] = True
+                    break
+
+    return results
+
+
+#coppie con lettere ripetute nel tentativo, nella parola segreta o in entrambi
+DUPLICATE_PAIRS = [
+    ('ERASE', 'SPEED'), ('SPEED', 'ERASE'), ('ABBEY', 'BABES'), ('BABES', 'ABBEY'),
+    ('EERIE', 'THEME'), ('LLAMA', 'HALLO'), ('ALLEY', 'LLAMA'), ('SASSY', 'ASSES'),
+    ('ROBOT', 'FLOOR'), ('GEESE', 'EAGLE'), ('AAAAA', 'ABACA'), ('CRANE', 'CRANE'),
+]
+
+
+class PatternTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(8)
+        #alfabeto ridotto per avere molte lettere ripetute, più parole vere della lista inglese
+        cls.words = [''.join(rng.choice('ABES') for _ in range(5)) for _ in range(150)]
+        with open(os.path.join(os.path.dirname(TESTS_DIR), wordle.WORD_FILES['en']), encoding='utf-8') as f:
+            english = [w.strip().upper() for w in f.read().split(',') if len(w.strip()) == 5 and w.strip().isalpha()]
+        cls.words += rng.sample(english, 150)
+
+    def expected(self, guess, secret):
+        return [{'letter': str(r['letter']), 'status': r['status'], 'position': r['position']}
+                for r in check_word_logic(guess, secret)]
+
+    def test_duplicate_letters_match_the_original(self):
+        for guess, secret in DUPLICATE_PAIRS:
+            with self.subTest(guess=guess, secret=secret):
+                results = wordle.pattern_to_results(guess, wordle.score_pattern(guess, secret))
+                self.assertEqual(results, self.expected(guess, secret))
+
+    def test_score_pattern_matches_the_original(self):
+        for guess, secret in itertools.product(self.words[:60], self.words[::5]):
+            results = wordle.pattern_to_results(guess, wordle.score_pattern(guess, secret))
+            self.assertEqual(results, self.expected(guess, secret), (guess, secret))
+
+    def test_score_patterns_matches_score_pattern(self):
+        secrets = [w for w, _ in DUPLICATE_PAIRS] + [s for _, s in DUPLICATE_PAIRS] + self.words
+        secret_codes = wordle.encode_words(np.array(secrets, dtype='S5'))
+        for guess in [g for g, _ in DUPLICATE_PAIRS] + self.words[::3]:
+            guess_codes = wordle.encode_words(np.array([guess], dtype='S5'))[0]
+            patterns = wordle.score_patterns(guess_codes, secret_codes)
+            self.assertEqual(patterns.tolist(), [wordle.score_pattern(guess, s) for s in secrets], guess)
+
+
+if __name__ == '__main__':
+    unittest.main()
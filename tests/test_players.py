@@ -0,0 +1,120 @@
+"""Test dell'indice del file dei giocatori e della cache LRU dei profili."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+def make_player(username, games_played=0):
+    return {
+        'nome': username.title(), 'username': username, 'created_at': None, 'last_played': None,
+        'games_played': games_played, 'games_won': 0, 'total_attempts': 0, 'total_score': 0,
+        'average_score': 0.0, 'best_score': 0, 'current_streak': 0, 'best_streak': 0,
+        'lang_stats': {'it': {'played': games_played, 'won': 0}}, 'score_stats': wordle._empty_score_stats(),
+    }
+
+
+class PlayerFileIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_players_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.index = wordle.PlayerFileIndex(wordle.PLAYERS_FILE)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read_file(self):
+        with open(wordle.PLAYERS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_legacy_file_is_rewritten_one_player_per_line(self):
+        players = {'anna': make_player('anna', 3), 'luca': make_player('luca', 1)}
+        with open(wordle.PLAYERS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(players, f, indent=2)
+
+        self.assertEqual(self.index.load('luca'), players['luca'])
+        self.assertIsNone(self.index.load('nessuno'))
+
+        players['anna']['games_played'] = 4
+        self.index.replace('anna', players['anna'])
+        self.assertEqual(self.read_file(), players)
+        with open(wordle.PLAYERS_FILE, 'rb') as f:
+            self.assertEqual(len(f.read().splitlines()), len(players) + 2)
+
+    def test_insert_and_replace_keep_the_other_records(self):
+        self.assertTrue(self.index.insert('anna', make_player('anna')))
+        self.assertTrue(self.index.insert('bruno', make_player('bruno')))
+        self.assertTrue(self.index.insert('città', make_player('città')))
+        self.assertFalse(self.index.insert('bruno', make_player('bruno')))
+
+        #un profilo più lungo sposta le posizioni dei successivi
+        longer = make_player('anna', 12345)
+        longer['lang_stats']['en'] = {'played': 7, 'won': 7}
+        self.index.replace('anna', longer)
+
+        fresh = wordle.PlayerFileIndex(wordle.PLAYERS_FILE)
+        self.assertEqual(fresh.load('anna'), longer)
+        self.assertEqual(self.index.load('città'), make_player('città'))
+        self.assertEqual(self.read_file(), {
+            'anna': longer, 'bruno': make_player('bruno'), 'città': make_player('città')
+        })
+
+    def test_every_write_bumps_the_generation(self):
+        self.index.insert('anna', make_player('anna', 1))
+        self.assertEqual(self.index.load('anna')['games_played'], 1)
+        before = wordle.players_version()
+
+        #un altro worker riscrive il profilo con la stessa lunghezza e lo stesso mtime
+        st = os.stat(wordle.PLAYERS_FILE)
+        other = wordle.PlayerFileIndex(wordle.PLAYERS_FILE)
+        other.replace('anna', make_player('anna', 2))
+        os.utime(wordle.PLAYERS_FILE, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        self.assertEqual(os.stat(wordle.PLAYERS_FILE).st_size, st.st_size)
+        self.assertNotEqual(wordle.players_version(), before)
+        self.assertEqual(self.index.load('anna')['games_played'], 2)
+
+
+class PlayerCacheTest(unittest.TestCase):
+
+    def test_hits_return_the_cached_profile(self):
+        directory = tempfile.mkdtemp(prefix='wordle_players_')
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            wordle.PLAYER_CACHE.invalidate()
+            wordle.insert_player('anna', make_player('anna', 2))
+            first = wordle.load_player('anna')
+            self.assertEqual(first, make_player('anna', 2))
+            #nessuna conversione a ogni lettura: si restituisce lo stesso dizionario
+            self.assertIs(wordle.load_player('anna'), first)
+        finally:
+            wordle.PLAYER_CACHE.invalidate()
+            os.chdir(cwd)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_lru_eviction_and_versions(self):
+        cache = wordle.PlayerCache(capacity=2)
+        for username in ('a', 'b', 'c'):
+            cache.put(username, make_player(username), 1)
+        self.assertIsNone(cache.get('a', 1))
+        self.assertIsNotNone(cache.get('c', 1))
+
+        #una scrittura di questo processo mantiene la cache, una esterna la svuota
+        cache.note_write(1, 2)
+        self.assertIsNotNone(cache.get('b', 2))
+        self.assertIsNone(cache.get('b', 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
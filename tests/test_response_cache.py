@@ -0,0 +1,83 @@
+"""Test della cache delle risposte: ETag, 304 e invalidazione dagli hook di scrittura."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app as wordle
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_cache_')
+        self.cwd = os.getcwd()
+        for file_name in wordle.WORD_FILES.values():
+            shutil.copy(os.path.join(REPO_DIR, file_name), self.directory)
+        os.chdir(self.directory)
+        wordle.RESPONSE_CACHE.clear()
+        wordle.LEADERBOARD.invalidate()
+        self.client = wordle.app.test_client()
+
+    def tearDown(self):
+        wordle.WORD_COUNT_BUFFER.flush()
+        #i mazzi vanno salvati nella cartella del test, non in quella da cui parte pytest
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def play_and_win(self, username):
+        self.client.post('/players', json={'nome': username, 'username': username})
+        self.client.post('/new-game', json={'lang': 'en'})
+        secret = self.client.get('/get-secret-word').get_json()['secret_word']
+        self.assertTrue(self.client.post('/check-word', json={'word': secret}).get_json()['won'])
+
+    def test_rules_are_served_with_etag_and_304(self):
+        first = self.client.get('/rules')
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+
+        again = self.client.get('/rules', headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b'')
+
+    def test_top_players_is_invalidated_by_a_finished_game(self):
+        self.play_and_win('anna')
+        first = self.client.get('/top-players?limit=5')
+        etag = first.headers['ETag']
+        self.assertEqual(self.client.get('/top-players?limit=5', headers={'If-None-Match': etag}).status_code, 304)
+
+        #parametri diversi, voce diversa
+        self.assertEqual(self.client.get('/top-players?limit=1').get_json()['leaderboard'][0]['username'], 'anna')
+
+        self.play_and_win('bruno')
+        after = self.client.get('/top-players?limit=5', headers={'If-None-Match': etag})
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.get_json()['total_players'], 2)
+
+    def test_word_stats_follow_the_drawn_words(self):
+        self.client.post('/players', json={'nome': 'carla', 'username': 'carla'})
+        self.client.post('/new-game', json={'lang': 'en'})
+        before = self.client.get('/api/word-stats/all').get_json()['statistics']['en']
+        self.client.post('/new-game', json={'lang': 'en'})
+        after = self.client.get('/api/word-stats/all').get_json()['statistics']['en']
+        self.assertEqual(sum(w['count'] for w in before) + 1, sum(w['count'] for w in after))
+
+    def test_lru_is_bounded(self):
+        cache = wordle.ResponseCache(capacity=2)
+        for limit in range(3):
+            cache.put(('top_players', (('limit', str(limit)),)), ('players',), (0,), b'{}')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(('top_players', (('limit', '0'),)), (0,)))
+        cache.invalidate('players')
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
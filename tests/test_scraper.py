@@ -0,0 +1,117 @@
+"""Test offline dello scraper delle parole contro un server HTTP locale con pagine di prova."""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+ITALIAN_PAGE_1 = {'ABACO', 'ABATE', 'ACERO', 'BARCA', 'CARNE'}
+ITALIAN_OTHER_PAGES = {'PORTA', 'SEDIA', 'TEMPO', 'ABACO'}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """serve le pagine di prova con ETag e risponde 304 alle richieste condizionali"""
+
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def _fixture(self):
+        name = self.path.rsplit('/', 1)[-1]
+        if name.startswith('5lettereparolepagina'):
+            name = '5lettereparolepagina.htm'
+        for path in (os.path.join(FIXTURES_DIR, 'listediparole', name), os.path.join(FIXTURES_DIR, name)):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def do_GET(self):
+        path = self._fixture()
+        if path is None:
+            self.send_error(404)
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        conditional = self.headers.get('If-None-Match') == etag
+        type(self).requests_seen.append((self.path, 304 if conditional else 200))
+
+        if conditional:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ScraperTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='wordle_http_cache_')
+        FixtureHandler.requests_seen = []
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_parser_ignores_void_elements_and_page_chrome(self):
+        parser = wordle.WordListParser()
+        parser.feed('<div class="mt">ABACO<br>CASAE<hr/><img src="x">ERBAE</div><p>NAVBAR FOOTR ZZZZZ</p>')
+        parser.close()
+        self.assertEqual(parser.words, ['ABACO', 'CASAE', 'ERBAE'])
+
+    def test_italian_pages_are_fetched_and_parsed(self):
+        words = wordle.prendi_parole_italiane(self.base_url, self.cache_dir, workers=4)
+
+        self.assertEqual(set(words), ITALIAN_PAGE_1 | ITALIAN_OTHER_PAGES)
+        self.assertEqual(words, sorted(set(words)))
+        self.assertEqual(len(FixtureHandler.requests_seen), len(wordle.ITALIAN_WORDS_PAGES))
+
+    def test_second_run_uses_conditional_requests(self):
+        first = wordle.prendi_parole_italiane(self.base_url, self.cache_dir, workers=4)
+        FixtureHandler.requests_seen = []
+        second = wordle.prendi_parole_italiane(self.base_url, self.cache_dir, workers=4)
+
+        self.assertEqual(first, second)
+        self.assertEqual({status for _, status in FixtureHandler.requests_seen}, {304})
+        self.assertEqual(len(FixtureHandler.requests_seen), len(wordle.ITALIAN_WORDS_PAGES))
+
+    def test_english_list_is_streamed_from_the_server(self):
+        words = wordle.prendi_parole_inglesi(self.base_url + 'sgb-words.txt', self.cache_dir)
+
+        self.assertTrue({'QUACK', 'ZEBRA', 'FJORD'} <= set(words))
+        self.assertEqual(FixtureHandler.requests_seen, [('/sgb-words.txt', 200)])
+        self.assertNotIn('AB', words)
+        self.assertNotIn('LONGER', words)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Test del risolutore: filtro delle parole candidate, suggerimenti e /hint senza matrice dei pattern."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+SECRETS = ['CRANE', 'SLATE', 'PLANT', 'GHOST', 'TRACE', 'CRATE', 'REACT', 'CARET', 'STALE', 'LEAST', 'BABES', 'ABBEY']
+ACCEPTED = ['AUDIO', 'ERASE', 'SPEED']
+
+
+class SolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_solver_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        with open(wordle.WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write(','.join(SECRETS))
+        with open(wordle.ACCEPTED_WORD_FILES['en'], 'w', encoding='utf-8') as f:
+            f.write(','.join(ACCEPTED))
+        wordle.WORD_REGISTRY.clear()
+        wordle._solvers.clear()
+        wordle.RESPONSE_CACHE.clear()
+        wordle.LEADERBOARD.invalidate()
+        self.word_list = wordle.WORD_REGISTRY.get('en')
+        self.cache_dir = os.path.join(self.directory, 'patterns')
+
+    def tearDown(self):
+        wordle.WORD_COUNT_BUFFER.flush()
+        wordle.PLAYER_DECKS.flush()
+        wordle.PLAYER_DECKS.clear()
+        wordle.WORD_REGISTRY.clear()
+        wordle._solvers.clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def solver(self):
+        return wordle.Solver(self.word_list, wordle.load_pattern_matrix(self.word_list, self.cache_dir))
+
+    def test_filter_keeps_the_words_compatible_with_every_pattern(self):
+        solver = self.solver()
+        secrets = [w.decode('ascii') for w in self.word_list.words.tolist()]
+        for secret in secrets:
+            history = [(guess, wordle.score_pattern(guess, secret)) for guess in ('ERASE', 'SLATE')]
+            candidates = solver.filter([(solver.guess_row(word), pattern) for word, pattern in history])
+            expected = [w for w in secrets
+                        if all(wordle.score_pattern(word, w) == pattern for word, pattern in history)]
+            self.assertEqual([secrets[i] for i in candidates], expected, secret)
+            self.assertIn(secret, expected)
+
+    def test_hint_and_solve(self):
+        solver = self.solver()
+        suggestion = solver.hint([('CRANE', wordle.score_pattern('CRANE', 'REACT'))])
+        self.assertIn(suggestion['word'], SECRETS + ACCEPTED)
+        pattern = wordle.score_pattern('CRANE', 'REACT')
+        self.assertEqual(suggestion['candidates'], sum(1 for w in SECRETS if wordle.score_pattern('CRANE', w) == pattern))
+        #pattern impossibile: nessuna parola compatibile
+        self.assertIsNone(solver.hint([('GHOST', wordle.PATTERN_ALL_CORRECT), ('PLANT', wordle.PATTERN_ALL_CORRECT)]))
+
+        for column in range(len(self.word_list)):
+            self.assertIsNotNone(solver.solve(column, max_turns=len(SECRETS)))
+
+    def test_hint_answers_503_until_the_matrix_exists(self):
+        client = wordle.app.test_client()
+        client.post('/players', json={'nome': 'Anna', 'username': 'anna'})
+        client.post('/new-game', json={'lang': 'en'})
+
+        #nessun calcolo in background durante il test
+        with mock.patch.object(wordle, 'schedule_pattern_build') as schedule:
+            response = client.get('/hint')
+            self.assertIsNone(wordle.get_solver('en', build=False))
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.get_json()['success'])
+        schedule.assert_called_with(self.word_list)
+
+        #matrice calcolata (come farebbe il thread in background): il suggerimento arriva
+        self.assertIsNotNone(wordle.get_solver('en'))
+        response = client.get('/hint')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['hint']['candidates'], len(SECRETS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Test dell'archivio sqlite: migrazione dai file JSON/CSV e aggiornamento dei profili."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+class SqliteStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_sqlite_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.backend = wordle.STORAGE_BACKEND
+        self.reset_caches()
+
+    def tearDown(self):
+        wordle.STORAGE_BACKEND = self.backend
+        self.reset_caches()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    @staticmethod
+    def reset_caches():
+        #l'archivio è legato al percorso relativo del database, uguale in ogni cartella di test
+        wordle._sqlite_store = None
+        wordle.PLAYER_CACHE.invalidate()
+        wordle.LEADERBOARD.invalidate()
+        wordle.RESPONSE_CACHE.clear()
+
+    def play_on_files(self):
+        """partite salvate con il backend a file, come prima della migrazione"""
+        wordle.STORAGE_BACKEND = 'json'
+        self.assertTrue(wordle.insert_player('anna', wordle.new_player('Anna', 'anna')))
+        self.assertTrue(wordle.insert_player('luca', wordle.new_player('Luca', 'luca')))
+        for username, attempts, won in (('anna', 3, True), ('anna', 6, False), ('luca', 2, True)):
+            wordle.update_player_stats(username, won, attempts, 'it')
+            wordle.save_score(username, attempts, won, 'it')
+        return wordle.load_players()
+
+    def test_migration_copies_players_and_scores(self):
+        players = self.play_on_files()
+
+        store = wordle.SqliteStore(wordle.DATABASE_FILE)
+        counts = store.migrate_from_files()
+        self.assertEqual(counts['players'], 2)
+        self.assertEqual(counts['scores'], 3)
+        self.assertEqual(store.load_players(), players)
+        self.assertEqual([(row['player'], row['score'], row['won']) for row in store.iter_scores()],
+                         [('anna', 120, True), ('anna', 40, False), ('luca', 130, True)])
+
+        #ripetere la migrazione non duplica né giocatori né punteggi
+        self.assertEqual(store.migrate_from_files(), counts)
+        self.assertEqual(len(list(store.iter_scores())), 3)
+
+    def test_migrate_command(self):
+        self.play_on_files()
+        result = wordle.app.test_cli_runner().invoke(wordle.migrate_sqlite_command)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('2 giocatori, 3 punteggi', result.output)
+        self.assertEqual(wordle.SqliteStore(wordle.DATABASE_FILE).load_player('luca')['games_won'], 1)
+
+    def test_updates_are_upserted_after_the_migration(self):
+        self.play_on_files()
+        wordle.SqliteStore(wordle.DATABASE_FILE).migrate_from_files()
+
+        wordle.STORAGE_BACKEND = 'sqlite'
+        self.reset_caches()
+        before = wordle.players_version()
+        self.assertEqual(wordle.load_player('anna')['games_played'], 2)
+
+        wordle.update_player_stats('anna', True, 4, 'en')
+        anna = wordle.load_player('anna')
+        self.assertEqual(anna['games_played'], 3)
+        self.assertEqual(anna['games_won'], 2)
+        self.assertEqual(anna['lang_stats']['en'], {'played': 1, 'won': 1})
+        self.assertGreater(wordle.players_version(), before)
+
+        #una connessione nuova legge la stessa riga, senza duplicati
+        store = wordle.SqliteStore(wordle.DATABASE_FILE)
+        self.assertEqual(store.load_player('anna'), anna)
+        self.assertEqual(sorted(store.load_players()), ['anna', 'luca'])
+        self.assertFalse(wordle.insert_player('anna', wordle.new_player('Anna', 'anna')))
+
+
+if __name__ == '__main__':
+    unittest.main()
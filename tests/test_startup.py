@@ -0,0 +1,108 @@
+"""Budget di avvio di un worker: tempo di import, memoria e dipendenze pesanti caricate."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+
+#misurati senza import pesanti: circa 0.2s e 33 MB (con pandas e numpy 0.6s e 78 MB)
+IMPORT_BUDGET_SECONDS = 0.6
+RSS_BUDGET_MB = 60
+
+WORKER_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app as wordle
+application = wordle.create_app()
+elapsed = time.perf_counter() - start
+
+client = application.test_client()
+client.get('/check-session')
+client.get('/rules')
+#ru_maxrss su Linux conserva il picco del processo padre prima dell'exec: meglio VmHWM
+try:
+    with open('/proc/self/status') as f:
+        rss_mb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM:')) / 1024
+except OSError:
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({
+    'import_seconds': elapsed,
+    'rss_mb': rss_mb,
+    'heavy_modules': sorted(m for m in ('numpy', 'pandas') if m in sys.modules),
+}))
+"""
+
+
+class StartupBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_startup_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def run_worker(self):
+        result = subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT, REPO_DIR],
+            cwd=self.directory, capture_output=True, text=True, timeout=60,
+            env=dict(os.environ, WORDLE_STORAGE='json'),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_worker_starts_without_heavy_dependencies(self):
+        measured = self.run_worker()
+        self.assertEqual(measured['heavy_modules'], [])
+
+    def run_script(self, script):
+        result = subprocess.run([sys.executable, '-c', script, REPO_DIR], cwd=self.directory, capture_output=True,
+                                text=True, timeout=60, env=dict(os.environ, WORDLE_STORAGE='json'))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_word_stats_do_not_load_pandas(self):
+        with open(os.path.join(self.directory, 'word_statistics.json'), 'w', encoding='utf-8') as f:
+            json.dump({'it': {}, 'en': {'CRANE': {'count': 2, 'first_used': '2026-01-01T10:00:00',
+                                                  'last_used': '2026-01-02T10:00:00.250000'}}}, f)
+        measured = self.run_script(
+            "import json, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "import app as wordle\n"
+            "stats = wordle.app.test_client().get('/api/word-stats/all').get_json()['statistics']['en']\n"
+            "print(json.dumps({'stats': stats, 'pandas': 'pandas' in sys.modules}))\n"
+        )
+        self.assertFalse(measured['pandas'])
+        self.assertEqual(measured['stats'][0]['last_used'], '2026-01-02T10:00:00.250000')
+
+    def test_player_stats_do_not_load_numpy(self):
+        measured = self.run_script(
+            "import json, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "import app as wordle\n"
+            "player = wordle.new_player('Anna', 'anna')\n"
+            "wordle._add_score_to_stats(player['score_stats'], 130, True)\n"
+            "wordle._add_score_to_stats(player['score_stats'], 40, False)\n"
+            "wordle.insert_player('anna', player)\n"
+            "client = wordle.app.test_client()\n"
+            "client.post('/login', json={'username': 'anna'})\n"
+            "analytics = client.get('/player-stats').get_json()['analytics']\n"
+            "print(json.dumps({'analytics': analytics, 'heavy': [m for m in ('numpy', 'pandas') if m in sys.modules]}))\n"
+        )
+        self.assertEqual(measured['heavy'], [])
+        self.assertEqual(measured['analytics']['std_score'], 45.0)
+
+    def test_worker_startup_budget(self):
+        #il minimo di tre avvii riduce il rumore di una macchina carica
+        runs = [self.run_worker() for _ in range(3)]
+        self.assertLess(min(r['import_seconds'] for r in runs), IMPORT_BUDGET_SECONDS)
+        self.assertLess(min(r['rss_mb'] for r in runs), RSS_BUDGET_MB)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Test del buffer dei conteggi delle parole: i conteggi in attesa vengono sommati a quelli salvati."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import app as wordle
+
+
+class WordCountBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wordle_words_')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+        #intervallo e blocco grandi: il thread in background non scrive durante il test
+        self.buffer = wordle.WordCountBuffer(flush_interval=3600, flush_batch=10 ** 6)
+        self.saved = {'it': {}, 'en': {'CRANE': {'count': 2, 'first_used': '2024-01-01T00:00:00',
+                                                 'last_used': '2024-01-02T00:00:00'}}}
+        with open(wordle.WORD_STATS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(self.saved, f)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read_file(self):
+        with open(wordle.WORD_STATS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_flush_merges_pending_counts(self):
+        for word in ('CRANE', 'SLATE', 'CRANE'):
+            self.buffer.add(word, 'en')
+        self.buffer.add('CANTO', 'it')
+        self.assertEqual(self.buffer.pending_counts(['CRANE', 'SLATE', 'AUDIO'], 'en'), [2, 1, 0])
+        #prima della scrittura il file non cambia
+        self.assertEqual(self.read_file(), self.saved)
+
+        self.assertEqual(self.buffer.flush(), 4)
+        stats = self.read_file()
+        self.assertEqual(stats['en']['CRANE']['count'], 4)
+        self.assertEqual(stats['en']['CRANE']['first_used'], '2024-01-01T00:00:00')
+        self.assertNotEqual(stats['en']['CRANE']['last_used'], '2024-01-02T00:00:00')
+        self.assertEqual(stats['en']['SLATE']['count'], 1)
+        self.assertEqual(stats['it']['CANTO']['count'], 1)
+
+        #niente in attesa: la scrittura successiva non tocca il file
+        self.assertEqual(self.buffer.snapshot(), {})
+        self.assertEqual(self.buffer.flush(), 0)
+        self.buffer.add('CRANE', 'en')
+        self.buffer.flush()
+        self.assertEqual(self.read_file()['en']['CRANE']['count'], 5)
+
+    def test_failed_flush_keeps_the_counts(self):
+        self.buffer.add('SLATE', 'en')
+        os.mkdir(wordle.WORD_STATS_FILE + '.blocked')
+        original, wordle.WORD_STATS_FILE = wordle.WORD_STATS_FILE, wordle.WORD_STATS_FILE + '.blocked'
+        try:
+            #la destinazione è una cartella: la scrittura fallisce
+            with self.assertRaises(OSError):
+                self.buffer.flush()
+        finally:
+            wordle.WORD_STATS_FILE = original
+        self.buffer.add('SLATE', 'en')
+        self.assertEqual(self.buffer.pending_counts(['SLATE'], 'en'), [2])
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.read_file()['en']['SLATE']['count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()